@@ -13,6 +13,7 @@ User = get_user_model()
 class ProfileAdmin(admin.ModelAdmin):
     list_display = (
         "user",
+        "display_name",
         "full_name",
         "role",
         "phone",
@@ -29,8 +30,11 @@ class ProfileAdmin(admin.ModelAdmin):
         "pungsam_gi",
         "leader_course",
     )
+    list_select_related = ("user",)
+    readonly_fields = ("display_name",)
     search_fields = (
         "user__username",
+        "display_name",
         "full_name",
         "phone",
         "leader_status",
@@ -86,7 +90,7 @@ class CustomUserAdmin(DjangoUserAdmin):
 
     list_display = ("username", "first_name", "email", "is_staff", "is_superuser")
     list_filter = ("is_staff", "is_superuser", "is_active", "groups")
-    search_fields = ("username", "first_name", "email", "profile__full_name")
+    search_fields = ("username", "first_name", "email", "profile__display_name")
 
     fieldsets = (
         (None, {"fields": ("username", "password")}),
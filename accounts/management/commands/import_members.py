@@ -0,0 +1,191 @@
+import csv
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts.models import Profile
+from accounts.signals import suppress_profile_signals
+from accounts.utils import sync_profile_roles
+from approvals.permissions import invalidate_chair_cache
+
+User = get_user_model()
+
+USER_FIELDS = ("email", "first_name", "last_name")
+PROFILE_FIELDS = (
+    "full_name",
+    "phone",
+    "pungsam_cho",
+    "pungsam_cho_date",
+    "pungsam_first",
+    "pungsam_first_date",
+    "pungsam_gi",
+    "pungsam_gi_date",
+    "leader_course",
+    "leader_course_date",
+    "leader_status",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "CSV 또는 JSONL 로 회원을 일괄 등록합니다. "
+        "User/Profile/그룹 소속을 배치 단위 bulk_create 로 저장하고 role 은 같은 배치 트랜잭션에서 UPDATE 1회로 맞춥니다. "
+        "컬럼: username(필수), email, first_name, last_name, password, groups(';' 구분), "
+        + ", ".join(PROFILE_FIELDS)
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV/JSONL 파일 경로 ('-' 이면 stdin)")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            default="",
+            help="입력 형식 (기본: 확장자로 판단, stdin 은 jsonl)",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="한 트랜잭션에 저장할 회원 수")
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        self.batch_size = max(options["batch_size"], 1)
+        self.groups: dict[str, int] = {}
+
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.lower().endswith(".csv") else "jsonl")
+        src = sys.stdin if path == "-" else open(path, encoding="utf-8-sig", newline="")
+
+        created_ids: list[int] = []
+        skipped = changed = 0
+        seen: set[str] = set()
+        batch: list[dict] = []
+        try:
+            with suppress_profile_signals():
+                for rec in self._records(src, fmt):
+                    username = rec["username"]
+                    if username in seen:
+                        skipped += 1
+                        continue
+                    seen.add(username)
+                    batch.append(rec)
+
+                    if len(batch) >= self.batch_size:
+                        ids, dup, roles = self._flush(batch)
+                        created_ids += ids
+                        skipped += dup
+                        changed += roles
+                        batch = []
+
+                if batch:
+                    ids, dup, roles = self._flush(batch)
+                    created_ids += ids
+                    skipped += dup
+                    changed += roles
+        finally:
+            if src is not sys.stdin:
+                src.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"회원 {len(created_ids)}명을 등록했습니다. (건너뜀 {skipped}명, 위원장 표시 {changed}명)")
+        )
+
+    def _records(self, src, fmt: str):
+        if fmt == "csv":
+            rows = enumerate(csv.DictReader(src), start=2)
+        else:
+            rows = self._jsonl_rows(src)
+
+        for lineno, row in rows:
+            rec = {str(k).strip(): v for k, v in row.items() if k}
+            username = str(rec.get("username") or "").strip()
+            if not username:
+                raise CommandError(f"{lineno}번째 줄에 username 이 없습니다.")
+            rec["username"] = username
+
+            groups = rec.get("groups") or []
+            if isinstance(groups, str):
+                groups = groups.split(";")
+            rec["groups"] = [g.strip() for g in groups if g and g.strip()]
+            yield rec
+
+    def _jsonl_rows(self, src):
+        for lineno, raw in enumerate(src, start=1):
+            raw = raw.strip()
+            if not raw:
+                continue
+            try:
+                row = json.loads(raw)
+            except json.JSONDecodeError as exc:
+                raise CommandError(f"{lineno}번째 줄을 해석할 수 없습니다: {exc}") from exc
+            if not isinstance(row, dict):
+                raise CommandError(f"{lineno}번째 줄이 객체가 아닙니다.")
+            yield lineno, row
+
+    def _group_ids(self, names: set[str]) -> dict[str, int]:
+        missing = names - self.groups.keys()
+        if missing:
+            self.groups.update(Group.objects.filter(name__in=missing).values_list("name", "id"))
+            new = [Group(name=n) for n in missing - self.groups.keys()]
+            if new:
+                Group.objects.bulk_create(new, ignore_conflicts=True)
+                self.groups.update(Group.objects.filter(name__in=missing).values_list("name", "id"))
+        return self.groups
+
+    @transaction.atomic
+    def _flush(self, records: list[dict]) -> tuple[list[int], int, int]:
+        """
+        배치 하나를 저장한다. 반환: (등록한 user id, 이미 있어 건너뛴 수, 위원장으로 바뀐 role 수)
+        행 단위 signal 대신 role 동기화/멤버십 캐시 무효화를 같은 트랜잭션에서 배치 단위로 한 번씩 한다.
+        """
+        existing = set(
+            User.objects.filter(username__in=[r["username"] for r in records]).values_list("username", flat=True)
+        )
+        records = [r for r in records if r["username"] not in existing]
+        if not records:
+            return [], len(existing), 0
+
+        users = []
+        for rec in records:
+            user = User(username=rec["username"], **{f: str(rec.get(f) or "").strip() for f in USER_FIELDS})
+            password = rec.get("password")
+            # 비밀번호가 없으면 로그인 불가 상태로 만들고, 해시 계산은 값이 있을 때만 한다.
+            user.password = make_password(str(password) if password else None)
+            users.append(user)
+        User.objects.bulk_create(users)
+
+        # bulk_create 가 pk 를 돌려주지 않는 백엔드도 있으므로 username 으로 다시 조회
+        ids = dict(User.objects.filter(username__in=[u.username for u in users]).values_list("username", "id"))
+
+        profiles = []
+        for user, rec in zip(users, records):
+            values = {f: str(rec.get(f) or "").strip() for f in PROFILE_FIELDS}
+            values["phone"] = values["phone"] or None
+            profiles.append(
+                Profile(
+                    user_id=ids[user.username],
+                    display_name=Profile.build_display_name(values["full_name"], user.first_name, user.username),
+                    **values,
+                )
+            )
+        Profile.objects.bulk_create(profiles, batch_size=1000)
+
+        group_ids = self._group_ids({g for rec in records for g in rec["groups"]})
+        memberships = [
+            User.groups.through(user_id=ids[rec["username"]], group_id=group_ids[g])
+            for rec in records
+            for g in dict.fromkeys(rec["groups"])
+        ]
+        User.groups.through.objects.bulk_create(memberships, batch_size=1000)
+
+        batch_ids = [ids[r["username"]] for r in records]
+        changed = sync_profile_roles(batch_ids)
+        invalidate_chair_cache()
+
+        if self.verbosity >= 2:
+            for rec in records:
+                self.stdout.write(f"{rec['username']} -> {ids[rec['username']]}")
+
+        return batch_ids, len(existing), changed
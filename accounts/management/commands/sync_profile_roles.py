@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from accounts.utils import sync_profile_roles
+from approvals.permissions import invalidate_chair_cache
+
+
+class Command(BaseCommand):
+    help = "모든 Profile.role 을 CHAIR 그룹/superuser 기준으로 UPDATE 1회에 맞춥니다."
+
+    def handle(self, *args, **options):
+        changed = sync_profile_roles()
+        invalidate_chair_cache()
+        self.stdout.write(self.style.SUCCESS(f"role 을 바로잡은 프로필: {changed}건"))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:31
+
+from django.db import migrations, models
+
+
+def fill_display_name(apps, schema_editor):
+    Profile = apps.get_model("accounts", "Profile")
+
+    batch = []
+    for profile in Profile.objects.select_related("user").iterator(chunk_size=1000):
+        full_name = (profile.full_name or "").strip()
+        first_name = (profile.user.first_name or "").strip()
+        profile.display_name = full_name or first_name or profile.user.username
+        batch.append(profile)
+        if len(batch) >= 1000:
+            Profile.objects.bulk_update(batch, ["display_name"])
+            batch = []
+    if batch:
+        Profile.objects.bulk_update(batch, ["display_name"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_alter_profile_leader_course_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='display_name',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=150, verbose_name='표시 이름'),
+        ),
+        migrations.RunPython(fill_display_name, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_profile_display_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['display_name'], name='profile_display_name_like', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_profile_display_name_prefix_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['role', 'display_name'], name='profile_role_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['pungsam_cho', 'display_name'], name='profile_cho_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['pungsam_first', 'display_name'], name='profile_first_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['pungsam_gi', 'display_name'], name='profile_gi_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['leader_course', 'display_name'], name='profile_leader_name_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:34
+
+from django.db import migrations, models
+
+# display_name 의 db_index 를 없애고 profile_display_name_like 인덱스 하나만 남긴다.
+# PostgreSQL 의 varchar_pattern_ops 인덱스는 LIKE 'x%' / 등호에는 쓰이지만 이름순 정렬(ORDER BY)에는 쓰이지 않으므로
+# 사용자 목록 정렬(display_name, id)용 일반 인덱스를 PostgreSQL 에만 만든다.
+PG_ORDER_INDEX = "profile_display_name_ord"
+
+
+def create_pg_order_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = schema_editor.quote_name(apps.get_model("accounts", "Profile")._meta.db_table)
+    schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {PG_ORDER_INDEX} ON {table} (display_name, id)")
+
+
+def drop_pg_order_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {PG_ORDER_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_profile_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='profile',
+            name='display_name',
+            field=models.CharField(blank=True, default='', max_length=150, verbose_name='표시 이름'),
+        ),
+        migrations.RunPython(create_pg_order_index, drop_pg_order_index),
+    ]
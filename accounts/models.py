@@ -97,7 +97,13 @@ class Profile(models.Model):
     # 표시/검색용 캐시 필드(그룹이 단일 기준)
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default=ROLE_MEMBER)
 
-    def display_name(self):
+    # 화면 표시용 이름(비정규화 캐시): save() 와 User 저장 signal 에서 갱신
+    # 인덱스는 Meta.indexes 의 profile_display_name_like 하나 (SQLite 에서는 opclass 없는 일반 인덱스와 같다).
+    # PostgreSQL 이름순 정렬용 일반 인덱스는 migration 0010 에서 PostgreSQL 에만 만든다.
+    display_name = models.CharField("표시 이름", max_length=150, blank=True, default="")
+
+    @staticmethod
+    def build_display_name(full_name: str, first_name: str, username: str) -> str:
         """
         화면 표시용 이름
         우선순위:
@@ -105,13 +111,42 @@ class Profile(models.Model):
         2) user.first_name
         3) username
         """
-        if self.full_name and self.full_name.strip():
-            return self.full_name.strip()
+        if full_name and full_name.strip():
+            return full_name.strip()
+
+        if first_name and first_name.strip():
+            return first_name.strip()
+
+        return username
+
+    def refresh_display_name(self) -> bool:
+        """
+        display_name 을 다시 계산하고 바뀌었으면 True
+        """
+        name = self.build_display_name(self.full_name, self.user.first_name, self.user.username)
+        changed = name != self.display_name
+        self.display_name = name
+        return changed
 
-        if self.user.first_name and self.user.first_name.strip():
-            return self.user.first_name.strip()
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "full_name" in update_fields:
+            self.refresh_display_name()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "display_name"}
+        super().save(*args, **kwargs)
 
-        return self.user.username
+    class Meta:
+        indexes = [
+            # PostgreSQL: 비 C 로케일에서도 display_name 접두어(LIKE 'x%') 검색이 인덱스를 타도록
+            models.Index(fields=["display_name"], name="profile_display_name_like", opclasses=["varchar_pattern_ops"]),
+            # 사용자 목록: 역할/교육 상태로 거른 뒤 이름순 페이지 조회
+            models.Index(fields=["role", "display_name"], name="profile_role_name_idx"),
+            models.Index(fields=["pungsam_cho", "display_name"], name="profile_cho_name_idx"),
+            models.Index(fields=["pungsam_first", "display_name"], name="profile_first_name_idx"),
+            models.Index(fields=["pungsam_gi", "display_name"], name="profile_gi_name_idx"),
+            models.Index(fields=["leader_course", "display_name"], name="profile_leader_name_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} ({self.role})"
\ No newline at end of file
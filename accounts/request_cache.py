@@ -0,0 +1,42 @@
+# accounts/request_cache.py
+from __future__ import annotations
+
+from contextvars import ContextVar
+
+_request_memo: ContextVar[dict | None] = ContextVar("request_memo", default=None)
+
+
+def request_memo() -> dict | None:
+    """
+    현재 요청 동안만 유지되는 메모 dict
+    요청 밖(관리 명령, 셸 등)에서는 None 을 돌려주므로 호출 측은 캐시 없이 동작해야 한다.
+    """
+    return _request_memo.get()
+
+
+def memoize(key, compute):
+    """
+    요청 메모에 key 가 있으면 그 값을, 없으면 compute() 결과를 저장 후 반환한다.
+    """
+    memo = _request_memo.get()
+    if memo is None:
+        return compute()
+    if key not in memo:
+        memo[key] = compute()
+    return memo[key]
+
+
+class RequestCacheMiddleware:
+    """
+    요청마다 빈 메모를 열고, 응답 후 닫는다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _request_memo.set({})
+        try:
+            return self.get_response(request)
+        finally:
+            _request_memo.reset(token)
@@ -1,13 +1,38 @@
 #accounts/signals.py
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save, m2m_changed
+from django.contrib.auth.models import Group
+from django.db.models.signals import post_delete, post_save, m2m_changed
 from django.dispatch import receiver
 
+from approvals.permissions import invalidate_chair_cache
+
 from .models import Profile
-from .utils import sync_profile_role_from_groups
+from .utils import sync_profile_role_from_groups, sync_profile_roles
 
 User = get_user_model()
 
+_suppressed: ContextVar[bool] = ContextVar("profile_signals_suppressed", default=False)
+
+
+@contextmanager
+def suppress_profile_signals():
+    """
+    대량 작업(import_members, 일괄 임명 등) 동안 행 단위 Profile/role 동기화 signal 을 끈다.
+    블록이 끝난 뒤 호출자가 sync_profile_roles() 와 invalidate_chair_cache() 를 한 번 실행해야 한다.
+    """
+    token = _suppressed.set(True)
+    try:
+        yield
+    finally:
+        _suppressed.reset(token)
+
+
+def profile_signals_suppressed() -> bool:
+    return _suppressed.get()
+
 
 @receiver(post_save, sender=User)
 def ensure_profile_exists(sender, instance: User, created: bool, raw=False, **kwargs):
@@ -15,15 +40,51 @@ def ensure_profile_exists(sender, instance: User, created: bool, raw=False, **kw
     User 생성/저장 시 Profile이 없으면 생성
     fixture loaddata 중(raw=True)에는 건너뜀
     """
-    if raw:
+    if raw or profile_signals_suppressed():
         return
     if not instance or not instance.pk:
         return
-    Profile.objects.get_or_create(user=instance)
+    profile, _ = Profile.objects.get_or_create(user=instance)
+    profile.user = instance
+
+    # first_name/username 변경 시 비정규화된 표시 이름도 갱신
+    if profile.refresh_display_name():
+        Profile.objects.filter(pk=profile.pk).update(display_name=profile.display_name)
+
     sync_profile_role_from_groups(instance)
 
 
 @receiver(m2m_changed, sender=User.groups.through)
-def sync_role_when_groups_changed(sender, instance: User, action: str, **kwargs):
-    if action in ("post_add", "post_remove", "post_clear"):
-        sync_profile_role_from_groups(instance)
\ No newline at end of file
+def sync_role_when_groups_changed(sender, instance, action: str, reverse: bool, pk_set=None, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if profile_signals_suppressed():
+        return
+
+    invalidate_chair_cache()
+
+    # role 은 캐시가 아니라 DB(그룹 소속) 기준 UPDATE 로 맞춘다.
+    # 커밋 전 트랜잭션 안에서 캐시를 채우면 롤백 시 커밋되지 않은 소속이 남을 수 있으므로.
+    if not reverse:
+        sync_profile_roles([instance.pk])
+        return
+
+    # group.user_set.add(...) 처럼 Group 쪽에서 바꾼 경우 instance 는 Group -> 대상 전체를 UPDATE 1회로
+    if pk_set:
+        sync_profile_roles(pk_set)
+    elif action == "post_clear":
+        sync_profile_roles()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_chair_cache_on_group_change(sender, **kwargs):
+    if not profile_signals_suppressed():
+        invalidate_chair_cache()
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_chair_cache_on_profile_change(sender, raw=False, **kwargs):
+    # 위원장 선택 목록(choices)에 표시 이름이 들어가므로 함께 무효화
+    if not raw and not profile_signals_suppressed():
+        invalidate_chair_cache()
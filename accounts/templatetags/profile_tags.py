@@ -1,7 +1,8 @@
 # accounts/templatetags/profile_tags.py
 
 from django import template
-from django.core.exceptions import ObjectDoesNotExist
+
+from accounts.utils import display_name as resolve_display_name
 
 register = template.Library()
 
@@ -9,44 +10,10 @@ register = template.Library()
 @register.filter
 def display_name(user):
     """
-    템플릿에서: {{ user|display_name }}
+    템플릿에서: {{ user|display_name }} 또는 {{ user_id|display_name }}
     우선순위:
-    1) user.profile.display_name()
-    2) user.profile.full_name
-    3) user.get_full_name()
-    4) user.username
+    1) user.profile.display_name (비정규화 컬럼)
+    2) user.username
+    profile 이 로드되어 있지 않으면 요청 단위 메모를 거쳐 한 번만 조회한다.
     """
-    if not user:
-        return "-"
-
-    try:
-        profile = user.profile
-    except ObjectDoesNotExist:
-        profile = None
-
-    if profile:
-        # 1) display_name() 메서드
-        try:
-            fn = getattr(profile, "display_name", None)
-            if callable(fn):
-                name = (fn() or "").strip()
-                if name:
-                    return name
-        except Exception:
-            pass
-
-        # 2) full_name
-        name = (getattr(profile, "full_name", "") or "").strip()
-        if name:
-            return name
-
-    # 3) user.get_full_name()
-    try:
-        name = (user.get_full_name() or "").strip()
-        if name:
-            return name
-    except Exception:
-        pass
-
-    # 4) username
-    return getattr(user, "username", "-")
\ No newline at end of file
+    return resolve_display_name(user)
@@ -1,3 +1,214 @@
+import io
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from approvals.permissions import CHAIR_GROUP, chair_cache_key, is_chair
+
+from .models import Profile
+from .request_cache import RequestCacheMiddleware
+from .utils import appoint_chairs, demote_chairs, display_name, display_names, sync_profile_roles
+
+User = get_user_model()
+
+
+class DisplayNameTests(TestCase):
+    def setUp(self):
+        self.named = User.objects.create_user(username="named", password="pw1234")
+        self.named.profile.full_name = "홍길동"
+        self.named.profile.save(update_fields=["full_name"])
+        self.plain = User.objects.create_user(username="plain", password="pw1234", first_name="철수")
+
+    def test_display_name_column_follows_profile_and_user(self):
+        self.assertEqual(Profile.objects.get(user=self.named).display_name, "홍길동")
+        self.assertEqual(Profile.objects.get(user=self.plain).display_name, "철수")
+
+        self.plain.first_name = ""
+        self.plain.save()
+        self.assertEqual(Profile.objects.get(user=self.plain).display_name, "plain")
+
+    def test_batch_resolver_uses_single_query(self):
+        with self.assertNumQueries(1):
+            names = display_names([self.named.id, self.plain.id])
+
+        self.assertEqual(names, {self.named.id: "홍길동", self.plain.id: "철수"})
+
+    def test_resolver_is_memoized_per_request(self):
+        def view(request):
+            display_names([self.named.id, self.plain.id])
+            with self.assertNumQueries(0):
+                self.assertEqual(display_name(self.named.id), "홍길동")
+                self.assertEqual(display_name(User(id=self.plain.id, username="plain")), "철수")
+            return None
+
+        RequestCacheMiddleware(view)(None)
+
+    def test_loaded_profile_needs_no_query(self):
+        user = User.objects.select_related("profile").get(id=self.named.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(display_name(user), "홍길동")
+
+
+class ImportMembersTests(TestCase):
+    def _write(self, suffix: str, text: str) -> str:
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_csv_import_creates_users_profiles_and_roles(self):
+        User.objects.create_user(username="exists", password="pw1234")
+        path = self._write(
+            ".csv",
+            "username,full_name,first_name,groups,pungsam_cho\n"
+            "m1,홍길동,,CHAIR,DONE\n"
+            "m2,,철수,,\n"
+            "exists,중복,,,\n",
+        )
+
+        out = io.StringIO()
+        call_command("import_members", path, stdout=out)
+
+        m1 = User.objects.get(username="m1")
+        m2 = User.objects.get(username="m2")
+        self.assertFalse(m1.has_usable_password())
+        self.assertEqual(m1.profile.display_name, "홍길동")
+        self.assertEqual(m1.profile.pungsam_cho, "DONE")
+        self.assertEqual(m1.profile.role, Profile.ROLE_CHAIR)
+        self.assertTrue(is_chair(m1))
+        self.assertEqual(m2.profile.display_name, "철수")
+        self.assertEqual(m2.profile.role, Profile.ROLE_MEMBER)
+        self.assertEqual(Profile.objects.get(user__username="exists").full_name, "")
+        self.assertIn("건너뜀 1명", out.getvalue())
+
+    def test_jsonl_import_query_count_does_not_grow_per_row(self):
+        Group.objects.get_or_create(name=CHAIR_GROUP)
+
+        def run(prefix: str, n: int) -> int:
+            lines = "\n".join(
+                f'{{"username": "{prefix}{i}", "groups": ["{CHAIR_GROUP}"]}}' for i in range(n)
+            )
+            path = self._write(".jsonl", lines)
+            with CaptureQueriesContext(connection) as ctx:
+                call_command("import_members", path, stdout=io.StringIO())
+            return len(ctx.captured_queries)
+
+        self.assertEqual(run("a", 2), run("b", 20))
+        self.assertEqual(User.objects.filter(groups__name=CHAIR_GROUP).count(), 22)
+        self.assertEqual(Profile.objects.filter(role=Profile.ROLE_CHAIR).count(), 22)
+
+    def test_roles_are_synced_per_batch(self):
+        Group.objects.get_or_create(name=CHAIR_GROUP)
+        lines = "\n".join(f'{{"username": "c{i}", "groups": ["{CHAIR_GROUP}"]}}' for i in range(5))
+        path = self._write(".jsonl", lines)
+        out = io.StringIO()
+
+        with mock.patch(
+            "accounts.management.commands.import_members.sync_profile_roles", wraps=sync_profile_roles
+        ) as sync:
+            call_command("import_members", path, "--batch-size", "2", stdout=out)
+
+        self.assertEqual([len(c.args[0]) for c in sync.call_args_list], [2, 2, 1])
+        self.assertEqual(Profile.objects.filter(role=Profile.ROLE_CHAIR).count(), 5)
+        self.assertIn("위원장 표시 5명", out.getvalue())
+
+    def test_sync_profile_roles_fixes_drift(self):
+        user = User.objects.create_user(username="drift", password="pw1234")
+        Profile.objects.filter(user=user).update(role=Profile.ROLE_CHAIR)
+
+        self.assertEqual(sync_profile_roles(), 1)
+        self.assertEqual(Profile.objects.get(user=user).role, Profile.ROLE_MEMBER)
+        self.assertEqual(sync_profile_roles(), 0)
+
+
+class BulkChairTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="staff", password="pw1234", is_staff=True)
+        self.users = [User.objects.create_user(username=f"u{i}", password="pw1234") for i in range(5)]
+        Group.objects.get_or_create(name=CHAIR_GROUP)
+
+    def _ids(self, users):
+        return [u.id for u in users]
+
+    def test_appoint_and_demote_use_constant_queries(self):
+        with CaptureQueriesContext(connection) as small:
+            appoint_chairs(self._ids(self.users[:1]))
+        with CaptureQueriesContext(connection) as large:
+            added = appoint_chairs(self._ids(self.users))
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertEqual(added, 4)
+        self.assertEqual(Profile.objects.filter(role=Profile.ROLE_CHAIR).count(), 5)
+        self.assertTrue(is_chair(self.users[4]))
+
+        self.assertEqual(demote_chairs(self._ids(self.users[:3])), 3)
+        roles = dict(Profile.objects.filter(user__in=self.users).values_list("user__username", "role"))
+        self.assertEqual(roles, {"u0": "MEMBER", "u1": "MEMBER", "u2": "MEMBER", "u3": "CHAIR", "u4": "CHAIR"})
+        self.assertFalse(is_chair(self.users[0]))
+
+    def test_chair_cache_is_invalidated_again_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            appoint_chairs(self._ids(self.users[:1]))
+            # 커밋 전에 다른 요청이 옛 소속을 다시 캐시한 상황
+            cache.set(chair_cache_key("ids"), frozenset(), 300)
+            self.assertFalse(is_chair(self.users[0]))
+
+        for callback in callbacks:
+            callback()
+        self.assertTrue(is_chair(self.users[0]))
+
+    def test_bulk_view_appoints_selected_profiles(self):
+        self.client.force_login(self.staff)
+        profile_ids = list(Profile.objects.filter(user__in=self.users[:2]).values_list("id", flat=True))
+
+        res = self.client.post(reverse("accounts:bulk_chair"), {"profile_ids": profile_ids, "action": "appoint"})
+
+        self.assertRedirects(res, reverse("accounts:profile_list"))
+        self.assertEqual(
+            set(User.objects.filter(groups__name=CHAIR_GROUP).values_list("username", flat=True)),
+            {"u0", "u1"},
+        )
+
+
+class ProfileListTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="zz_staff", password="pw1234", is_staff=True)
+        for i, status in enumerate(["DONE", "DONE", "ING", ""]):
+            u = User.objects.create_user(username=f"p{i}", password="pw1234")
+            Profile.objects.filter(user=u).update(pungsam_cho=status, display_name=f"김{i}")
+        self.client.force_login(self.staff)
+
+    def _get(self, **params):
+        res = self.client.get(reverse("accounts:profile_list"), params)
+        self.assertEqual(res.status_code, 200)
+        return res
+
+    def test_filters_and_counts(self):
+        res = self._get(pungsam_cho="DONE")
+        self.assertEqual([p.display_name for p in res.context["profiles"]], ["김0", "김1"])
+        self.assertEqual(res.context["counts"]["total"], 2)
+
+        res = self._get(pungsam_cho="none", q="김")
+        self.assertEqual([p.display_name for p in res.context["profiles"]], ["김3"])
+
+        counts = self._get().context["counts"]
+        self.assertEqual(counts["total"], 5)
+        cho = dict((code, n) for code, _, n in counts["training"][0][1])
+        self.assertEqual(cho, {"none": 2, "ING": 1, "DONE": 2, "GRAD": 0})
 
-# Create your tests here.
+    @mock.patch("accounts.views.PROFILE_LIST_PAGE_SIZE", 2)
+    def test_page_is_limited(self):
+        res = self._get(page=2)
+        self.assertEqual(len(res.context["profiles"]), 2)
+        self.assertEqual(res.context["page_obj"].paginator.num_pages, 3)
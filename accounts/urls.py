@@ -8,6 +8,7 @@ from .views import (
     profile_list,
     appoint_chair_view,
     demote_chair_view,
+    bulk_chair_view,
     profile_detail,
     profile_edit,
 )
@@ -28,4 +29,5 @@ urlpatterns = [
     path("profiles/", profile_list, name="profile_list"),
     path("profiles/<int:profile_id>/appoint-chair/", appoint_chair_view, name="appoint_chair"),
     path("profiles/<int:profile_id>/demote-chair/", demote_chair_view, name="demote_chair"),
+    path("profiles/bulk-chair/", bulk_chair_view, name="bulk_chair"),
 ]
\ No newline at end of file
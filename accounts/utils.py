@@ -1,20 +1,71 @@
 # accounts/utils.py
+from typing import Iterable
+
 from django.contrib.auth.models import Group
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
 
-from approvals.permissions import CHAIR_GROUP  # 표준 그룹명 "CHAIR"
+from approvals.permissions import CHAIR_GROUP, invalidate_chair_cache, is_chair  # 표준 그룹명 "CHAIR"
 
 from .models import Profile
+from .request_cache import request_memo
 
 User = get_user_model()
 
 
+def display_names(user_ids: Iterable[int]) -> dict[int, str]:
+    """
+    여러 사용자의 표시 이름을 한 번에 조회한다. {user_id: 이름}
+    - Profile.display_name(비정규화 컬럼) -> username 순
+    - profile join 쿼리 1회, 요청 중에는 이미 조회한 id를 다시 조회하지 않는다.
+    """
+    ids = {int(i) for i in user_ids if i}
+    memo = request_memo()
+    names = memo.setdefault("display_names", {}) if memo is not None else {}
+
+    missing = ids - names.keys()
+    if missing:
+        rows = User.objects.filter(id__in=missing).values_list("id", "profile__display_name", "username")
+        for uid, profile_name, username in rows:
+            names[uid] = (profile_name or "").strip() or username
+
+    return {uid: names[uid] for uid in ids if uid in names}
+
+
+def display_name(user, default: str = "-") -> str:
+    """
+    화면/메일/내보내기 공통 표시 이름
+    - 이미 로드된 user.profile 이 있으면 추가 쿼리 없이 사용
+    - 아니면 display_names() 로 조회(요청 단위 메모)
+    """
+    if not user:
+        return default
+
+    if isinstance(user, int):
+        return display_names([user]).get(user, default)
+
+    descriptor = getattr(type(user), "profile", None)
+    if descriptor is not None and descriptor.is_cached(user):
+        try:
+            name = (user.profile.display_name or "").strip()
+        except ObjectDoesNotExist:
+            name = ""
+        if name:
+            return name
+    elif getattr(user, "pk", None):
+        name = display_names([user.pk]).get(user.pk, "")
+        if name:
+            return name
+
+    return (getattr(user, "username", "") or default).strip() or default
+
+
 def is_user_in_chair_group(user: User) -> bool:
     if not user or not getattr(user, "is_authenticated", False):
         return False
-    if user.is_superuser:
-        return True
-    return user.groups.filter(name=CHAIR_GROUP).exists()
+    return is_chair(user)
 
 
 def sync_profile_role_from_groups(user: User) -> None:
@@ -32,4 +83,84 @@ def sync_profile_role_from_groups(user: User) -> None:
 
     if profile.role != desired_role:
         profile.role = desired_role
-        profile.save(update_fields=["role"])
\ No newline at end of file
+        profile.save(update_fields=["role"])
+
+
+def _chair_condition() -> Q:
+    """
+    Profile 기준 '위원장으로 표시해야 하는가' 조건 (superuser 이거나 CHAIR 그룹 소속)
+    """
+    superuser = User.objects.filter(pk=OuterRef("user_id"), is_superuser=True)
+    in_chair_group = User.groups.through.objects.filter(user_id=OuterRef("user_id"), group__name=CHAIR_GROUP)
+    return Q(Exists(superuser)) | Q(Exists(in_chair_group))
+
+
+def sync_profile_roles(user_ids: Iterable[int] | None = None) -> int:
+    """
+    Profile.role 을 그룹 상태에 맞춰 UPDATE 1회로 일괄 동기화하고 변경된 행 수를 반환한다.
+    - user_ids 가 None 이면 전체 프로필 대상
+    - 이미 맞는 행은 WHERE 조건에서 제외되어 건드리지 않는다.
+    """
+    is_chair_row = _chair_condition()
+
+    qs = Profile.objects.all()
+    if user_ids is not None:
+        ids = {int(i) for i in user_ids if i}
+        if not ids:
+            return 0
+        qs = qs.filter(user_id__in=ids)
+
+    return qs.filter(
+        (is_chair_row & ~Q(role=Profile.ROLE_CHAIR)) | (~is_chair_row & ~Q(role=Profile.ROLE_MEMBER))
+    ).update(
+        role=Case(
+            When(is_chair_row, then=Value(Profile.ROLE_CHAIR)),
+            default=Value(Profile.ROLE_MEMBER),
+        )
+    )
+
+
+def _clean_ids(user_ids: Iterable) -> set[int]:
+    return {int(i) for i in user_ids if str(i).strip().isdigit()}
+
+
+@transaction.atomic
+def appoint_chairs(user_ids: Iterable[int]) -> int:
+    """
+    여러 사용자를 CHAIR 그룹에 한 번에 추가하고 새로 임명된 인원 수를 반환한다.
+    - 소속 추가: INSERT 1회 (이미 소속이면 건너뜀)
+    - role 동기화: sync_profile_roles() UPDATE 1회
+    """
+    ids = set(User.objects.filter(id__in=_clean_ids(user_ids)).values_list("id", flat=True))
+    if not ids:
+        return 0
+
+    chair_group, _ = Group.objects.get_or_create(name=CHAIR_GROUP)
+    Membership = User.groups.through
+    already = set(Membership.objects.filter(group=chair_group, user_id__in=ids).values_list("user_id", flat=True))
+    Membership.objects.bulk_create(
+        [Membership(user_id=uid, group_id=chair_group.id) for uid in ids - already],
+        ignore_conflicts=True,
+    )
+
+    sync_profile_roles(ids)
+    invalidate_chair_cache()
+    return len(ids - already)
+
+
+@transaction.atomic
+def demote_chairs(user_ids: Iterable[int]) -> int:
+    """
+    여러 사용자를 CHAIR 그룹에서 한 번에 제외하고 해제된 인원 수를 반환한다.
+    - 소속 삭제: DELETE 1회
+    - role 동기화: sync_profile_roles() UPDATE 1회 (superuser 는 계속 CHAIR 표시)
+    """
+    ids = _clean_ids(user_ids)
+    if not ids:
+        return 0
+
+    removed, _ = User.groups.through.objects.filter(group__name=CHAIR_GROUP, user_id__in=ids).delete()
+
+    sync_profile_roles(ids)
+    invalidate_chair_cache()
+    return removed
@@ -1,16 +1,16 @@
 from django.contrib import messages
 from django.contrib.auth import get_user_model, views as auth_views
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.contrib.auth.models import Group
+from django.core.paginator import Paginator
+from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_POST
 
-from approvals.permissions import CHAIR_GROUP
 from .forms import SignupForm, ProfileUpdateForm
 from .models import Profile
-from .utils import sync_profile_role_from_groups
+from .utils import appoint_chairs, demote_chairs
 
 User = get_user_model()
 
@@ -62,36 +62,151 @@ def is_staff_user(user) -> bool:
 staff_required = user_passes_test(is_staff_user)
 
 
+PROFILE_LIST_PAGE_SIZE = 50
+
+# 사용자 목록 필터/집계 대상 교육 과정 필드
+TRAINING_FIELDS = (
+    ("pungsam_cho", "풍삶초"),
+    ("pungsam_first", "풍삶첫"),
+    ("pungsam_gi", "풍삶기"),
+    ("leader_course", "이끄미"),
+)
+
+
+def _profile_filters(params) -> tuple[Q, dict]:
+    """
+    GET 파라미터 -> (필터 조건, 화면에 되돌려줄 선택값)
+    교육 상태 "" 는 '미진행' 이라 선택 안 함과 구분하기 위해 "none" 으로 받는다.
+    """
+    cond = Q()
+    selected = {}
+
+    q = (params.get("q") or "").strip()[:50]
+    if q:
+        cond &= Q(display_name__startswith=q)
+    selected["q"] = q
+
+    role = params.get("role") or ""
+    if role in dict(Profile.ROLE_CHOICES):
+        cond &= Q(role=role)
+    else:
+        role = ""
+    selected["role"] = role
+
+    statuses = dict(Profile.TRAINING_STATUS_CHOICES)
+    for field, _ in TRAINING_FIELDS:
+        value = params.get(field) or ""
+        code = "" if value == "none" else value
+        if value and code in statuses:
+            cond &= Q(**{field: code})
+        else:
+            value = ""
+        selected[field] = value
+
+    return cond, selected
+
+
+def _profile_status_counts(qs) -> dict:
+    """
+    역할/교육 상태별 인원 수를 집계 쿼리 1회로 계산
+    """
+    aggregates = {"total": Count("id")}
+    for code, _ in Profile.ROLE_CHOICES:
+        aggregates[f"role_{code}"] = Count("id", filter=Q(role=code))
+    for field, _ in TRAINING_FIELDS:
+        for code, _ in Profile.TRAINING_STATUS_CHOICES:
+            aggregates[f"{field}_{code or 'none'}"] = Count("id", filter=Q(**{field: code}))
+
+    row = qs.aggregate(**aggregates)
+    return {
+        "total": row["total"],
+        "roles": [(code, label, row[f"role_{code}"]) for code, label in Profile.ROLE_CHOICES],
+        "training": [
+            (
+                label,
+                [
+                    (code or "none", status_label, row[f"{field}_{code or 'none'}"])
+                    for code, status_label in Profile.TRAINING_STATUS_CHOICES
+                ],
+            )
+            for field, label in TRAINING_FIELDS
+        ],
+    }
+
+
 @staff_required
 def profile_list(request):
-    profiles = Profile.objects.select_related("user").order_by("user__username")
-    return render(request, "approvals/profile_list.html", {"profiles": profiles})
+    cond, selected = _profile_filters(request.GET)
+    filtered = Profile.objects.filter(cond)
+
+    profiles = (
+        filtered.select_related("user")
+        .only("id", "user_id", "display_name", "phone", "role", "user__username", "user__email")
+        .order_by("display_name", "id")
+    )
+    page_obj = Paginator(profiles, PROFILE_LIST_PAGE_SIZE).get_page(request.GET.get("page"))
+
+    query = request.GET.copy()
+    query.pop("page", None)
+
+    return render(
+        request,
+        "approvals/profile_list.html",
+        {
+            "profiles": page_obj.object_list,
+            "page_obj": page_obj,
+            "counts": _profile_status_counts(filtered),
+            "selected": selected,
+            "role_choices": Profile.ROLE_CHOICES,
+            "training_fields": [
+                (field, label, selected[field]) for field, label in TRAINING_FIELDS
+            ],
+            "status_choices": [(code or "none", label) for code, label in Profile.TRAINING_STATUS_CHOICES],
+            "query_string": query.urlencode(),
+        },
+    )
 
 
 @staff_required
 @require_POST
 def appoint_chair_view(request, profile_id: int):
-    profile = get_object_or_404(Profile, id=profile_id)
-    user = profile.user
-
-    chair_group, _ = Group.objects.get_or_create(name=CHAIR_GROUP)
-    user.groups.add(chair_group)
-    sync_profile_role_from_groups(user)
+    profile = get_object_or_404(Profile.objects.only("id", "user_id", "display_name"), id=profile_id)
+    appoint_chairs([profile.user_id])
 
-    messages.success(request, f"{profile.display_name()} 님을 위원장으로 임명했습니다.")
+    messages.success(request, f"{profile.display_name} 님을 위원장으로 임명했습니다.")
     return redirect("accounts:profile_list")
 
 
 @staff_required
 @require_POST
 def demote_chair_view(request, profile_id: int):
-    profile = get_object_or_404(Profile, id=profile_id)
-    user = profile.user
+    profile = get_object_or_404(Profile.objects.only("id", "user_id", "display_name"), id=profile_id)
+    demote_chairs([profile.user_id])
+
+    messages.success(request, f"{profile.display_name} 님의 위원장 권한을 해제했습니다.")
+    return redirect("accounts:profile_list")
 
-    user.groups.remove(*user.groups.filter(name=CHAIR_GROUP))
-    sync_profile_role_from_groups(user)
 
-    messages.success(request, f"{profile.display_name()} 님의 위원장 권한을 해제했습니다.")
+@staff_required
+@require_POST
+def bulk_chair_view(request):
+    """
+    사용자 목록에서 체크한 프로필들을 한 번에 임명/해제
+    POST profile_ids=<id>...&action=appoint|demote
+    """
+    action = request.POST.get("action")
+    profile_ids = [i for i in request.POST.getlist("profile_ids") if i.isdigit()]
+    if action not in {"appoint", "demote"} or not profile_ids:
+        messages.error(request, "대상 사용자와 작업을 선택해주세요.")
+        return redirect("accounts:profile_list")
+
+    user_ids = Profile.objects.filter(id__in=profile_ids).values_list("user_id", flat=True)
+    if action == "appoint":
+        count = appoint_chairs(user_ids)
+        messages.success(request, f"{count}명을 위원장으로 임명했습니다.")
+    else:
+        count = demote_chairs(user_ids)
+        messages.success(request, f"{count}명의 위원장 권한을 해제했습니다.")
     return redirect("accounts:profile_list")
 
 
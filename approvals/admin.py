@@ -1,120 +1,129 @@
 from __future__ import annotations
 
 import csv
+import hashlib
 import io
 import os
-import re
-import tempfile
-import zipfile
-from pathlib import Path
 
+from django.conf import settings
 from django.contrib import admin, messages
-from django.http import FileResponse, HttpRequest, HttpResponse
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
 from django.template.defaultfilters import truncatechars
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 
-from .models import Attachment, Document, DocumentLine
+from accounts.utils import display_name
+
+from .exports import local_dt
+from .jobs import enqueue_export_job
+from .models import Attachment, Document, DocumentLine, ExportJob
+from .services import sync_documents_after_edit
 
 
 # -----------------------------
 # Shared helpers
 # -----------------------------
-_ILLEGAL_FS_CHARS = r'\\/:*?"<>|'
-_ILLEGAL_FS_RE = re.compile(f"[{re.escape(_ILLEGAL_FS_CHARS)}]")
+def _message_export_job(modeladmin, request: HttpRequest, job: ExportJob) -> None:
+    url = reverse("approvals:export_job", args=[job.id])
+    modeladmin.message_user(
+        request,
+        format_html('내보내기 작업 #{}을(를) 등록했습니다. <a href="{}">진행 상황 보기</a>', job.id, url),
+        level=messages.INFO,
+    )
 
 
-def safe_component(value: object, default: str = "untitled") -> str:
+def _estimated_rows(queryset) -> int | None:
+    """
+    PostgreSQL 통계(pg_class.reltuples)의 테이블 행 수 추정치. ANALYZE/autovacuum 이 갱신한다.
+    다른 DB 이거나 아직 통계가 없으면 None.
     """
-    Make a string safe to be used in filenames / zip arcnames.
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples FROM pg_class WHERE oid = to_regclass(%s)", [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:  # -1: 아직 ANALYZE 전
+        return None
+    return int(row[0])
+
+
+class ApproximateCountPaginator(Paginator):
     """
-    s = str(value or "").strip()
-    s = s.replace("\n", " ").replace("\r", " ").replace("\t", " ")
-    s = _ILLEGAL_FS_RE.sub(" ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s if s else default
+    큰 테이블 관리자 목록용: 페이지를 열 때마다 전체 COUNT(*) 를 하지 않는다.
+    - 필터/검색이 없는 목록: PostgreSQL 행 수 추정치 (ADMIN_ESTIMATE_MIN_ROWS 이상일 때만, 작은 테이블은 정확히 센다)
+    - 그 밖: 같은 조건의 COUNT(*) 결과를 ADMIN_COUNT_CACHE_SECONDS 동안 캐시 (페이지를 넘길 때 다시 세지 않음)
+    그래서 건수와 마지막 페이지는 실제와 조금 다를 수 있다.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        qs = self.object_list
+        if not qs.query.where:
+            estimate = _estimated_rows(qs)
+            if estimate is not None and estimate >= settings.ADMIN_ESTIMATE_MIN_ROWS:
+                return estimate
 
+        sql, params = qs.query.sql_with_params()
+        key = "admin_count:" + hashlib.sha1(f"{qs.db}|{sql}|{params!r}".encode()).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = qs.count()
+            cache.set(key, count, settings.ADMIN_COUNT_CACHE_SECONDS)
+        return count
 
-def unique_arcname(used: set[str], arcname: str) -> str:
+
+class LargeTableAdmin(admin.ModelAdmin):
     """
-    Ensure arcname is unique within a zip by appending " (2)", " (3)", ...
+    행이 많은 모델(문서/결재 라인/첨부)의 관리자 기본값
+    - 대략적인 건수 페이지네이터, "전체 N건" 표시용 COUNT(*) 생략
+    - FK 는 raw_id_fields 로 지정한다 (수정 화면이 회원/문서 전체를 선택 상자로 불러오지 않게)
     """
-    if arcname not in used:
-        used.add(arcname)
-        return arcname
-
-    p = Path(arcname)
-    stem, suffix = p.stem, p.suffix
-    parent = str(p.parent)
-    if parent == ".":
-        parent = ""
-
-    i = 2
-    while True:
-        candidate_name = f"{stem} ({i}){suffix}"
-        candidate = f"{parent}/{candidate_name}" if parent else candidate_name
-        if candidate not in used:
-            used.add(candidate)
-            return candidate
-        i += 1
-
-
-def display_name(user) -> str:
+
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+
+class DocumentChildAdmin(LargeTableAdmin):
     """
-    profile.display_name() -> profile.full_name -> user.get_full_name() -> user.username -> "-"
+    결재 라인/첨부 관리자: 서비스를 거치지 않는 수정/삭제 뒤 문서의 열람 권한 캐시와 revision 을 맞춘다.
+    문서(FK)를 바꾼 경우 이전 문서도 함께.
     """
-    if not user:
-        return "-"
-
-    profile = getattr(user, "profile", None)
-    if profile:
-        method = getattr(profile, "display_name", None)
-        if callable(method):
-            try:
-                value = method()
-                if value:
-                    return str(value)
-            except Exception:
-                pass
-
-        value = getattr(profile, "full_name", None)
-        if value:
-            return str(value)
-
-    try:
-        value = user.get_full_name()
-        if value:
-            return str(value)
-    except Exception:
-        pass
-
-    value = getattr(user, "username", None)
-    return str(value) if value else "-"
-
-
-def local_dt(dt) -> str:
-    if not dt:
-        return ""
-    try:
-        return timezone.localtime(dt).strftime("%Y-%m-%d %H:%M:%S")
-    except Exception:
-        return str(dt)
-
-
-def _zip_response_from_spooled_file(
-    spooled_file, download_name: str, content_type: str = "application/zip"
-) -> FileResponse:
-    spooled_file.seek(0)
-    resp = FileResponse(spooled_file, as_attachment=True, filename=download_name)
-    resp["Content-Type"] = content_type
-    return resp
+
+    def save_model(self, request, obj, form, change):
+        previous = form.initial.get("document") if change else None
+        super().save_model(request, obj, form, change)
+        sync_documents_after_edit({obj.document_id, previous})
+
+    def delete_model(self, request, obj):
+        doc_id = obj.document_id
+        super().delete_model(request, obj)
+        sync_documents_after_edit({doc_id})
+
+    def delete_queryset(self, request, queryset):
+        doc_ids = set(queryset.values_list("document_id", flat=True))
+        super().delete_queryset(request, queryset)
+        sync_documents_after_edit(doc_ids)
+
+
+def _document_link(obj) -> str:
+    """
+    라인/첨부 목록의 문서 열: Document.__str__(상태 표시) 대신 번호와 제목만
+    """
+    url = reverse("admin:approvals_document_change", args=[obj.document_id])
+    return format_html('<a href="{}">#{} {}</a>', url, obj.document_id, truncatechars(obj.document.title, 40))
 
 
 # -----------------------------
 # Document Admin
 # -----------------------------
 @admin.register(Document)
-class DocumentAdmin(admin.ModelAdmin):
+class DocumentAdmin(LargeTableAdmin):
     actions = ["export_documents_csv", "download_documents_attachments_zip"]
 
     list_display = (
@@ -129,6 +138,15 @@ class DocumentAdmin(admin.ModelAdmin):
     list_filter = ("status", "created_at", "updated_at")
     search_fields = ("title", "content")
     ordering = ("-id",)
+    list_select_related = ("created_by__profile",)
+    date_hierarchy = "created_at"
+    raw_id_fields = ("created_by",)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # 작성자를 바꾸면 열람 권한 캐시(DocumentViewer)도 새 작성자 기준으로 다시 맞춘다.
+        if change and "created_by" in form.changed_data:
+            sync_documents_after_edit({obj.id})
 
     @admin.display(description="작성자")
     def created_by_display(self, obj: Document) -> str:
@@ -144,7 +162,7 @@ class DocumentAdmin(admin.ModelAdmin):
             self.message_user(request, "선택된 문서가 없습니다.", level=messages.WARNING)
             return None
 
-        qs = queryset.select_related("created_by")
+        qs = queryset.select_related("created_by__profile")
 
         buffer = io.StringIO()
         writer = csv.writer(buffer)
@@ -175,66 +193,44 @@ class DocumentAdmin(admin.ModelAdmin):
             self.message_user(request, "선택된 문서가 없습니다.", level=messages.WARNING)
             return None
 
-        qs = queryset.prefetch_related("attachments")
-
-        spooled = tempfile.SpooledTemporaryFile(max_size=50 * 1024 * 1024, mode="w+b")
-        used_names: set[str] = set()
-        wrote_any = False
-
-        with zipfile.ZipFile(spooled, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for doc in qs:
-                folder = safe_component(f"doc_{doc.id}_{getattr(doc, 'title', '')}")
-                atts = list(getattr(doc, "attachments", []).all())
-
-                for att in atts:
-                    f = getattr(att, "file", None)
-                    if not f:
-                        continue
-
-                    try:
-                        original_name = os.path.basename(getattr(f, "name", "") or "")
-                        safe_name = safe_component(original_name or f"attachment_{att.id}")
-                        arcname = unique_arcname(used_names, f"{folder}/{safe_name}")
-
-                        f.open("rb")
-                        try:
-                            data = f.read()
-                        finally:
-                            try:
-                                f.close()
-                            except Exception:
-                                pass
-
-                        zf.writestr(arcname, data)
-                        wrote_any = True
-                    except Exception:
-                        continue
-
-        if not wrote_any:
+        if not Attachment.objects.filter(document__in=queryset).exists():
             self.message_user(
                 request,
                 "선택된 문서들에 다운로드할 첨부파일이 없습니다.",
                 level=messages.WARNING,
             )
-            try:
-                spooled.close()
-            except Exception:
-                pass
             return None
 
-        filename = f"documents_attachments_{timezone.now().strftime('%Y%m%d_%H%M%S')}.zip"
-        return _zip_response_from_spooled_file(spooled, filename)
+        job = enqueue_export_job(
+            user=request.user,
+            kind=ExportJob.Kind.DOCS_ZIP,
+            params={"document_ids": list(queryset.values_list("id", flat=True))},
+        )
+        _message_export_job(self, request, job)
+        return None
 
 
 # -----------------------------
 # DocumentLine Admin
 # -----------------------------
 @admin.register(DocumentLine)
-class DocumentLineAdmin(admin.ModelAdmin):
-    list_display = ("id", "document", "order", "role", "user_display", "decision", "acted_at")
+class DocumentLineAdmin(DocumentChildAdmin):
+    list_display = ("id", "document_display", "order", "role", "user_display", "decision", "acted_at")
     list_filter = ("role", "decision", "acted_at")
     search_fields = ("document__title", "user__username", "user__first_name", "user__last_name")
-    ordering = ("document_id", "order", "id")
+    # (document, order) 정렬은 인덱스가 없어 전체 정렬이 필요하다. 최신 라인부터 (= 최신 문서부터)
+    ordering = ("-id",)
+    list_select_related = ("document", "user__profile")
+    date_hierarchy = "acted_at"
+    raw_id_fields = ("document", "user")
+
+    def get_queryset(self, request: HttpRequest):
+        # 목록에는 문서 제목만 쓰므로 본문은 읽지 않는다.
+        return super().get_queryset(request).defer("document__content")
+
+    @admin.display(description="문서", ordering="document_id")
+    def document_display(self, obj: DocumentLine) -> str:
+        return _document_link(obj)
 
     @admin.display(description="대상")
     def user_display(self, obj: DocumentLine) -> str:
@@ -245,13 +241,23 @@ class DocumentLineAdmin(admin.ModelAdmin):
 # Attachment Admin
 # -----------------------------
 @admin.register(Attachment)
-class AttachmentAdmin(admin.ModelAdmin):
+class AttachmentAdmin(DocumentChildAdmin):
     actions = ["export_attachments_csv", "download_attachments_zip"]
 
-    list_display = ("id", "document", "file_link", "uploader_display", "created_at")
+    list_display = ("id", "document_display", "file_link", "uploader_display", "created_at")
     list_filter = ("created_at",)
     search_fields = ("document__title", "file")
     ordering = ("-id",)
+    list_select_related = ("document", "uploaded_by__profile")
+    date_hierarchy = "created_at"
+    raw_id_fields = ("document", "uploaded_by")
+
+    def get_queryset(self, request: HttpRequest):
+        return super().get_queryset(request).defer("document__content")
+
+    @admin.display(description="문서", ordering="document_id")
+    def document_display(self, obj: Attachment) -> str:
+        return _document_link(obj)
 
     @admin.display(description="업로더")
     def uploader_display(self, obj: Attachment) -> str:
@@ -273,7 +279,7 @@ class AttachmentAdmin(admin.ModelAdmin):
             self.message_user(request, "선택된 첨부파일이 없습니다.", level=messages.WARNING)
             return None
 
-        qs = queryset.select_related("document", "uploaded_by")
+        qs = queryset.select_related("document", "uploaded_by__profile")
 
         buffer = io.StringIO()
         writer = csv.writer(buffer)
@@ -320,53 +326,26 @@ class AttachmentAdmin(admin.ModelAdmin):
             self.message_user(request, "선택된 첨부파일이 없습니다.", level=messages.WARNING)
             return None
 
-        qs = queryset.select_related("document")
-
-        spooled = tempfile.SpooledTemporaryFile(max_size=50 * 1024 * 1024, mode="w+b")
-        used_names: set[str] = set()
-        wrote_any = False
-
-        with zipfile.ZipFile(spooled, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for att in qs:
-                f = getattr(att, "file", None)
-                if not f:
-                    continue
-
-                doc = getattr(att, "document", None)
-                folder = safe_component(
-                    f"doc_{getattr(doc, 'id', 'x')}_{getattr(doc, 'title', '')}" if doc else "no_document"
-                )
-
-                try:
-                    original_name = os.path.basename(getattr(f, "name", "") or "")
-                    safe_name = safe_component(original_name or f"attachment_{att.id}")
-                    arcname = unique_arcname(used_names, f"{folder}/{safe_name}")
-
-                    f.open("rb")
-                    try:
-                        data = f.read()
-                    finally:
-                        try:
-                            f.close()
-                        except Exception:
-                            pass
-
-                    zf.writestr(arcname, data)
-                    wrote_any = True
-                except Exception:
-                    continue
-
-        if not wrote_any:
-            self.message_user(
-                request,
-                "다운로드할 첨부파일이 없습니다.",
-                level=messages.WARNING,
-            )
-            try:
-                spooled.close()
-            except Exception:
-                pass
-            return None
+        job = enqueue_export_job(
+            user=request.user,
+            kind=ExportJob.Kind.ATTACHMENTS_ZIP,
+            params={"attachment_ids": list(queryset.values_list("id", flat=True))},
+        )
+        _message_export_job(self, request, job)
+        return None
+
+
+# -----------------------------
+# ExportJob Admin
+# -----------------------------
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "requester_display", "created_at", "finished_at", "expires_at")
+    list_filter = ("kind", "status")
+    ordering = ("-id",)
+    readonly_fields = ("created_at", "started_at", "finished_at")
+    list_select_related = ("requested_by__profile",)
 
-        filename = f"attachments_{timezone.now().strftime('%Y%m%d_%H%M%S')}.zip"
-        return _zip_response_from_spooled_file(spooled, filename)
+    @admin.display(description="요청자")
+    def requester_display(self, obj: ExportJob) -> str:
+        return display_name(getattr(obj, "requested_by", None))
@@ -0,0 +1,117 @@
+# approvals/archive.py
+"""
+오래된 완료/반려 문서 보관 (archive_documents 명령)
+
+마지막 변경(updated_at)이 기준 시각보다 오래된 COMPLETED/REJECTED 문서를 결재 라인, 첨부, 열람 권한과 함께
+Archived* 테이블로 옮기고 운영 테이블에서 지운다. 문서 batch_size 건마다 트랜잭션 하나.
+- id 를 그대로 옮기므로 상세/첨부 URL 은 바뀌지 않는다 (selectors.document_detail 등이 보관 테이블도 찾는다).
+- 첨부 파일은 옮기지 않는다 (행만 옮김).
+- 보관된 반려 문서는 더 이상 회수/재기안할 수 없다.
+"""
+from __future__ import annotations
+
+import calendar
+from datetime import datetime
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    ArchivedAttachment,
+    ArchivedDocument,
+    ArchivedDocumentLine,
+    ArchivedDocumentViewer,
+    Attachment,
+    Document,
+    DocumentLine,
+)
+
+ARCHIVABLE_STATUSES = (Document.Status.COMPLETED, Document.Status.REJECTED)
+
+
+def months_ago(months: int, now: datetime | None = None) -> datetime:
+    """
+    now 에서 달력 기준 months 개월 전 (말일은 해당 월 말일로 맞춤)
+    """
+    now = now or timezone.now()
+    total = now.year * 12 + (now.month - 1) - months
+    year, month = divmod(total, 12)
+    month += 1
+    return now.replace(year=year, month=month, day=min(now.day, calendar.monthrange(year, month)[1]))
+
+
+def archivable_documents(before: datetime):
+    return Document.objects.filter(status__in=ARCHIVABLE_STATUSES, updated_at__lt=before).order_by("id")
+
+
+@transaction.atomic
+def archive_batch(doc_ids: list[int], *, before: datetime) -> int:
+    """
+    doc_ids 중 아직 보관 조건을 만족하는 문서를 옮긴다 (행 잠금 후 다시 확인). 옮긴 문서 수를 반환.
+    """
+    docs = list(archivable_documents(before).filter(id__in=doc_ids).select_for_update())
+    if not docs:
+        return 0
+    ids = [d.id for d in docs]
+
+    ArchivedDocument.objects.bulk_create(
+        [
+            ArchivedDocument(
+                id=d.id,
+                title=d.title,
+                content=d.content,
+                created_by_id=d.created_by_id,
+                status=d.status,
+                current_line_order=d.current_line_order,
+                revision=d.revision,
+                created_at=d.created_at,
+                updated_at=d.updated_at,
+            )
+            for d in docs
+        ]
+    )
+
+    lines = [
+        ArchivedDocumentLine(**row)
+        for row in DocumentLine.objects.filter(document_id__in=ids).values(
+            "id", "document_id", "role", "order", "user_id", "decision", "comment", "acted_at"
+        )
+    ]
+    ArchivedDocumentLine.objects.bulk_create(lines, batch_size=1000)
+
+    atts = [
+        ArchivedAttachment(**row)
+        for row in Attachment.objects.filter(document_id__in=ids).values(
+            "id", "document_id", "file", "uploaded_by_id", "created_at"
+        )
+    ]
+    ArchivedAttachment.objects.bulk_create(atts, batch_size=1000)
+
+    # 열람 대상은 원천(작성자/결재 라인/첨부 업로더)에서 다시 계산한다 (services.rebuild_document_viewers 와 같은 기준).
+    viewers = {(d.id, d.created_by_id) for d in docs}
+    viewers.update((line.document_id, line.user_id) for line in lines)
+    viewers.update((a.document_id, a.uploaded_by_id) for a in atts)
+    ArchivedDocumentViewer.objects.bulk_create(
+        [ArchivedDocumentViewer(document_id=d, user_id=u) for d, u in viewers],
+        batch_size=1000,
+    )
+
+    # 라인/첨부/열람 권한은 CASCADE, 중복 제출 키는 SET_NULL
+    Document.objects.filter(id__in=ids).delete()
+    return len(ids)
+
+
+def archive_documents(*, before: datetime, batch_size: int = 500, limit: int | None = None) -> int:
+    """
+    before 이전에 마지막으로 변경된 완료/반려 문서를 batch_size 건씩 옮기고 옮긴 문서 수를 반환한다.
+    """
+    moved = 0
+    last_id = 0
+    while limit is None or moved < limit:
+        size = batch_size if limit is None else min(batch_size, limit - moved)
+        ids = list(archivable_documents(before).filter(id__gt=last_id).values_list("id", flat=True)[:size])
+        if not ids:
+            break
+        last_id = ids[-1]
+        moved += archive_batch(ids, before=before)
+    return moved
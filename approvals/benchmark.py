@@ -0,0 +1,318 @@
+# approvals/benchmark.py
+"""
+결재 흐름 벤치마크 (run_benchmarks 명령)
+
+현재 DB(보통 generate_dataset 으로 만든 데이터)에 대해 selector/화면/내보내기/결재 전이를
+여러 번 실행해 소요 시간과 쿼리 수를 모은다. 결과는 커밋 간 비교할 수 있도록 JSON 으로 남긴다.
+결재 전이는 트랜잭션 안에서 실행한 뒤 롤백하므로 데이터는 바뀌지 않는다.
+"""
+from __future__ import annotations
+
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from contextlib import ExitStack
+from functools import partial
+from typing import Callable
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+from django.db.models import Count, Q
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .exports import mailbox_queryset, write_documents_csv
+from .models import Attachment, Document, DocumentLine
+from .perf import QueryStats
+from .permissions import CHAIR_GROUP
+from .selectors import inbox_pending
+from .services import approve_or_consult, reject, withdraw_document
+
+User = get_user_model()
+
+MAILBOX_VIEWS = ("home", "doc_list", "inbox", "received", "completed", "rejected")
+
+
+class Skip(Exception):
+    """측정 대상 데이터가 없어 시나리오를 건너뛴다."""
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return out.stdout.strip()
+
+
+def _top_user(qs, field: str):
+    row = qs.values(field).annotate(n=Count("id")).order_by("-n", field).first()
+    return User.objects.filter(pk=row[field]).first() if row else None
+
+
+def pick_actors() -> dict:
+    """
+    데이터가 가장 많이 걸린 사용자를 골라 화면별 대표 사용자로 쓴다.
+    - creator: 작성 문서가 가장 많은 사용자
+    - chair: 진행중 문서의 미처리 협의/결재 라인이 가장 많은 위원장
+    - receiver: 완료 문서의 수신 라인이 가장 많은 사용자
+    """
+    return {
+        "creator": _top_user(Document.objects.all(), "created_by"),
+        "chair": _top_user(
+            DocumentLine.objects.filter(
+                user__groups__name=CHAIR_GROUP,
+                document__status=Document.Status.IN_PROGRESS,
+                decision=DocumentLine.Decision.PENDING,
+                role__in=[DocumentLine.Role.CONSULT, DocumentLine.Role.APPROVE],
+            ),
+            "user",
+        ),
+        "receiver": _top_user(
+            DocumentLine.objects.filter(role=DocumentLine.Role.RECEIVE, document__status=Document.Status.COMPLETED),
+            "user",
+        ),
+    }
+
+
+def dataset_counts() -> dict:
+    counts = Document.objects.aggregate(
+        documents=Count("id"),
+        **{s.lower(): Count("id", filter=Q(status=s)) for s in Document.Status.values},
+    )
+    counts["lines"] = DocumentLine.objects.count()
+    counts["attachments"] = Attachment.objects.count()
+    counts["users"] = User.objects.count()
+    return counts
+
+
+def _rolled_back(fn: Callable[[], object]) -> Callable[[], None]:
+    def run():
+        with transaction.atomic():
+            fn()
+            transaction.set_rollback(True)
+
+    return run
+
+
+class BenchmarkRunner:
+    def __init__(self, *, repeat: int = 5, warm_cache: bool = False, only: list[str] | None = None):
+        self.repeat = max(repeat, 1)
+        self.warm_cache = warm_cache
+        self.only = [o for o in (only or []) if o]
+        self.actors = pick_actors()
+        self.clients: dict[str, Client] = {}
+
+    # -----------------------------
+    # 측정
+    # -----------------------------
+    def _selected(self, name: str) -> bool:
+        return not self.only or any(name.startswith(o) for o in self.only)
+
+    def measure(self, fn: Callable[[], object]) -> dict:
+        timings = []
+        queries = 0
+        for _ in range(self.repeat):
+            if not self.warm_cache:
+                cache.clear()
+            stats = QueryStats()
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(stats))
+                start = time.perf_counter()
+                fn()
+                timings.append((time.perf_counter() - start) * 1000)
+            queries = stats.count
+
+        return {
+            "runs": len(timings),
+            "queries": queries,
+            "min_ms": round(min(timings), 3),
+            "median_ms": round(statistics.median(timings), 3),
+            "mean_ms": round(statistics.fmean(timings), 3),
+            "max_ms": round(max(timings), 3),
+        }
+
+    def _client(self, role: str) -> Client:
+        user = self.actors.get(role)
+        if not user:
+            raise Skip(f"{role} 사용자가 없습니다.")
+        if role not in self.clients:
+            client = Client()
+            client.force_login(user)
+            self.clients[role] = client
+        return self.clients[role]
+
+    def _get(self, role: str, name: str, *args) -> Callable[[], None]:
+        client = self._client(role)
+        url = reverse(f"approvals:{name}", args=args)
+
+        def run():
+            res = client.get(url)
+            if res.status_code != 200:
+                raise RuntimeError(f"{url} -> {res.status_code}")
+            if res.streaming:
+                for _ in res.streaming_content:
+                    pass
+
+        return run
+
+    # -----------------------------
+    # 시나리오
+    # -----------------------------
+    def scenarios(self) -> dict[str, Callable[[], Callable[[], None]]]:
+        """
+        이름 -> (측정할 함수를 만드는 함수). 만드는 단계에서 Skip 이면 건너뛴다.
+        """
+        s: dict[str, Callable[[], Callable[[], None]]] = {
+            "selector.inbox_pending": self._inbox_pending,
+        }
+        for name in MAILBOX_VIEWS:
+            role = {"inbox": "chair", "received": "receiver"}.get(name, "creator")
+            s[f"view.{name}"] = partial(self._get, role, name)
+        s.update(
+            {
+                "view.doc_detail": self._doc_detail,
+                "export.docs_csv": self._export_csv,
+                "download.attachments_zip": self._attachments_zip,
+                "transition.approve": self._approve,
+                "transition.reject": self._reject,
+                "transition.withdraw": self._withdraw,
+            }
+        )
+        return s
+
+    def _chair(self):
+        if not self.actors.get("chair"):
+            raise Skip("처리 대기 문서가 있는 위원장이 없습니다.")
+        return self.actors["chair"]
+
+    def _inbox_pending(self):
+        chair = self._chair()
+        return lambda: list(inbox_pending(chair))
+
+    def _doc_detail(self):
+        doc_id = inbox_pending(self._chair()).values_list("id", flat=True).first()
+        if not doc_id:
+            raise Skip("처리 대기 문서가 없습니다.")
+        return self._get("chair", "doc_detail", doc_id)
+
+    def _export_csv(self):
+        creator = self.actors.get("creator")
+        if not creator:
+            raise Skip("작성자가 없습니다.")
+
+        def run():
+            qs, _ = mailbox_queryset(creator, "my")
+            with tempfile.TemporaryFile() as fh:
+                write_documents_csv(fh, qs.select_related("created_by__profile").iterator(chunk_size=500))
+
+        return run
+
+    def _attachments_zip(self):
+        att = (
+            Attachment.objects.filter(document__created_by=self.actors.get("creator"))
+            .values("document_id")
+            .annotate(n=Count("id"))
+            .order_by("-n", "document_id")
+            .first()
+        )
+        if not att:
+            raise Skip("첨부가 있는 문서가 없습니다.")
+        return self._get("creator", "attachments_zip", att["document_id"])
+
+    def _approve(self):
+        chair = self._chair()
+        doc = inbox_pending(chair).first()
+        if not doc:
+            raise Skip("처리 대기 문서가 없습니다.")
+        return _rolled_back(lambda: approve_or_consult(doc=Document.objects.get(pk=doc.pk), actor=chair))
+
+    def _reject(self):
+        chair = self._chair()
+        doc = inbox_pending(chair).first()
+        if not doc:
+            raise Skip("처리 대기 문서가 없습니다.")
+        return _rolled_back(
+            lambda: reject(doc=Document.objects.get(pk=doc.pk), actor=chair, comment="benchmark")
+        )
+
+    def _withdraw(self):
+        creator = self.actors.get("creator")
+        doc = Document.objects.filter(created_by=creator, status=Document.Status.IN_PROGRESS).order_by("-id").first()
+        if not doc:
+            raise Skip("회수할 진행중 문서가 없습니다.")
+        return _rolled_back(lambda: withdraw_document(doc=Document.objects.get(pk=doc.pk), actor=creator))
+
+    # -----------------------------
+    # 실행
+    # -----------------------------
+    def run(self) -> dict:
+        results: dict[str, dict] = {}
+        # 테스트 클라이언트 호스트 허용, 알림 메일은 메모리로
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+        ):
+            for name, factory in self.scenarios().items():
+                if not self._selected(name):
+                    continue
+                try:
+                    fn = factory()
+                except Skip as exc:
+                    results[name] = {"skipped": str(exc)}
+                    continue
+                results[name] = self.measure(fn)
+
+        return {
+            "meta": {
+                "created_at": timezone.now().isoformat(),
+                "git": git_revision(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "repeat": self.repeat,
+                "warm_cache": self.warm_cache,
+                "actors": {k: (u.username if u else None) for k, u in self.actors.items()},
+                "dataset": dataset_counts(),
+            },
+            "results": results,
+        }
+
+
+def compare(current: dict, baseline: dict) -> list[dict]:
+    """
+    두 결과 JSON 의 시나리오별 median/쿼리 수 차이
+    """
+    rows = []
+    base = baseline.get("results", {})
+    for name, cur in current.get("results", {}).items():
+        old = base.get(name) or {}
+        if "median_ms" not in cur or "median_ms" not in old:
+            continue
+        rows.append(
+            {
+                "name": name,
+                "median_ms": cur["median_ms"],
+                "baseline_ms": old["median_ms"],
+                "change_pct": round((cur["median_ms"] - old["median_ms"]) / old["median_ms"] * 100, 1)
+                if old["median_ms"]
+                else None,
+                "queries": cur["queries"],
+                "baseline_queries": old["queries"],
+            }
+        )
+    return rows
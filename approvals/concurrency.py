@@ -0,0 +1,233 @@
+# approvals/concurrency.py
+"""
+SQLite 동시성 벤치마크 (bench_sqlite_concurrency 명령)
+
+gunicorn 워커처럼 여러 프로세스가 같은 SQLite 파일에 동시에 읽기/쓰기를 할 때의 처리량을
+두 가지 설정으로 비교한다.
+- default: Django 기본값 (rollback journal, DEFERRED 트랜잭션, 잠금 대기 5초)
+- production: settings.SQLITE_OPTIONS (WAL, synchronous=NORMAL, mmap/cache, BEGIN IMMEDIATE, busy timeout)
+
+임시 디렉터리에 DB 를 만들고(migrate + generate_dataset) 설정별로 복사해서 쓰므로 현재 DB 는 건드리지 않는다.
+작업자 프로세스는 spawn 으로 띄운다. 이 모듈은 Django 설정 전에 import 되므로 모델은 함수 안에서 import 한다.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+PREFIX = "conc"
+
+
+def _setup(db_path: str, options: dict) -> None:
+    """
+    작업자 프로세스의 Django 를 db_path / options 로 초기화한다 (연결이 만들어지기 전에 호출).
+    """
+    from django.conf import settings
+
+    db = settings.DATABASES["default"]
+    db.update({"ENGINE": "django.db.backends.sqlite3", "NAME": db_path, "OPTIONS": dict(options)})
+    settings.DEBUG = False  # 쿼리 기록으로 메모리가 늘지 않게
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+    settings.METRICS_DIR = ""
+
+    import django
+
+    django.setup()
+
+
+def prepare_database(db_path: str, *, users: int, chairs: int, documents: int, seed: int) -> dict:
+    """
+    (작업자 프로세스에서 실행) 빈 DB 에 스키마와 데이터를 만든다.
+    """
+    _setup(db_path, {})
+
+    from django.core.management import call_command
+
+    from .dataset import generate_dataset
+    from .models import Document
+
+    call_command("migrate", verbosity=0, interactive=False)
+    summary = generate_dataset(
+        users=users,
+        chairs=chairs,
+        documents=documents,
+        prefix=PREFIX,
+        seed=seed,
+        attachments=0,
+        status_mix={Document.Status.IN_PROGRESS: 100},
+    )
+    return summary.as_dict()
+
+
+def run_worker(db_path: str, options: dict, seconds: float, write_ratio: float, seed: int, start_at: float) -> dict:
+    """
+    (작업자 프로세스에서 실행) start_at 부터 seconds 동안 읽기/쓰기를 섞어 반복한다.
+    - 읽기: 위원장 결재함(inbox_pending) 목록 + 문서 한 건과 결재 라인
+    - 쓰기: 문서 상신(create_document_with_lines_and_files) 또는 결재(approve_or_consult)를 번갈아
+    """
+    _setup(db_path, options)
+
+    from django.contrib.auth import get_user_model
+    from django.db import OperationalError, close_old_connections
+
+    from .models import Document, DocumentLine
+    from .permissions import CHAIR_GROUP
+    from .selectors import inbox_pending
+    from .services import approve_or_consult, create_document_with_lines_and_files
+
+    User = get_user_model()
+    rng = random.Random(seed)
+    members = User.objects.filter(username__startswith=PREFIX)
+    chairs = list(members.filter(groups__name=CHAIR_GROUP))
+    creators = list(members.exclude(groups__name=CHAIR_GROUP)) or chairs
+
+    def read():
+        chair = rng.choice(chairs)
+        docs = list(inbox_pending(chair)[:50])
+        if docs:
+            doc = rng.choice(docs)
+            list(DocumentLine.objects.filter(document_id=doc.id).select_related("user"))
+
+    def write(n: int):
+        if n % 2:
+            chair = rng.choice(chairs)
+            doc = inbox_pending(chair).first()
+            if doc is not None:
+                try:
+                    approve_or_consult(doc=Document.objects.get(pk=doc.pk), actor=chair)
+                except (PermissionError, ValueError):
+                    pass  # 다른 작업자가 먼저 처리한 문서
+                return
+        create_document_with_lines_and_files(
+            creator=rng.choice(creators),
+            title=f"동시성 {seed}-{n}",
+            content="benchmark",
+            consultants=[],
+            approvers=rng.sample(chairs, k=min(2, len(chairs))),
+            receivers=[],
+            files=[],
+        )
+
+    stats = {"reads": 0, "writes": 0, "errors": 0, "read_ms": [], "write_ms": []}
+    delay = start_at - time.time()
+    if delay > 0:
+        time.sleep(delay)
+
+    end = time.monotonic() + seconds
+    n = 0
+    while time.monotonic() < end:
+        n += 1
+        is_write = rng.random() < write_ratio
+        start = time.perf_counter()
+        try:
+            write(n) if is_write else read()
+        except OperationalError:
+            # database is locked: 잠금 대기 시간을 넘겼거나 DEFERRED 트랜잭션의 쓰기 승격 실패
+            stats["errors"] += 1
+            close_old_connections()
+            continue
+        elapsed = (time.perf_counter() - start) * 1000
+        kind = "write" if is_write else "read"
+        stats[f"{kind}s"] += 1
+        stats[f"{kind}_ms"].append(elapsed)
+    return stats
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * pct))], 2)
+
+
+def summarize(workers: list[dict], seconds: float) -> dict:
+    reads = sum(w["reads"] for w in workers)
+    writes = sum(w["writes"] for w in workers)
+    read_ms = [ms for w in workers for ms in w["read_ms"]]
+    write_ms = [ms for w in workers for ms in w["write_ms"]]
+    return {
+        "reads": reads,
+        "writes": writes,
+        "errors": sum(w["errors"] for w in workers),
+        "ops_per_sec": round((reads + writes) / seconds, 1),
+        "writes_per_sec": round(writes / seconds, 1),
+        "read_p50_ms": round(statistics.median(read_ms), 2) if read_ms else None,
+        "read_p95_ms": _percentile(read_ms, 0.95),
+        "write_p50_ms": round(statistics.median(write_ms), 2) if write_ms else None,
+        "write_p95_ms": _percentile(write_ms, 0.95),
+    }
+
+
+def _set_journal_mode(path: Path, mode: str) -> None:
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute(f"PRAGMA journal_mode={mode}")
+    finally:
+        conn.close()
+
+
+def run_concurrency_benchmark(
+    *,
+    profiles: dict[str, dict],
+    workers: int = 4,
+    seconds: float = 10.0,
+    write_ratio: float = 0.2,
+    users: int = 40,
+    chairs: int = 8,
+    documents: int = 500,
+    seed: int = 1,
+    workdir: str | None = None,
+) -> dict:
+    """
+    profiles: 이름 -> sqlite OPTIONS. 설정마다 같은 초기 DB 복사본에 workers 개 프로세스를 동시에 돌린다.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    tmp = Path(workdir or tempfile.mkdtemp(prefix="eapproval-sqlite-"))
+    try:
+        seed_db = tmp / "seed.sqlite3"
+        with ctx.Pool(1) as pool:
+            dataset = pool.apply(
+                prepare_database,
+                (str(seed_db),),
+                {"users": users, "chairs": chairs, "documents": documents, "seed": seed},
+            )
+
+        results = {}
+        for name, options in profiles.items():
+            db_path = tmp / f"{name}.sqlite3"
+            shutil.copyfile(seed_db, db_path)
+            # WAL 은 파일에 남는 설정이라 기본 설정 비교용 복사본은 rollback journal 로 되돌린다.
+            _set_journal_mode(db_path, "DELETE")
+
+            with ctx.Pool(workers, maxtasksperchild=1) as pool:
+                start_at = time.time() + 3  # 모든 작업자의 Django 초기화를 기다렸다가 동시에 시작
+                args = [
+                    (str(db_path), options, seconds, write_ratio, seed * 1000 + i, start_at) for i in range(workers)
+                ]
+                per_worker = pool.starmap(run_worker, args)
+
+            results[name] = {"options": options, **summarize(per_worker, seconds)}
+            for suffix in ("", "-wal", "-shm", "-journal"):
+                Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+    finally:
+        if workdir is None:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    return {
+        "meta": {
+            "workers": workers,
+            "seconds": seconds,
+            "write_ratio": write_ratio,
+            "cpu_count": os.cpu_count(),
+            "sqlite": sqlite3.sqlite_version,
+            "dataset": dataset,
+        },
+        "results": results,
+    }
@@ -0,0 +1,336 @@
+# approvals/dataset.py
+"""
+성능 측정용 합성 데이터 (generate_dataset 명령, 성능 테스트에서 사용)
+
+- 회원: {prefix}{번호} 형식, 앞쪽 chairs 명은 CHAIR 그룹
+- 문서: 협의/결재/수신 라인 구성과 상태(진행중/완료/반려/회수)를 비율대로 섞어 만든다.
+- 첨부: 작은 임의 바이트 파일을 기본 storage 에 실제로 저장한다.
+행 단위 save()/signal 을 거치지 않고 배치 bulk_create 로 저장한다.
+"""
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import Profile
+from accounts.utils import sync_profile_roles
+
+from .models import Attachment, Document, DocumentLine, DocumentViewer
+from .permissions import CHAIR_GROUP, invalidate_chair_cache
+
+User = get_user_model()
+
+# 상태별 비율 (합계가 100 일 필요는 없다)
+DEFAULT_STATUS_MIX = {
+    Document.Status.IN_PROGRESS: 35,
+    Document.Status.COMPLETED: 45,
+    Document.Status.REJECTED: 12,
+    Document.Status.DRAFT: 8,
+}
+
+_FAMILY = "김이박최정강조윤장임한오서신권황안송류홍"
+_GIVEN = "민서준예도하지우현수연은채유진영호성윤아"
+_WORDS = ("회의", "예산", "행사", "교육", "구매", "보고", "계획", "정산", "요청", "안내", "협조", "결과")
+
+
+@dataclass
+class DatasetSummary:
+    users: int = 0
+    chairs: int = 0
+    documents: int = 0
+    lines: int = 0
+    attachments: int = 0
+    statuses: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return {
+            "users": self.users,
+            "chairs": self.chairs,
+            "documents": self.documents,
+            "lines": self.lines,
+            "attachments": self.attachments,
+            "statuses": dict(self.statuses),
+        }
+
+
+def parse_status_mix(value: str) -> dict[str, int]:
+    """
+    "IN_PROGRESS=35,COMPLETED=45" 형식을 dict 로 바꾼다. 잘못된 값이면 ValueError.
+    """
+    mix: dict[str, int] = {}
+    for part in (value or "").split(","):
+        if not part.strip():
+            continue
+        status, _, weight = part.partition("=")
+        status = status.strip().upper()
+        if status not in Document.Status.values or status == Document.Status.SUBMITTED:
+            raise ValueError(f"지원하지 않는 상태입니다: {status}")
+        mix[status] = int(weight)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("상태 비율이 비어 있습니다.")
+    return mix
+
+
+def _korean_name(rng: random.Random) -> str:
+    return rng.choice(_FAMILY) + rng.choice(_GIVEN) + rng.choice(_GIVEN)
+
+
+def ensure_users(*, count: int, chairs: int, prefix: str, password: str = "") -> tuple[list[int], list[int]]:
+    """
+    {prefix}00001 ~ 형식 회원을 count 명까지 맞추고 앞쪽 chairs 명을 CHAIR 그룹에 넣는다.
+    이미 있는 회원은 그대로 두며 (전체 id 목록, 위원장 id 목록)을 반환한다.
+    """
+    rng = random.Random(prefix)
+    usernames = [f"{prefix}{i:05d}" for i in range(1, count + 1)]
+    existing = set(User.objects.filter(username__in=usernames).values_list("username", flat=True))
+    # 해시는 한 번만 계산해 모든 회원에 재사용한다.
+    hashed = make_password(password or None)
+
+    with transaction.atomic():
+        new_users = [User(username=u, password=hashed) for u in usernames if u not in existing]
+        User.objects.bulk_create(new_users, batch_size=1000)
+
+        ids = dict(User.objects.filter(username__in=usernames).values_list("username", "id"))
+        profiles = []
+        for u in new_users:
+            name = _korean_name(rng)
+            profiles.append(Profile(user_id=ids[u.username], full_name=name, display_name=name))
+        Profile.objects.bulk_create(profiles, batch_size=1000)
+
+        user_ids = [ids[u] for u in usernames]
+        chair_ids = user_ids[: max(min(chairs, count), 0)]
+        group, _ = Group.objects.get_or_create(name=CHAIR_GROUP)
+        User.groups.through.objects.bulk_create(
+            [User.groups.through(user_id=uid, group_id=group.id) for uid in chair_ids],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+        sync_profile_roles(user_ids)
+    invalidate_chair_cache()
+    return user_ids, chair_ids
+
+
+def _plan_lines(rng: random.Random, status: str, chair_ids: list[int], creator_id: int, acted_at):
+    """
+    상태에 맞는 결재 라인 [(role, user_id, decision, acted_at)] 과 current_line_order 를 만든다.
+    services 의 진행 규칙(협의 동시 -> 결재 순차 -> 수신)과 같은 모양이 되도록 결정을 채운다.
+    """
+    candidates = [uid for uid in chair_ids if uid != creator_id] or chair_ids
+    n_consult = rng.choice((0, 0, 1, 1, 2, 3))
+    n_approve = rng.choice((1, 1, 2, 2, 3))
+    n_receive = rng.choice((0, 1, 2, 3, 5))
+    picked = rng.sample(candidates, min(len(candidates), n_consult + n_approve + n_receive))
+
+    consults = picked[:n_consult]
+    approves = picked[n_consult : n_consult + n_approve]
+    receives = picked[n_consult + n_approve :]
+    active = [(DocumentLine.Role.CONSULT, u) for u in consults] + [(DocumentLine.Role.APPROVE, u) for u in approves]
+
+    P, A, R, READ = (
+        DocumentLine.Decision.PENDING,
+        DocumentLine.Decision.APPROVED,
+        DocumentLine.Decision.REJECTED,
+        DocumentLine.Decision.READ,
+    )
+
+    # 처리된 활성 라인 수
+    if status == Document.Status.COMPLETED:
+        done = len(active)
+    elif status in (Document.Status.IN_PROGRESS, Document.Status.REJECTED):
+        done = rng.randrange(len(active)) if active else 0
+    else:  # 회수된 임시 문서는 모든 결정이 초기화되어 있다.
+        done = 0
+
+    lines = []
+    for i, (role, uid) in enumerate(active):
+        if i < done:
+            lines.append((role, uid, A, acted_at))
+        elif i == done and status == Document.Status.REJECTED:
+            lines.append((role, uid, R, acted_at))
+        else:
+            lines.append((role, uid, P, None))
+
+    if status == Document.Status.IN_PROGRESS and done < n_consult:
+        # 협의는 동시 진행이므로 뒤쪽 협의 일부만 먼저 처리된 상태도 만든다.
+        for i in range(done + 1, n_consult):
+            if rng.random() < 0.3:
+                role, uid, _, _ = lines[i]
+                lines[i] = (role, uid, A, acted_at)
+
+    for uid in receives:
+        read = status == Document.Status.COMPLETED and rng.random() < 0.6
+        lines.append((DocumentLine.Role.RECEIVE, uid, READ if read else P, acted_at if read else None))
+
+    current = 1
+    if status == Document.Status.IN_PROGRESS:
+        pending = [i for i, ln in enumerate(lines[: len(active)]) if ln[2] == P]
+        current = pending[0] + 1
+    elif status == Document.Status.COMPLETED and active:
+        current = len(active)
+    return lines, current
+
+
+def generate_documents(
+    *,
+    count: int,
+    user_ids: list[int],
+    chair_ids: list[int],
+    prefix: str,
+    status_mix: dict[str, int] | None = None,
+    attachments: float = 1.0,
+    attachment_bytes: int = 4096,
+    days: int = 365,
+    seed: int | None = None,
+    batch_size: int = 500,
+) -> DatasetSummary:
+    """
+    문서 count 건을 결재 라인/첨부/열람 권한과 함께 만든다.
+    attachments 는 문서당 평균 첨부 수 (0 이면 첨부 없음).
+    """
+    if not chair_ids:
+        raise ValueError("위원장(CHAIR)이 한 명 이상 필요합니다.")
+
+    rng = random.Random(seed)
+    mix = status_mix or DEFAULT_STATUS_MIX
+    statuses, weights = list(mix.keys()), list(mix.values())
+    payload = bytes(rng.getrandbits(8) for _ in range(max(attachment_bytes, 0)))
+    now = timezone.now()
+
+    summary = DatasetSummary()
+    remaining = count
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        _generate_batch(
+            rng=rng,
+            size=size,
+            user_ids=user_ids,
+            chair_ids=chair_ids,
+            prefix=prefix,
+            statuses=rng.choices(statuses, weights, k=size),
+            attachments=attachments,
+            payload=payload,
+            now=now,
+            days=days,
+            summary=summary,
+        )
+        remaining -= size
+    return summary
+
+
+@transaction.atomic
+def _generate_batch(*, rng, size, user_ids, chair_ids, prefix, statuses, attachments, payload, now, days, summary):
+    created = [now - timedelta(seconds=rng.randrange(max(days, 1) * 86400)) for _ in range(size)]
+    created.sort()
+
+    docs = []
+    plans = []
+    for status, created_at in zip(statuses, created):
+        creator_id = rng.choice(user_ids)
+        acted_at = created_at + timedelta(hours=rng.randrange(1, 72))
+        lines, current = _plan_lines(rng, status, chair_ids, creator_id, acted_at)
+        docs.append(
+            Document(
+                title=f"[{prefix}] {rng.choice(_WORDS)} {rng.choice(_WORDS)} 건 #{summary.documents + len(docs) + 1}",
+                content="\n".join(rng.choice(_WORDS) * rng.randint(1, 20) for _ in range(rng.randint(1, 8))),
+                created_by_id=creator_id,
+                status=status,
+                current_line_order=current,
+                revision=1,
+            )
+        )
+        plans.append(lines)
+    # bulk_create 후 pk 가 채워지는 백엔드 전제 (generate_dataset 명령에서 확인)
+    Document.objects.bulk_create(docs)
+
+    # auto_now/auto_now_add 는 bulk_create 시 현재 시각으로 채워지므로 분산된 시각으로 바꾼다.
+    for doc, created_at in zip(docs, created):
+        doc.created_at = created_at
+        doc.updated_at = created_at + timedelta(days=rng.randint(0, 7))
+    Document.objects.bulk_update(docs, ["created_at", "updated_at"], batch_size=1000)
+
+    lines: list[DocumentLine] = []
+    atts: list[Attachment] = []
+    viewers: set[tuple[int, int]] = set()
+    for doc, plan in zip(docs, plans):
+        viewers.add((doc.id, doc.created_by_id))
+        for order, (role, uid, decision, acted_at) in enumerate(plan, start=1):
+            lines.append(
+                DocumentLine(
+                    document_id=doc.id,
+                    role=role,
+                    order=order,
+                    user_id=uid,
+                    decision=decision,
+                    acted_at=acted_at,
+                )
+            )
+            viewers.add((doc.id, uid))
+
+        n_att = _poisson(rng, attachments)
+        for k in range(n_att):
+            name = default_storage.save(f"attachments/{prefix}/doc{doc.id}_{k + 1}.bin", ContentFile(payload))
+            atts.append(Attachment(document_id=doc.id, file=name, uploaded_by_id=doc.created_by_id))
+
+        summary.statuses[doc.status] = summary.statuses.get(doc.status, 0) + 1
+
+    DocumentLine.objects.bulk_create(lines, batch_size=1000)
+    Attachment.objects.bulk_create(atts, batch_size=1000)
+    DocumentViewer.objects.bulk_create(
+        [DocumentViewer(document_id=d, user_id=u) for d, u in viewers],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+    summary.documents += len(docs)
+    summary.lines += len(lines)
+    summary.attachments += len(atts)
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    if mean <= 0:
+        return 0
+    # 작은 평균값용 (Knuth)
+    limit, k, p = math.exp(-mean), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+def generate_dataset(
+    *,
+    users: int,
+    chairs: int,
+    documents: int,
+    prefix: str = "bench",
+    password: str = "",
+    seed: int | None = None,
+    **options,
+) -> DatasetSummary:
+    """
+    회원 + 문서를 한 번에 만든다. options 는 generate_documents 로 넘긴다.
+    """
+    user_ids, chair_ids = ensure_users(count=users, chairs=chairs, prefix=prefix, password=password)
+    summary = generate_documents(
+        count=documents,
+        user_ids=user_ids,
+        chair_ids=chair_ids,
+        prefix=prefix,
+        seed=seed,
+        **options,
+    )
+    summary.users = len(user_ids)
+    summary.chairs = len(chair_ids)
+    return summary
@@ -0,0 +1,205 @@
+# approvals/exports.py
+from __future__ import annotations
+
+import csv
+import heapq
+import io
+import os
+import re
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Iterable
+
+from django.utils import timezone
+
+from accounts.utils import display_name
+
+from .models import ArchivedDocument, Attachment, Document
+from .selectors import archived_docs, completed_docs, inbox_pending, my_documents, received_docs, rejected_docs
+
+
+# -----------------------------
+# Shared helpers
+# -----------------------------
+_ILLEGAL_FS_CHARS = r'\\/:*?"<>|'
+_ILLEGAL_FS_RE = re.compile(f"[{re.escape(_ILLEGAL_FS_CHARS)}]")
+
+# 문서함 kind -> (selector, 파일명 접두어)
+MAILBOX_EXPORTS = {
+    "my": (my_documents, "my_documents"),
+    "inbox": (inbox_pending, "inbox"),
+    "received": (received_docs, "received"),
+    "completed": (completed_docs, "completed"),
+    "rejected": (rejected_docs, "rejected"),
+}
+
+# 화면(views._paginate_with_archived)처럼 보관 문서도 함께 내보내는 문서함 -> 보관 문서 상태
+ARCHIVED_MAILBOXES = {
+    "completed": Document.Status.COMPLETED,
+    "rejected": Document.Status.REJECTED,
+}
+
+
+def safe_component(value: object, default: str = "untitled") -> str:
+    """
+    Make a string safe to be used in filenames / zip arcnames.
+    """
+    s = str(value or "").strip()
+    s = s.replace("\n", " ").replace("\r", " ").replace("\t", " ")
+    s = _ILLEGAL_FS_RE.sub(" ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s if s else default
+
+
+def unique_arcname(used: set[str], arcname: str) -> str:
+    """
+    Ensure arcname is unique within a zip by appending " (2)", " (3)", ...
+    """
+    if arcname not in used:
+        used.add(arcname)
+        return arcname
+
+    p = Path(arcname)
+    stem, suffix = p.stem, p.suffix
+    parent = str(p.parent)
+    if parent == ".":
+        parent = ""
+
+    i = 2
+    while True:
+        candidate_name = f"{stem} ({i}){suffix}"
+        candidate = f"{parent}/{candidate_name}" if parent else candidate_name
+        if candidate not in used:
+            used.add(candidate)
+            return candidate
+        i += 1
+
+
+def local_dt(dt) -> str:
+    if not dt:
+        return ""
+    try:
+        return timezone.localtime(dt).strftime("%Y-%m-%d %H:%M:%S")
+    except Exception:
+        return str(dt)
+
+
+def mailbox_queryset(user, kind: str):
+    """
+    문서함 kind 에 해당하는 QuerySet과 파일명 접두어를 반환한다.
+    알 수 없는 kind 이면 ValueError.
+    """
+    kind = (kind or "").strip().lower()
+    if kind not in MAILBOX_EXPORTS:
+        raise ValueError(f"unknown mailbox kind: {kind}")
+
+    selector, title = MAILBOX_EXPORTS[kind]
+    return selector(user), title
+
+
+def mailbox_documents(user, kind: str) -> tuple[Iterable[Document | ArchivedDocument], str]:
+    """
+    CSV 내보내기용 문서 iterable 과 파일명 접두어.
+    완료함/반려함은 화면과 같이 운영 문서와 보관 문서를 -id 순으로 합친다 (두 쿼리를 나란히 스트리밍).
+    """
+    qs, title = mailbox_queryset(user, kind)
+    docs = qs.select_related("created_by__profile").iterator(chunk_size=500)
+    status = ARCHIVED_MAILBOXES.get(kind.strip().lower())
+    if status is not None:
+        archived = archived_docs(user, status).select_related("created_by__profile").iterator(chunk_size=500)
+        docs = heapq.merge(docs, archived, key=lambda d: -d.id)
+    return docs, title
+
+
+# -----------------------------
+# Writers (파일 객체에 직접 기록)
+# -----------------------------
+def write_documents_csv(fh: BinaryIO, docs: Iterable[Document | ArchivedDocument]) -> int:
+    """
+    문서함 CSV(utf-8-sig)를 fh 에 기록하고 기록한 문서 수를 반환한다.
+    """
+    text = io.TextIOWrapper(fh, encoding="utf-8-sig", newline="", write_through=True)
+    w = csv.writer(text)
+    w.writerow(
+        ["id", "status", "title", "content", "created_by", "current_line_order", "created_at", "updated_at"]
+    )
+
+    count = 0
+    for d in docs:
+        w.writerow(
+            [
+                d.id,
+                d.get_status_display(),
+                d.title,
+                d.content,
+                display_name(d.created_by),
+                d.current_line_order,
+                timezone.localtime(d.created_at).strftime("%Y-%m-%d %H:%M") if d.created_at else "",
+                timezone.localtime(d.updated_at).strftime("%Y-%m-%d %H:%M") if d.updated_at else "",
+            ]
+        )
+        count += 1
+
+    text.flush()
+    text.detach()
+    return count
+
+
+def _write_file_to_zip(zf: zipfile.ZipFile, used: set[str], folder: str, att: Attachment) -> bool:
+    f = getattr(att, "file", None)
+    if not f:
+        return False
+
+    try:
+        original_name = os.path.basename(getattr(f, "name", "") or "")
+        safe_name = safe_component(original_name or f"attachment_{att.id}")
+        arcname = unique_arcname(used, f"{folder}/{safe_name}")
+
+        f.open("rb")
+        try:
+            with zf.open(arcname, "w") as dst:
+                for chunk in f.chunks():
+                    dst.write(chunk)
+        finally:
+            try:
+                f.close()
+            except Exception:
+                pass
+    except Exception:
+        return False
+
+    return True
+
+
+def write_documents_attachments_zip(fh: BinaryIO, docs: Iterable[Document | ArchivedDocument]) -> bool:
+    """
+    문서별 폴더(doc_<id>_<제목>)로 첨부파일을 묶어 fh 에 ZIP 으로 기록한다.
+    하나라도 기록했으면 True.
+    """
+    used_names: set[str] = set()
+    wrote_any = False
+
+    with zipfile.ZipFile(fh, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for doc in docs:
+            folder = safe_component(f"doc_{doc.id}_{doc.title}")
+            for att in doc.attachments.all():
+                wrote_any = _write_file_to_zip(zf, used_names, folder, att) or wrote_any
+
+    return wrote_any
+
+
+def write_attachments_zip(fh: BinaryIO, attachments: Iterable[Attachment]) -> bool:
+    """
+    첨부파일 목록을 문서별 폴더로 묶어 fh 에 ZIP 으로 기록한다.
+    하나라도 기록했으면 True.
+    """
+    used_names: set[str] = set()
+    wrote_any = False
+
+    with zipfile.ZipFile(fh, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for att in attachments:
+            doc = getattr(att, "document", None)
+            folder = safe_component(f"doc_{doc.id}_{doc.title}" if doc else "no_document")
+            wrote_any = _write_file_to_zip(zf, used_names, folder, att) or wrote_any
+
+    return wrote_any
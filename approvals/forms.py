@@ -1,12 +1,14 @@
 # approvals/forms.py
-import uuid
 
 from django import forms
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 
+from accounts.utils import display_name, display_names
+
+from .idempotency import new_token
 from .models import Document
-from .permissions import CHAIR_GROUP  # 프로젝트 표준: "CHAIR"
+from .permissions import chair_user_ids
 
 User = get_user_model()
 
@@ -16,31 +18,27 @@ MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 
 def user_label(u) -> str:
     """
-    표시 이름 우선순위:
-    - profile.display_name()
-    - profile.full_name
-    - username
+    표시 이름 우선순위: profile.display_name -> username
     """
-    profile = getattr(u, "profile", None)
-    if profile and hasattr(profile, "display_name"):
-        try:
-            name = profile.display_name()
-            if name:
-                return name
-        except Exception:
-            pass
+    return display_name(u, default=u.username)
 
-    if profile and getattr(profile, "full_name", ""):
-        name = (profile.full_name or "").strip()
-        if name:
-            return name
 
-    return u.username
+def chair_users_queryset():
+    """'위원장' 그룹(CHAIR_GROUP)에 속한 사용자만 반환 (멤버십은 캐시된 id 집합 사용)"""
+    return User.objects.filter(is_active=True, id__in=chair_user_ids())
 
 
-def chair_users_queryset():
-    """'위원장' 그룹(CHAIR_GROUP)에 속한 사용자만 반환"""
-    return User.objects.filter(is_active=True, groups__name=CHAIR_GROUP).distinct()
+class UserPickerWidget(forms.CheckboxSelectMultiple):
+    """
+    선택된 사용자만 체크박스로 렌더링한다.
+    나머지 후보는 화면에서 자동완성 API(approvals:user_autocomplete)로 필요할 때 불러온다.
+    """
+
+    def optgroups(self, name, value, attrs=None):
+        ids = [int(v) for v in value if str(v).isdigit()]
+        names = display_names(ids)
+        self.choices = [(i, names[i]) for i in dict.fromkeys(ids) if i in names]
+        return super().optgroups(name, value, attrs)
 
 
 class MultipleFileInput(forms.ClearableFileInput):
@@ -81,7 +79,7 @@ class DocumentForm(forms.ModelForm):
     consultants = forms.ModelMultipleChoiceField(
         queryset=User.objects.none(),
         required=False,
-        widget=forms.CheckboxSelectMultiple,
+        widget=UserPickerWidget,
         label="협의자(여러 명 가능)",
         help_text="여러 명을 선택하면 동시에 협의가 진행됩니다.",
     )
@@ -89,7 +87,7 @@ class DocumentForm(forms.ModelForm):
     approvers = forms.ModelMultipleChoiceField(
         queryset=User.objects.none(),
         required=True,
-        widget=forms.CheckboxSelectMultiple,
+        widget=UserPickerWidget,
         label="결재자(순서대로 진행)",
         help_text="체크 후 오른쪽 ↕️ 핸들을 드래그하면 결재 순서대로 저장됩니다.",
     )
@@ -97,7 +95,7 @@ class DocumentForm(forms.ModelForm):
     receivers = forms.ModelMultipleChoiceField(
         queryset=User.objects.none(),
         required=False,
-        widget=forms.CheckboxSelectMultiple,
+        widget=UserPickerWidget,
         label="수신/열람자(여러 명 가능)",
         help_text="문서 완료 후 열람 대상자입니다.",
     )
@@ -117,7 +115,7 @@ class DocumentForm(forms.ModelForm):
         super().__init__(*args, **kwargs)
 
         if not self.initial.get("submit_token"):
-            self.initial["submit_token"] = uuid.uuid4().hex
+            self.initial["submit_token"] = new_token()
 
         chair_qs = chair_users_queryset()
         for fname in ("consultants", "approvers", "receivers"):
@@ -151,7 +149,7 @@ class DocumentForm(forms.ModelForm):
         """
         cleaned = super().clean()
 
-        allowed_ids = set(chair_users_queryset().values_list("id", flat=True))
+        allowed_ids = chair_user_ids()
 
         for fname in ("consultants", "approvers", "receivers"):
             selected = cleaned.get(fname)
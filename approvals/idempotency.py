@@ -0,0 +1,69 @@
+# approvals/idempotency.py
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Document, IdempotencyKey
+
+TOKEN_FIELD = "submit_token"
+
+
+def new_token() -> str:
+    return uuid.uuid4().hex
+
+
+def token_from(request) -> str:
+    return (request.POST.get(TOKEN_FIELD) or "").strip()[:64]
+
+
+def already_done(*, user, token: str, action: str) -> bool:
+    """
+    이미 같은 동작으로 처리된 토큰인지 (상태 검사로 막히기 전에 중복 요청을 가려낼 때 사용)
+    """
+    return bool(token) and IdempotencyKey.objects.filter(user=user, token=token, action=action).exists()
+
+
+def run_once(*, user, token: str, action: str, fn: Callable[[], Document | None]) -> tuple[int | None, bool]:
+    """
+    (token, action) 기준으로 fn 을 한 번만 실행한다.
+    반환: (결과 문서 id, 중복 요청 여부)
+
+    - 키 INSERT 와 fn 이 같은 트랜잭션이라 fn 이 예외를 내면 키도 롤백된다(다시 시도 가능).
+    - 동시에 들어온 같은 토큰은 유일 제약에서 막혀 먼저 커밋된 결과를 돌려받는다.
+    - 상세 화면의 승인/반려/회수 폼은 토큰 하나를 함께 쓰므로, 같은 토큰이라도 다른 동작은 중복으로 보지 않는다.
+    - token 이 비어 있으면(구 화면 등) 중복 검사 없이 실행한다.
+    """
+    if not token:
+        doc = fn()
+        return (doc.id if doc else None), False
+
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                key = IdempotencyKey.objects.create(user=user, token=token, action=action)
+        except IntegrityError:
+            done = (
+                IdempotencyKey.objects.filter(user=user, token=token, action=action)
+                .values_list("document_id", flat=True)
+                .first()
+            )
+            return done, True
+
+        doc = fn()
+        if doc is not None:
+            key.document = doc
+            key.save(update_fields=["document"])
+        return (doc.id if doc else None), False
+
+
+def cleanup_expired_keys(now=None) -> int:
+    now = now or timezone.now()
+    ttl = timedelta(hours=getattr(settings, "IDEMPOTENCY_KEY_TTL_HOURS", 24))
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=now - ttl).delete()
+    return deleted
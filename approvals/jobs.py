@@ -0,0 +1,205 @@
+# approvals/jobs.py
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+from .exports import (
+    mailbox_documents,
+    write_attachments_zip,
+    write_documents_attachments_zip,
+    write_documents_csv,
+)
+from .models import ArchivedDocument, Attachment, Document, ExportJob
+from .replica import read_replica
+
+logger = logging.getLogger(__name__)
+
+
+def _ttl() -> timedelta:
+    return timedelta(hours=getattr(settings, "EXPORT_JOB_TTL_HOURS", 24))
+
+
+def _stale_after() -> timedelta:
+    return timedelta(minutes=getattr(settings, "EXPORT_JOB_STALE_MINUTES", 30))
+
+
+def enqueue_export_job(*, user, kind: str, params: dict | None = None) -> ExportJob:
+    """
+    내보내기 작업을 PENDING 상태로 적재한다. 실제 처리는 run_export_jobs 워커가 담당.
+    """
+    return ExportJob.objects.create(kind=kind, requested_by=user, params=params or {})
+
+
+def can_access_job(user, job: ExportJob) -> bool:
+    return user.is_authenticated and (user.is_superuser or job.requested_by_id == user.id)
+
+
+def claim_next_job() -> ExportJob | None:
+    """
+    가장 오래된 PENDING 작업 1건을 RUNNING 으로 선점한다.
+    조건부 UPDATE 로 선점하므로 워커를 여러 개 띄워도 같은 작업을 중복 처리하지 않는다.
+    """
+    while True:
+        job = (
+            ExportJob.objects.filter(status=ExportJob.Status.PENDING)
+            .order_by("created_at", "id")
+            .first()
+        )
+        if not job:
+            return None
+
+        claimed = ExportJob.objects.filter(id=job.id, status=ExportJob.Status.PENDING).update(
+            status=ExportJob.Status.RUNNING,
+            started_at=timezone.now(),
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def _build_docs_csv(job: ExportJob, fh) -> str | None:
+    docs, title = mailbox_documents(job.requested_by, job.params.get("kind", ""))
+    write_documents_csv(fh, docs)
+    return f"{title}_{timezone.localtime(job.created_at):%Y%m%d_%H%M}.csv"
+
+
+def _build_docs_zip(job: ExportJob, fh) -> str | None:
+    # 등록 후 처리 전에 보관된 문서도 같은 id 로 보관 테이블에서 찾는다.
+    ids = job.params.get("document_ids", [])
+    docs = heapq.merge(
+        *(
+            model.objects.filter(id__in=ids).order_by("id").prefetch_related("attachments").iterator(chunk_size=100)
+            for model in (Document, ArchivedDocument)
+        ),
+        key=lambda d: d.id,
+    )
+    if not write_documents_attachments_zip(fh, docs):
+        return None
+    return f"documents_attachments_{timezone.localtime(job.created_at):%Y%m%d_%H%M%S}.zip"
+
+
+def _build_attachments_zip(job: ExportJob, fh) -> str | None:
+    atts = (
+        Attachment.objects.filter(id__in=job.params.get("attachment_ids", []))
+        .select_related("document")
+        .order_by("-id")
+        .iterator(chunk_size=200)
+    )
+    if not write_attachments_zip(fh, atts):
+        return None
+    return f"attachments_{timezone.localtime(job.created_at):%Y%m%d_%H%M%S}.zip"
+
+
+_BUILDERS = {
+    ExportJob.Kind.DOCS_CSV: _build_docs_csv,
+    ExportJob.Kind.DOCS_ZIP: _build_docs_zip,
+    ExportJob.Kind.ATTACHMENTS_ZIP: _build_attachments_zip,
+}
+
+
+def run_job(job: ExportJob) -> ExportJob:
+    """
+    RUNNING 상태의 작업을 처리해 결과 파일을 저장하고 DONE/FAILED 로 마무리한다.
+    마무리 UPDATE 는 이 워커가 선점한 그대로(RUNNING, 같은 started_at)일 때만 적용한다.
+    그 사이 cleanup_expired_jobs 가 시간 초과로 FAILED 처리했다면 그 결정을 유지하고 만든 파일은 지운다.
+    """
+    builder = _BUILDERS.get(job.kind)
+
+    try:
+        if builder is None:
+            raise ValueError(f"unknown export kind: {job.kind}")
+
+        with tempfile.TemporaryFile() as tmp:
+            # 결과 파일 생성을 위한 읽기는 복제본에서 (설정된 경우)
+            with read_replica():
+                filename = builder(job, tmp)
+            if not filename:
+                job.status = ExportJob.Status.FAILED
+                job.error = "내보낼 첨부파일이 없습니다."
+            else:
+                tmp.seek(0)
+                job.file.save(filename, File(tmp), save=False)
+                job.filename = filename
+                job.status = ExportJob.Status.DONE
+    except Exception as exc:
+        logger.exception("export job %s failed", job.pk)
+        job.status = ExportJob.Status.FAILED
+        job.error = str(exc)[:300]
+
+    now = timezone.now()
+    job.finished_at = now
+    job.expires_at = now + _ttl()
+    finished = ExportJob.objects.filter(
+        pk=job.pk, status=ExportJob.Status.RUNNING, started_at=job.started_at
+    ).update(
+        file=job.file.name or "",
+        filename=job.filename,
+        status=job.status,
+        error=job.error,
+        finished_at=job.finished_at,
+        expires_at=job.expires_at,
+    )
+    if not finished:
+        logger.warning("export job %s was finalized elsewhere; discarding result", job.pk)
+        if job.file:
+            try:
+                job.file.delete(save=False)
+            except OSError:
+                pass
+        job.refresh_from_db()
+    return job
+
+
+def process_pending_jobs(limit: int | None = None) -> int:
+    """
+    대기 중인 작업을 순서대로 처리하고 처리 건수를 반환한다.
+    """
+    processed = 0
+    while limit is None or processed < limit:
+        job = claim_next_job()
+        if not job:
+            break
+        run_job(job)
+        processed += 1
+    return processed
+
+
+def cleanup_expired_jobs(now=None) -> int:
+    """
+    - 만료된 작업은 결과 파일과 함께 삭제
+    - 워커가 비정상 종료되어 RUNNING 에 멈춘 작업은 FAILED 로 정리
+    """
+    now = now or timezone.now()
+
+    ExportJob.objects.filter(
+        status=ExportJob.Status.RUNNING,
+        started_at__lt=now - _stale_after(),
+    ).update(
+        status=ExportJob.Status.FAILED,
+        error="작업 시간이 초과되었습니다.",
+        finished_at=now,
+        expires_at=now + _ttl(),
+    )
+
+    removed = 0
+    for job in ExportJob.objects.filter(expires_at__lt=now).iterator():
+        if job.file:
+            try:
+                job.file.delete(save=False)
+            except OSError:
+                pass
+        job.delete()
+        removed += 1
+    return removed
+
+
+def job_file_basename(job: ExportJob) -> str:
+    return job.filename or os.path.basename(job.file.name or "") or f"export_{job.pk}"
@@ -0,0 +1,166 @@
+# approvals/latency.py
+"""
+요청 지연 벤치마크 (bench_db_latency 명령)
+
+gunicorn 을 워커 수별로 실제로 띄우고, 로그인 세션으로 화면(기본: 결재함)을 동시에 요청해
+요청당 지연(p50/p95/p99)과 처리량을 잰다. DB 연결 방식(프로필)마다 같은 측정을 반복해 비교한다.
+- connect: 풀 없음, CONN_MAX_AGE=0 (요청마다 새 연결, 이전 운영 방식)
+- persistent: 풀 없음, CONN_MAX_AGE=60
+- pool: psycopg_pool 연결 풀 (config/settings/prod.py 의 DB_POOL_* 설정)
+프로필은 환경 변수로 전달하므로 DJANGO_SETTINGS_MODULE=config.settings.prod 로 실행해야 의미가 있다.
+"""
+from __future__ import annotations
+
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+
+PROFILES: dict[str, dict[str, str]] = {
+    "connect": {"DB_POOL": "0", "DB_CONN_MAX_AGE": "0"},
+    "persistent": {"DB_POOL": "0", "DB_CONN_MAX_AGE": "60"},
+    "pool": {"DB_POOL": "1"},
+}
+
+# ALLOWED_HOSTS(local/prod 모두 허용)에 맞춘 Host 헤더
+HOST_HEADER = "localhost"
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * pct))], 2)
+
+
+class _Server:
+    def __init__(self, *, workers: int, bind: str, env: dict[str, str]):
+        self.workers = workers
+        self.bind = bind
+        self.env = {**os.environ, **env}
+        self.proc: subprocess.Popen | None = None
+
+    def __enter__(self):
+        self.proc = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                "config.wsgi:application",
+                "--workers",
+                str(self.workers),
+                "--bind",
+                self.bind,
+                "--log-level",
+                "warning",
+            ],
+            cwd=settings.BASE_DIR,
+            env=self.env,
+        )
+        return self
+
+    def __exit__(self, *exc):
+        if self.proc and self.proc.poll() is None:
+            self.proc.send_signal(signal.SIGTERM)
+            try:
+                self.proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+
+    def wait_ready(self, url: str, cookie: str, timeout: float = 30.0) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"gunicorn 이 종료되었습니다 (exit {self.proc.returncode}).")
+            try:
+                _get(url, cookie)
+                return
+            except (OSError, urllib.error.URLError):
+                time.sleep(0.2)
+        raise RuntimeError("gunicorn 이 응답하지 않습니다.")
+
+
+def _get(url: str, cookie: str) -> int:
+    req = urllib.request.Request(url, headers={"Cookie": cookie, "Host": HOST_HEADER})
+    with urllib.request.urlopen(req, timeout=30) as res:
+        res.read()
+        return res.status
+
+
+def _load(url: str, cookie: str, *, clients: int, seconds: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    end = time.monotonic() + seconds
+
+    def client():
+        nonlocal errors
+        mine, failed = [], 0
+        while time.monotonic() < end:
+            start = time.perf_counter()
+            try:
+                status = _get(url, cookie)
+            except (OSError, urllib.error.URLError):
+                failed += 1
+                continue
+            if status != 200:
+                failed += 1
+                continue
+            mine.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(mine)
+            errors += failed
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / seconds, 1),
+        "p50_ms": round(statistics.median(latencies), 2) if latencies else None,
+        "p95_ms": _percentile(latencies, 0.95),
+        "p99_ms": _percentile(latencies, 0.99),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else None,
+    }
+
+
+def run_latency_benchmark(
+    *,
+    profiles: list[str],
+    worker_counts: list[int],
+    path: str,
+    session_cookie: str,
+    seconds: float = 10.0,
+    warmup: float = 2.0,
+    clients_per_worker: int = 2,
+    bind: str = "127.0.0.1:8765",
+) -> list[dict]:
+    """
+    프로필 x 워커 수 조합마다 gunicorn 을 새로 띄워 측정한다.
+    클라이언트 스레드 수는 워커 수 x clients_per_worker (sync 워커가 쉬지 않도록).
+    """
+    url = f"http://{bind}{path}"
+    cookie = f"{settings.SESSION_COOKIE_NAME}={session_cookie}"
+    rows = []
+    for profile in profiles:
+        for workers in worker_counts:
+            with _Server(workers=workers, bind=bind, env=PROFILES[profile]) as server:
+                server.wait_ready(url, cookie)
+                clients = max(workers * clients_per_worker, 1)
+                if warmup > 0:
+                    _load(url, cookie, clients=clients, seconds=warmup)
+                result = _load(url, cookie, clients=clients, seconds=seconds)
+            rows.append({"profile": profile, "workers": workers, "clients": clients, **result})
+    return rows
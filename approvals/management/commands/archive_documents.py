@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from approvals.archive import archivable_documents, archive_documents, months_ago
+
+
+class Command(BaseCommand):
+    help = (
+        "마지막 변경 후 오래된 완료/반려 문서를 결재 라인·첨부·열람 권한과 함께 보관 테이블로 옮깁니다. "
+        "(문서 id 와 URL 은 그대로, 보관 문서는 읽기 전용)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=None,
+            help="기준 개월 수 (기본: settings.ARCHIVE_AFTER_MONTHS)",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="트랜잭션 하나에 옮길 문서 수")
+        parser.add_argument("--limit", type=int, default=None, help="이번 실행에서 옮길 최대 문서 수")
+        parser.add_argument("--dry-run", action="store_true", help="대상 건수만 출력")
+
+    def handle(self, *args, **options):
+        months = options["months"] if options["months"] is not None else settings.ARCHIVE_AFTER_MONTHS
+        if months < 1:
+            raise CommandError("--months 는 1 이상이어야 합니다.")
+        before = months_ago(months)
+        label = timezone.localtime(before).strftime("%Y-%m-%d %H:%M")
+
+        if options["dry_run"]:
+            count = archivable_documents(before).count()
+            self.stdout.write(f"{label} 이전에 끝난 보관 대상 문서: {count}건")
+            return
+
+        moved = archive_documents(
+            before=before,
+            batch_size=max(options["batch_size"], 1),
+            limit=options["limit"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"{label} 이전에 끝난 문서 {moved}건을 보관했습니다."))
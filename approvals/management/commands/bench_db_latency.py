@@ -0,0 +1,96 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from approvals.benchmark import git_revision, pick_actors
+from approvals.latency import PROFILES, run_latency_benchmark
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+class Command(BaseCommand):
+    help = (
+        "gunicorn 워커 수별로 화면 요청 지연(p50/p95/p99)을 측정해 DB 연결 방식"
+        "(connect: 요청마다 연결 / persistent: CONN_MAX_AGE / pool: psycopg 연결 풀)을 비교합니다. "
+        "DJANGO_SETTINGS_MODULE=config.settings.prod, DB_ENGINE=postgresql 에서 실행하세요."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("-o", "--output", default="", help="결과 JSON 경로")
+        parser.add_argument("--profiles", default=",".join(PROFILES), help="비교할 프로필 (',' 구분)")
+        parser.add_argument("--workers", default="1,2,4,8", help="gunicorn 워커 수 목록 (',' 구분)")
+        parser.add_argument("--seconds", type=float, default=10.0, help="조합별 측정 시간(초)")
+        parser.add_argument("--warmup", type=float, default=2.0, help="측정 전 예열 시간(초)")
+        parser.add_argument("--clients-per-worker", type=int, default=2, help="워커당 동시 요청 스레드 수")
+        parser.add_argument("--path", default="", help="요청할 경로 (기본: 결재함)")
+        parser.add_argument("--username", default="", help="로그인할 사용자 (기본: 처리 대기 문서가 가장 많은 위원장)")
+        parser.add_argument("--bind", default="127.0.0.1:8765")
+
+    def handle(self, *args, **options):
+        profiles = [p.strip() for p in options["profiles"].split(",") if p.strip()]
+        unknown = [p for p in profiles if p not in PROFILES]
+        if unknown:
+            raise CommandError(f"알 수 없는 프로필: {', '.join(unknown)} (가능: {', '.join(PROFILES)})")
+        try:
+            worker_counts = _int_list(options["workers"])
+        except ValueError as exc:
+            raise CommandError("--workers 는 숫자 목록이어야 합니다.") from exc
+
+        if connection.vendor != "postgresql":
+            self.stderr.write(
+                self.style.WARNING(f"현재 DB 는 {connection.vendor} 입니다. 프로필 차이는 PostgreSQL 에서만 나타납니다.")
+            )
+
+        user = self._user(options["username"])
+        client = Client()
+        client.force_login(user)  # 세션을 DB 에 저장하고 그 쿠키로 gunicorn 에 요청한다.
+        session = client.cookies[settings.SESSION_COOKIE_NAME].value
+
+        rows = run_latency_benchmark(
+            profiles=profiles,
+            worker_counts=worker_counts,
+            path=options["path"] or reverse("approvals:inbox"),
+            session_cookie=session,
+            seconds=options["seconds"],
+            warmup=options["warmup"],
+            clients_per_worker=options["clients_per_worker"],
+            bind=options["bind"],
+        )
+
+        for r in rows:
+            self.stdout.write(
+                f"{r['profile']:<11} workers {r['workers']:>2}  {r['rps']:>7.1f} req/s  "
+                f"p50 {r['p50_ms'] or 0:>8.2f}  p95 {r['p95_ms'] or 0:>8.2f}  p99 {r['p99_ms'] or 0:>8.2f} ms"
+                f"  오류 {r['errors']}"
+            )
+        if options["output"]:
+            result = {
+                "meta": {
+                    "git": git_revision(),
+                    "database": connection.vendor,
+                    "settings": settings.SETTINGS_MODULE,
+                    "user": user.username,
+                },
+                "results": rows,
+            }
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                fh.write(json.dumps(result, ensure_ascii=False, indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"결과를 {options['output']}에 저장했습니다."))
+
+    def _user(self, username: str):
+        if username:
+            user = get_user_model().objects.filter(username=username).first()
+            if not user:
+                raise CommandError(f"사용자가 없습니다: {username}")
+            return user
+        user = pick_actors()["chair"] or get_user_model().objects.filter(is_active=True).order_by("id").first()
+        if not user:
+            raise CommandError("사용자가 없습니다. generate_dataset 으로 데이터를 먼저 만드세요.")
+        return user
@@ -0,0 +1,47 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from approvals.concurrency import run_concurrency_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "여러 프로세스가 같은 SQLite 파일에 동시에 읽기/결재를 할 때의 처리량을 "
+        "Django 기본 설정(default)과 운영 설정(production: settings.SQLITE_OPTIONS)으로 비교합니다. "
+        "임시 DB 를 만들어 쓰므로 현재 DB 는 바뀌지 않습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("-o", "--output", default="", help="결과 JSON 경로")
+        parser.add_argument("--workers", type=int, default=4, help="동시 작업자 프로세스 수")
+        parser.add_argument("--seconds", type=float, default=10.0, help="설정별 측정 시간(초)")
+        parser.add_argument("--write-ratio", type=float, default=0.2, help="쓰기(상신/결재) 비율 0~1")
+        parser.add_argument("--documents", type=int, default=500, help="초기 문서 수")
+        parser.add_argument("--users", type=int, default=40)
+        parser.add_argument("--chairs", type=int, default=8)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        result = run_concurrency_benchmark(
+            profiles={"default": {}, "production": settings.SQLITE_OPTIONS},
+            workers=max(options["workers"], 1),
+            seconds=options["seconds"],
+            write_ratio=min(max(options["write_ratio"], 0.0), 1.0),
+            users=options["users"],
+            chairs=max(options["chairs"], 1),
+            documents=options["documents"],
+            seed=options["seed"],
+        )
+
+        for name, r in result["results"].items():
+            self.stdout.write(
+                f"{name:<12} {r['ops_per_sec']:>8.1f} ops/s  쓰기 {r['writes_per_sec']:>7.1f}/s  "
+                f"쓰기 p95 {r['write_p95_ms'] or 0:>8.1f} ms  읽기 p95 {r['read_p95_ms'] or 0:>7.1f} ms  "
+                f"잠금 오류 {r['errors']}"
+            )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                fh.write(json.dumps(result, ensure_ascii=False, indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"결과를 {options['output']}에 저장했습니다."))
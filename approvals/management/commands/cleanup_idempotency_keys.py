@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from approvals.idempotency import cleanup_expired_keys
+
+
+class Command(BaseCommand):
+    help = "만료된 중복 제출 방지 키(IdempotencyKey)를 삭제합니다. (보관 시간: IDEMPOTENCY_KEY_TTL_HOURS)"
+
+    def handle(self, *args, **options):
+        deleted = cleanup_expired_keys()
+        self.stdout.write(self.style.SUCCESS(f"만료된 키 {deleted}건을 삭제했습니다."))
@@ -0,0 +1,108 @@
+import argparse
+import json
+
+from django.core.management.base import BaseCommand
+from django.db.models import Prefetch
+
+from approvals.models import (
+    ArchivedAttachment,
+    ArchivedDocument,
+    ArchivedDocumentLine,
+    Attachment,
+    Document,
+    DocumentLine,
+)
+
+
+def _dt(value):
+    return value.isoformat() if value else None
+
+
+def serialize_document(doc: Document | ArchivedDocument) -> dict:
+    """
+    문서 1건을 결재 라인/첨부 메타데이터와 함께 dict 로 변환한다.
+    사용자는 인스턴스 간 이동을 위해 id 대신 username 으로 기록한다.
+    보관 문서는 "archived": true 와 보관 시각/revision 을 함께 기록한다 (가져오기 시 원래 id 로 복원).
+    """
+    rec = {
+        "id": doc.id,
+        "title": doc.title,
+        "content": doc.content,
+        "status": doc.status,
+        "current_line_order": doc.current_line_order,
+        "created_by": doc.created_by.username,
+        "created_at": _dt(doc.created_at),
+        "updated_at": _dt(doc.updated_at),
+        "lines": [
+            {
+                "id": line.id,
+                "role": line.role,
+                "order": line.order,
+                "user": line.user.username,
+                "decision": line.decision,
+                "comment": line.comment,
+                "acted_at": _dt(line.acted_at),
+            }
+            for line in doc.lines.all()
+        ],
+        "attachments": [
+            {
+                "id": att.id,
+                "file": att.file.name,
+                "uploaded_by": att.uploaded_by.username,
+                "created_at": _dt(att.created_at),
+            }
+            for att in doc.attachments.all()
+        ],
+    }
+    if isinstance(doc, ArchivedDocument):
+        rec["archived"] = True
+        rec["revision"] = doc.revision
+        rec["archived_at"] = _dt(doc.archived_at)
+    return rec
+
+
+def _with_children(qs, line_model, attachment_model):
+    return qs.order_by("id").select_related("created_by").prefetch_related(
+        Prefetch("lines", queryset=line_model.objects.select_related("user").order_by("order", "id")),
+        Prefetch("attachments", queryset=attachment_model.objects.select_related("uploaded_by").order_by("id")),
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "문서/결재 라인/첨부 메타데이터를 NDJSON(문서 1건 = 1줄)으로 내보냅니다. "
+        "보관 문서(archive_documents)도 기본으로 함께 내보냅니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("-o", "--output", default="-", help="출력 파일 경로 (기본: stdout)")
+        parser.add_argument("--chunk-size", type=int, default=500, help="DB에서 한 번에 읽을 문서 수")
+        parser.add_argument(
+            "--include-archived",
+            action=argparse.BooleanOptionalAction,
+            default=True,
+            help="보관 문서도 내보내기 (기본: 켬, --no-include-archived 로 끔)",
+        )
+
+    def handle(self, *args, **options):
+        querysets = [_with_children(Document.objects.all(), DocumentLine, Attachment)]
+        if options["include_archived"]:
+            querysets.append(_with_children(ArchivedDocument.objects.all(), ArchivedDocumentLine, ArchivedAttachment))
+
+        output = options["output"]
+        out = self.stdout if output == "-" else open(output, "w", encoding="utf-8")
+
+        count = archived = 0
+        try:
+            for qs in querysets:
+                for doc in qs.iterator(chunk_size=options["chunk_size"]):
+                    rec = serialize_document(doc)
+                    out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                    count += 1
+                    archived += rec.get("archived", False)
+        finally:
+            if out is not self.stdout:
+                out.close()
+
+        self.stderr.write(f"문서 {count}건(보관 {archived}건)을 내보냈습니다.")
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from approvals.dataset import generate_dataset, parse_status_mix
+
+
+class Command(BaseCommand):
+    help = (
+        "성능 측정용 합성 데이터를 만듭니다. "
+        "회원 N명(앞쪽 일부는 CHAIR), 협의/결재/수신 라인과 상태가 섞인 문서 M건, 임의 첨부파일을 생성합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200, help="회원 수")
+        parser.add_argument("--chairs", type=int, default=30, help="CHAIR 그룹 인원 (결재 라인 대상)")
+        parser.add_argument("--documents", type=int, default=1000, help="문서 수")
+        parser.add_argument(
+            "--status-mix",
+            default="",
+            help="상태 비율 (예: IN_PROGRESS=35,COMPLETED=45,REJECTED=12,DRAFT=8)",
+        )
+        parser.add_argument("--attachments", type=float, default=1.0, help="문서당 평균 첨부 수 (0 이면 없음)")
+        parser.add_argument("--attachment-kb", type=int, default=4, help="첨부파일 크기(KB)")
+        parser.add_argument("--days", type=int, default=365, help="작성일을 분산할 기간(일)")
+        parser.add_argument("--prefix", default="bench", help="회원 username / 문서 제목 / 첨부 경로 접두어")
+        parser.add_argument("--password", default="", help="생성 회원 비밀번호 (없으면 로그인 불가)")
+        parser.add_argument("--seed", type=int, default=None, help="난수 시드 (같은 값이면 같은 데이터)")
+        parser.add_argument("--batch-size", type=int, default=500, help="한 트랜잭션에 저장할 문서 수")
+
+    def handle(self, *args, **options):
+        if not connection.features.can_return_rows_from_bulk_insert:
+            raise CommandError("이 DB 백엔드는 bulk_create 후 id를 돌려주지 않아 데이터 생성을 지원하지 않습니다.")
+        if options["users"] < 1 or options["chairs"] < 1:
+            raise CommandError("--users 와 --chairs 는 1 이상이어야 합니다.")
+
+        try:
+            status_mix = parse_status_mix(options["status_mix"]) if options["status_mix"] else None
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        summary = generate_dataset(
+            users=options["users"],
+            chairs=options["chairs"],
+            documents=max(options["documents"], 0),
+            prefix=options["prefix"],
+            password=options["password"],
+            seed=options["seed"],
+            status_mix=status_mix,
+            attachments=options["attachments"],
+            attachment_bytes=max(options["attachment_kb"], 0) * 1024,
+            days=options["days"],
+            batch_size=max(options["batch_size"], 1),
+        )
+
+        statuses = ", ".join(f"{k} {v}" for k, v in sorted(summary.statuses.items()))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"회원 {summary.users}명(위원장 {summary.chairs}명), 문서 {summary.documents}건, "
+                f"결재 라인 {summary.lines}건, 첨부 {summary.attachments}건을 만들었습니다. ({statuses})"
+            )
+        )
@@ -0,0 +1,294 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from approvals.models import (
+    ArchivedAttachment,
+    ArchivedDocument,
+    ArchivedDocumentLine,
+    ArchivedDocumentViewer,
+    Attachment,
+    Document,
+    DocumentLine,
+    DocumentViewer,
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "export_documents_ndjson 으로 만든 NDJSON 을 불러옵니다. "
+        "문서 id는 새로 발급(원본 id는 보고용으로만 사용)되며, 배치 단위 bulk_create 로 저장합니다. "
+        "보관 문서(\"archived\": true)는 상세/첨부 URL 이 유지되도록 원래 id 그대로 보관 테이블에 복원합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON 파일 경로 ('-' 이면 stdin)")
+        parser.add_argument("--batch-size", type=int, default=500, help="한 트랜잭션에 저장할 문서 수")
+        parser.add_argument(
+            "--fallback-user",
+            default="",
+            help="대상 인스턴스에 없는 username 을 대신할 사용자 (없으면 오류)",
+        )
+
+    def handle(self, *args, **options):
+        if not connection.features.can_return_rows_from_bulk_insert:
+            raise CommandError("이 DB 백엔드는 bulk_create 후 id를 돌려주지 않아 가져오기를 지원하지 않습니다.")
+
+        self.verbosity = options["verbosity"]
+        self.batch_size = max(options["batch_size"], 1)
+        self.user_ids: dict[str, int] = {}
+        self.fallback_id = None
+
+        fallback = (options["fallback_user"] or "").strip()
+        if fallback:
+            self.fallback_id = User.objects.filter(username=fallback).values_list("id", flat=True).first()
+            if not self.fallback_id:
+                raise CommandError(f"fallback 사용자를 찾을 수 없습니다: {fallback}")
+
+        path = options["path"]
+        src = sys.stdin if path == "-" else open(path, encoding="utf-8")
+
+        imported = 0
+        self.archived = 0
+        self.skipped = 0
+        batch: list[dict] = []
+        try:
+            for lineno, raw in enumerate(src, start=1):
+                raw = raw.strip()
+                if not raw:
+                    continue
+                try:
+                    batch.append(json.loads(raw))
+                except json.JSONDecodeError as exc:
+                    raise CommandError(f"{lineno}번째 줄을 해석할 수 없습니다: {exc}") from exc
+
+                if len(batch) >= self.batch_size:
+                    imported += self._flush(batch)
+                    batch = []
+
+            if batch:
+                imported += self._flush(batch)
+        finally:
+            if src is not sys.stdin:
+                src.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"문서 {imported}건(보관 {self.archived}건)을 가져왔습니다. 이미 있는 보관 문서 {self.skipped}건은 건너뜀."
+            )
+        )
+
+    def _resolve_users(self, records: list[dict]) -> None:
+        names: set[str] = set()
+        for rec in records:
+            names.add(rec["created_by"])
+            names.update(line["user"] for line in rec.get("lines", []))
+            names.update(att["uploaded_by"] for att in rec.get("attachments", []))
+
+        unknown = names - self.user_ids.keys()
+        if not unknown:
+            return
+
+        found = dict(User.objects.filter(username__in=unknown).values_list("username", "id"))
+        self.user_ids.update(found)
+
+        missing = unknown - found.keys()
+        if missing:
+            if not self.fallback_id:
+                sample = ", ".join(sorted(missing)[:10])
+                raise CommandError(f"대상 인스턴스에 없는 사용자가 있습니다: {sample}")
+            for name in missing:
+                self.user_ids[name] = self.fallback_id
+
+    @transaction.atomic
+    def _flush(self, records: list[dict]) -> int:
+        self._resolve_users(records)
+
+        archived = [rec for rec in records if rec.get("archived")]
+        records = [rec for rec in records if not rec.get("archived")]
+        count = self._restore_archived(archived) if archived else 0
+        if not records:
+            return count
+
+        docs = [
+            Document(
+                title=rec["title"],
+                content=rec.get("content", ""),
+                created_by_id=self.user_ids[rec["created_by"]],
+                status=rec["status"],
+                current_line_order=rec.get("current_line_order", 1),
+            )
+            for rec in records
+        ]
+        Document.objects.bulk_create(docs)
+
+        # auto_now/auto_now_add 는 bulk_create 시 현재 시각으로 채워지므로 원본 시각으로 되돌린다.
+        for doc, rec in zip(docs, records):
+            doc.created_at = parse_datetime(rec["created_at"]) or doc.created_at
+            doc.updated_at = parse_datetime(rec["updated_at"]) or doc.updated_at
+        Document.objects.bulk_update(docs, ["created_at", "updated_at"])
+
+        lines: list[DocumentLine] = []
+        atts: list[Attachment] = []
+        att_created: list = []
+        viewers: set[tuple[int, int]] = set()
+        for doc, rec in zip(docs, records):
+            viewers.add((doc.id, doc.created_by_id))
+            for line in rec.get("lines", []):
+                lines.append(
+                    DocumentLine(
+                        document_id=doc.id,
+                        role=line["role"],
+                        order=line["order"],
+                        user_id=self.user_ids[line["user"]],
+                        decision=line["decision"],
+                        comment=line.get("comment", ""),
+                        acted_at=parse_datetime(line["acted_at"]) if line.get("acted_at") else None,
+                    )
+                )
+                viewers.add((doc.id, self.user_ids[line["user"]]))
+            for att in rec.get("attachments", []):
+                atts.append(
+                    Attachment(
+                        document_id=doc.id,
+                        file=att["file"],
+                        uploaded_by_id=self.user_ids[att["uploaded_by"]],
+                    )
+                )
+                att_created.append(parse_datetime(att["created_at"]) if att.get("created_at") else None)
+                viewers.add((doc.id, self.user_ids[att["uploaded_by"]]))
+
+        DocumentLine.objects.bulk_create(lines, batch_size=1000)
+        DocumentViewer.objects.bulk_create(
+            [DocumentViewer(document_id=d, user_id=u) for d, u in viewers],
+            batch_size=1000,
+        )
+
+        if atts:
+            Attachment.objects.bulk_create(atts, batch_size=1000)
+            for att, created_at in zip(atts, att_created):
+                if created_at:
+                    att.created_at = created_at
+            Attachment.objects.bulk_update(atts, ["created_at"], batch_size=1000)
+
+        if self.verbosity >= 2:
+            for doc, rec in zip(docs, records):
+                self.stdout.write(f"{rec.get('id')} -> {doc.id}")
+
+        return count + len(docs)
+
+    def _restore_archived(self, records: list[dict]) -> int:
+        """
+        보관 문서를 원래 문서/라인/첨부 id 로 Archived* 테이블에 넣는다.
+        - 같은 id 의 보관 문서가 이미 있으면 건너뛴다 (같은 파일을 다시 가져와도 안전).
+        - 같은 id 의 운영 문서/첨부가 있으면 URL 이 겹치므로 오류로 중단한다.
+        - 이후 새 문서/첨부가 복원한 id 를 다시 받지 않도록 id 시퀀스를 그 뒤로 옮긴다.
+        """
+        doc_ids = [rec["id"] for rec in records]
+        existing = set(ArchivedDocument.objects.filter(id__in=doc_ids).values_list("id", flat=True))
+        records = [rec for rec in records if rec["id"] not in existing]
+        self.skipped += len(existing)
+        if not records:
+            return 0
+
+        att_ids = [att["id"] for rec in records for att in rec.get("attachments", [])]
+        clash = list(Document.objects.filter(id__in=[rec["id"] for rec in records]).values_list("id", flat=True)[:10])
+        if clash:
+            raise CommandError(f"보관 문서와 같은 id 의 운영 문서가 있습니다: {clash}")
+        clash = list(Attachment.objects.filter(id__in=att_ids).values_list("id", flat=True)[:10])
+        if clash:
+            raise CommandError(f"보관 첨부와 같은 id 의 운영 첨부가 있습니다: {clash}")
+
+        docs: list[ArchivedDocument] = []
+        lines: list[ArchivedDocumentLine] = []
+        atts: list[ArchivedAttachment] = []
+        viewers: set[tuple[int, int]] = set()
+        for rec in records:
+            doc = ArchivedDocument(
+                id=rec["id"],
+                title=rec["title"],
+                content=rec.get("content", ""),
+                created_by_id=self.user_ids[rec["created_by"]],
+                status=rec["status"],
+                current_line_order=rec.get("current_line_order", 1),
+                revision=rec.get("revision", 0),
+                created_at=parse_datetime(rec["created_at"]),
+                updated_at=parse_datetime(rec["updated_at"]),
+            )
+            docs.append(doc)
+            viewers.add((doc.id, doc.created_by_id))
+            for line in rec.get("lines", []):
+                lines.append(
+                    ArchivedDocumentLine(
+                        id=line["id"],
+                        document_id=doc.id,
+                        role=line["role"],
+                        order=line["order"],
+                        user_id=self.user_ids[line["user"]],
+                        decision=line["decision"],
+                        comment=line.get("comment", ""),
+                        acted_at=parse_datetime(line["acted_at"]) if line.get("acted_at") else None,
+                    )
+                )
+                viewers.add((doc.id, self.user_ids[line["user"]]))
+            for att in rec.get("attachments", []):
+                atts.append(
+                    ArchivedAttachment(
+                        id=att["id"],
+                        document_id=doc.id,
+                        file=att["file"],
+                        uploaded_by_id=self.user_ids[att["uploaded_by"]],
+                        created_at=parse_datetime(att["created_at"]),
+                    )
+                )
+                viewers.add((doc.id, self.user_ids[att["uploaded_by"]]))
+
+        ArchivedDocument.objects.bulk_create(docs)
+        # archived_at 은 auto_now_add 라 원본 보관 시각으로 되돌린다.
+        for doc, rec in zip(docs, records):
+            doc.archived_at = parse_datetime(rec.get("archived_at") or "") or doc.archived_at
+        ArchivedDocument.objects.bulk_update(docs, ["archived_at"])
+        ArchivedDocumentLine.objects.bulk_create(lines, batch_size=1000)
+        ArchivedAttachment.objects.bulk_create(atts, batch_size=1000)
+        ArchivedDocumentViewer.objects.bulk_create(
+            [ArchivedDocumentViewer(document_id=d, user_id=u) for d, u in viewers],
+            batch_size=1000,
+        )
+
+        _reserve_ids(Document, max(doc.id for doc in docs))
+        if atts:
+            _reserve_ids(Attachment, max(att.id for att in atts))
+
+        if self.verbosity >= 2:
+            for doc in docs:
+                self.stdout.write(f"{doc.id} -> {doc.id} (보관, id 유지)")
+
+        self.archived += len(docs)
+        return len(docs)
+
+
+def _reserve_ids(model, max_id: int) -> None:
+    """
+    model 의 자동 증가 id 가 max_id 이하를 다시 발급하지 않도록 시퀀스를 올린다 (SQLite/PostgreSQL).
+    """
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute("UPDATE sqlite_sequence SET seq = %s WHERE name = %s AND seq < %s", [max_id, table, max_id])
+            cursor.execute(
+                "INSERT INTO sqlite_sequence (name, seq) SELECT %s, %s "
+                "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = %s)",
+                [table, max_id, table],
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+                "GREATEST(nextval(pg_get_serial_sequence(%s, 'id')), %s))",
+                [table, table, max_id],
+            )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from approvals.services import rebuild_document_viewers
+
+
+class Command(BaseCommand):
+    help = "문서 열람 권한 캐시(DocumentViewer)를 작성자/결재 라인/첨부 업로더 기준으로 다시 만듭니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="한 번에 처리할 문서 수")
+
+    def handle(self, *args, **options):
+        changed = rebuild_document_viewers(batch_size=max(options["batch_size"], 1))
+        self.stdout.write(self.style.SUCCESS(f"열람 권한 {changed}건을 조정했습니다."))
@@ -0,0 +1,40 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from approvals.services import document_status_drift, repair_document_status
+
+
+class Command(BaseCommand):
+    help = (
+        "상신/진행중/완료 문서의 상태와 현재 결재 순서(current_line_order)를 결재 라인 기준으로 점검합니다. "
+        "--fix 를 주면 어긋난 문서를 일괄 수정합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="어긋난 문서를 수정")
+        parser.add_argument("--show", type=int, default=20, help="출력할 문서 수 (0 이면 건수만)")
+        parser.add_argument("--batch-size", type=int, default=1000, help="UPDATE 한 번에 고칠 문서 수")
+
+    def handle(self, *args, **options):
+        drift = list(document_status_drift())
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("어긋난 문서가 없습니다."))
+            return
+
+        self.stdout.write(f"어긋난 문서: {len(drift)}건")
+        transitions = Counter((row["status"], row["expected_status"]) for row in drift)
+        for (status, expected), count in sorted(transitions.items()):
+            self.stdout.write(f"  {status} -> {expected}: {count}건")
+        for row in drift[: max(options["show"], 0)]:
+            self.stdout.write(
+                f"  #{row['id']} {row['status']}/{row['current_line_order']}"
+                f" -> {row['expected_status']}/{row['expected_order'] or row['current_line_order']}"
+            )
+
+        if not options["fix"]:
+            self.stdout.write("수정하려면 --fix 를 주세요.")
+            return
+
+        fixed = repair_document_status([row["id"] for row in drift], batch_size=max(options["batch_size"], 1))
+        self.stdout.write(self.style.SUCCESS(f"문서 {fixed}건의 상태를 수정했습니다."))
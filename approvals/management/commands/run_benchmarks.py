@@ -0,0 +1,61 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from approvals.benchmark import BenchmarkRunner, compare
+
+
+class Command(BaseCommand):
+    help = (
+        "결재 흐름 벤치마크를 실행해 시나리오별 소요 시간(ms)과 쿼리 수를 JSON 으로 기록합니다. "
+        "(inbox_pending, 문서함 화면, 문서 상세, CSV 내보내기, 첨부 ZIP, 결재 전이)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("-o", "--output", default="-", help="결과 JSON 경로 (기본: stdout)")
+        parser.add_argument("--repeat", type=int, default=5, help="시나리오별 반복 횟수")
+        parser.add_argument("--only", default="", help="실행할 시나리오 이름/접두어 (',' 구분, 예: view.,export.)")
+        parser.add_argument("--warm-cache", action="store_true", help="반복 사이에 캐시를 비우지 않음")
+        parser.add_argument("--compare", default="", help="비교할 이전 결과 JSON 경로")
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["compare"]:
+            try:
+                with open(options["compare"], encoding="utf-8") as fh:
+                    baseline = json.load(fh)
+            except (OSError, json.JSONDecodeError) as exc:
+                raise CommandError(f"비교 파일을 읽을 수 없습니다: {exc}") from exc
+
+        runner = BenchmarkRunner(
+            repeat=options["repeat"],
+            warm_cache=options["warm_cache"],
+            only=[o.strip() for o in options["only"].split(",")],
+        )
+        result = runner.run()
+
+        text = json.dumps(result, ensure_ascii=False, indent=2)
+        if options["output"] == "-":
+            self.stdout.write(text)
+        else:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                fh.write(text + "\n")
+            self._summary(result, options["output"])
+
+        if baseline is not None:
+            # stdout 이 JSON 이면 비교표는 stderr 로
+            out = self.stderr if options["output"] == "-" else self.stdout
+            for row in compare(result, baseline):
+                change = "-" if row["change_pct"] is None else f"{row['change_pct']:+.1f}%"
+                out.write(
+                    f"{row['name']:<28} {row['baseline_ms']:>10.2f} -> {row['median_ms']:>10.2f} ms ({change})"
+                    f"  queries {row['baseline_queries']} -> {row['queries']}"
+                )
+
+    def _summary(self, result: dict, path: str) -> None:
+        for name, r in result["results"].items():
+            if "skipped" in r:
+                self.stdout.write(f"{name:<28} 건너뜀: {r['skipped']}")
+            else:
+                self.stdout.write(f"{name:<28} median {r['median_ms']:>10.2f} ms  queries {r['queries']}")
+        self.stdout.write(self.style.SUCCESS(f"결과를 {path}에 저장했습니다."))
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from approvals.jobs import cleanup_expired_jobs, process_pending_jobs
+
+
+class Command(BaseCommand):
+    help = "CSV/ZIP 내보내기 작업을 처리하는 워커 (DB 폴링, 별도 브로커 불필요)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="대기 작업을 한 번 처리하고 종료")
+        parser.add_argument("--interval", type=float, default=2.0, help="폴링 간격(초)")
+        parser.add_argument("--max-jobs", type=int, default=None, help="한 번에 처리할 최대 작업 수")
+
+    def handle(self, *args, **options):
+        once = options["once"]
+        interval = max(options["interval"], 0.1)
+        max_jobs = options["max_jobs"]
+
+        while True:
+            removed = cleanup_expired_jobs()
+            if removed:
+                self.stdout.write(f"만료된 내보내기 {removed}건 정리")
+
+            processed = process_pending_jobs(limit=max_jobs)
+            if processed:
+                self.stdout.write(self.style.SUCCESS(f"내보내기 {processed}건 처리"))
+
+            if once:
+                return
+
+            if not processed:
+                time.sleep(interval)
@@ -0,0 +1,28 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "로컬 확인용: default SQLite DB 를 READ_REPLICA 파일로 복사합니다 (SQLite 온라인 백업). "
+        "주기적으로 실행하면 복제 지연이 있는 replica 를 흉내 낼 수 있습니다."
+    )
+
+    def handle(self, *args, **options):
+        alias = settings.READ_REPLICA
+        if not alias:
+            raise CommandError("READ_REPLICA 가 설정되지 않았습니다. (DB_REPLICA_NAME 환경 변수)")
+        if connections["default"].vendor != "sqlite" or connections[alias].vendor != "sqlite":
+            raise CommandError("SQLite 끼리만 복사할 수 있습니다.")
+
+        source = sqlite3.connect(settings.DATABASES["default"]["NAME"])
+        target = sqlite3.connect(settings.DATABASES[alias]["NAME"])
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        self.stdout.write(self.style.SUCCESS(f"default -> {alias} 복사를 마쳤습니다."))
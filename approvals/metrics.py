@@ -0,0 +1,272 @@
+# approvals/metrics.py
+"""
+Prometheus 텍스트 형식 지표 (/metrics)
+
+- 기록은 프로세스 메모리의 dict 갱신만 한다 (잠금 + 덧셈, 수 마이크로초).
+- METRICS_DIR 가 설정되어 있으면 백그라운드 스레드가 METRICS_FLUSH_SECONDS 마다 프로세스별 파일
+  (<pid>_<시작시각>.json)로 내려쓰고, 수집(/metrics)·종료 시에도 내려쓴 뒤 디렉터리의 모든 파일을 합산한다.
+  요청 처리나 on_commit 경로에서는 파일 I/O 를 하지 않는다.
+  gunicorn 워커가 여러 개여도 어느 워커가 /metrics 를 받든 같은 합계를 돌려준다.
+  배포(서버 시작) 시 디렉터리를 비운다. 카운터 초기화는 Prometheus rate() 가 처리한다.
+- METRICS_DIR 가 비어 있으면 현재 프로세스 값만 노출한다 (개발 서버용).
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 초 단위 지연 히스토그램 기본 구간
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_flush_lock = threading.Lock()
+_metrics: dict[str, "_Metric"] = {}
+# 이름 -> {라벨 값 tuple -> 값}  (카운터: float / 히스토그램: [구간별 개수..., 합계, 개수])
+_values: dict[str, dict[tuple, object]] = {}
+_started = int(time.time())
+# 주기적 내려쓰기 스레드를 시작한 프로세스 pid (fork 된 워커에서는 다시 시작)
+_flusher_pid: int | None = None
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        if name in _metrics:
+            raise ValueError(f"duplicate metric: {name}")
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _metrics[name] = self
+        _values[name] = {}
+        self._samples = _values[name]
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            self._samples[key] = self._samples.get(key, 0) + amount
+        _ensure_flusher()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            row = self._samples.get(key)
+            if row is None:
+                row = self._samples[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+                    break
+            row[-2] += value
+            row[-1] += 1
+        _ensure_flusher()
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+
+# -----------------------------
+# 지표 정의
+# -----------------------------
+TRANSITIONS = Counter(
+    "eapproval_transitions_total",
+    "처리된 결재 전이 수 (submit/approve/reject/withdraw/redraft/complete)",
+    ("action",),
+)
+TRANSITION_SECONDS = Histogram(
+    "eapproval_transition_seconds",
+    "결재 전이 서비스 함수 소요 시간",
+    ("action",),
+)
+EMAILS = Counter(
+    "eapproval_emails_total",
+    "알림 메일 발송 결과 수",
+    ("result",),
+)
+EXPORT_BYTES = Counter(
+    "eapproval_export_bytes_total",
+    "다운로드로 내보낸 바이트 수 (csv/zip/attachment)",
+    ("kind",),
+)
+INBOX_QUERY_SECONDS = Histogram(
+    "eapproval_inbox_query_seconds",
+    "결재함(처리 대기) 목록 조회 시간",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+
+# -----------------------------
+# 다중 프로세스 공유 (파일 디렉터리)
+# -----------------------------
+def _metrics_dir() -> Path | None:
+    path = getattr(settings, "METRICS_DIR", "")
+    return Path(path) if path else None
+
+
+def _own_file(directory: Path) -> Path:
+    return directory / f"{os.getpid()}_{_started}.json"
+
+
+def _copy() -> dict[str, dict[tuple, object]]:
+    with _lock:
+        return {
+            name: {k: (list(v) if isinstance(v, list) else v) for k, v in rows.items()}
+            for name, rows in _values.items()
+        }
+
+
+def flush() -> None:
+    """
+    현재 프로세스 값을 METRICS_DIR 의 자기 파일에 기록한다 (임시 파일 후 교체).
+    """
+    directory = _metrics_dir()
+    if directory is None:
+        return
+    with _flush_lock:
+        directory.mkdir(parents=True, exist_ok=True)
+        target = _own_file(directory)
+        tmp = target.with_suffix(".tmp")
+        data = {name: [[list(k), v] for k, v in rows.items()] for name, rows in _copy().items()}
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, target)
+
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(max(getattr(settings, "METRICS_FLUSH_SECONDS", 5), 1))
+        try:
+            flush()
+        except OSError:
+            pass
+
+
+def _ensure_flusher() -> None:
+    """
+    METRICS_DIR 가 설정된 프로세스에서 처음 기록할 때 내려쓰기 데몬 스레드를 띄운다.
+    이미 떠 있으면 pid 비교만 한다.
+    """
+    global _flusher_pid
+    pid = os.getpid()
+    if _flusher_pid == pid or _metrics_dir() is None:
+        return
+    with _flush_lock:
+        if _flusher_pid == pid:
+            return
+        _flusher_pid = pid
+    threading.Thread(target=_flush_loop, name="metrics-flush", daemon=True).start()
+
+
+@atexit.register
+def _flush_at_exit() -> None:
+    if _metrics_dir() is not None:
+        flush()
+
+
+def collect() -> dict[str, dict[tuple, object]]:
+    """
+    모든 프로세스의 값을 합산한다. METRICS_DIR 가 없으면 현재 프로세스 값만.
+    """
+    directory = _metrics_dir()
+    if directory is None:
+        return _copy()
+
+    flush()
+    merged: dict[str, dict[tuple, object]] = {name: {} for name in _metrics}
+    for path in directory.glob("*.json"):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue  # 다른 프로세스가 교체 중이거나 손상된 파일
+        for name, rows in data.items():
+            if name not in merged:
+                continue
+            for key, value in rows:
+                key = tuple(key)
+                cur = merged[name].get(key)
+                if isinstance(value, list):
+                    if cur is None or len(cur) != len(value):
+                        merged[name][key] = list(value)
+                    else:
+                        merged[name][key] = [a + b for a, b in zip(cur, value)]
+                else:
+                    merged[name][key] = (cur or 0) + value
+    return merged
+
+
+# -----------------------------
+# 텍스트 형식
+# -----------------------------
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: tuple[str, str] | None = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _num(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def render() -> str:
+    values = collect()
+    out: list[str] = []
+    for name, metric in _metrics.items():
+        out.append(f"# HELP {name} {metric.documentation}")
+        out.append(f"# TYPE {name} {metric.kind}")
+        for key, value in sorted(values.get(name, {}).items()):
+            if metric.kind == "counter":
+                out.append(f"{name}{_labels(metric.labelnames, key)} {_num(value)}")
+                continue
+
+            cumulative = 0
+            for bound, n in zip(metric.buckets, value):
+                cumulative += n
+                out.append(f"{name}_bucket{_labels(metric.labelnames, key, ('le', _num(bound)))} {cumulative}")
+            out.append(f"{name}_bucket{_labels(metric.labelnames, key, ('le', '+Inf'))} {value[-1]}")
+            out.append(f"{name}_sum{_labels(metric.labelnames, key)} {_num(value[-2])}")
+            out.append(f"{name}_count{_labels(metric.labelnames, key)} {value[-1]}")
+    return "\n".join(out) + "\n"
+
+
+def reset() -> None:
+    """
+    테스트용: 현재 프로세스 값을 비운다.
+    """
+    with _lock:
+        for rows in _values.values():
+            rows.clear()
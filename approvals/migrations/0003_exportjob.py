@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:25
+
+import approvals.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('approvals', '0002_alter_documentline_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('DOCS_CSV', '문서함 CSV'), ('DOCS_ZIP', '문서 첨부파일 ZIP'), ('ATTACHMENTS_ZIP', '첨부파일 ZIP')], max_length=20)),
+                ('status', models.CharField(choices=[('PENDING', '대기'), ('RUNNING', '처리중'), ('DONE', '완료'), ('FAILED', '실패')], default='PENDING', max_length=10)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('file', models.FileField(blank=True, upload_to=approvals.models.export_upload_to)),
+                ('filename', models.CharField(blank=True, max_length=200)),
+                ('error', models.CharField(blank=True, max_length=300)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='approvals_e_status_f254e7_idx'), models.Index(fields=['expires_at'], name='approvals_e_expires_70ff6e_idx')],
+            },
+        ),
+    ]
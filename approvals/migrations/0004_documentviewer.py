@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_document_viewers(apps, schema_editor):
+    Document = apps.get_model("approvals", "Document")
+    DocumentLine = apps.get_model("approvals", "DocumentLine")
+    Attachment = apps.get_model("approvals", "Attachment")
+    DocumentViewer = apps.get_model("approvals", "DocumentViewer")
+
+    pairs = set(Document.objects.values_list("id", "created_by_id"))
+    pairs.update(DocumentLine.objects.values_list("document_id", "user_id"))
+    pairs.update(Attachment.objects.values_list("document_id", "uploaded_by_id"))
+
+    DocumentViewer.objects.bulk_create(
+        [DocumentViewer(document_id=doc_id, user_id=user_id) for doc_id, user_id in pairs],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('approvals', '0003_exportjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentViewer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='viewers', to='approvals.document')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='viewable_documents', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'document'), name='uniq_document_viewer')],
+            },
+        ),
+        migrations.RunPython(backfill_document_viewers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('approvals', '0004_documentviewer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='revision',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('approvals', '0005_document_revision'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='documentline',
+            index=models.Index(fields=['user', 'role', 'decision'], name='docline_user_role_decision'),
+        ),
+    ]
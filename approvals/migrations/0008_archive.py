@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:37
+
+import approvals.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('approvals', '0007_idempotencykey'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedDocument',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('content', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('DRAFT', '임시'), ('SUBMITTED', '상신'), ('IN_PROGRESS', '진행중'), ('REJECTED', '반려'), ('COMPLETED', '완료')], max_length=20)),
+                ('current_line_order', models.PositiveIntegerField(default=1)),
+                ('revision', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedAttachment',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('file', models.FileField(upload_to=approvals.models.attachment_upload_to)),
+                ('created_at', models.DateTimeField()),
+                ('uploaded_by', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attachments', to='approvals.archiveddocument')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedDocumentLine',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('role', models.CharField(choices=[('CONSULT', '협의'), ('APPROVE', '결재'), ('RECEIVE', '수신/열람')], max_length=10)),
+                ('order', models.PositiveIntegerField()),
+                ('decision', models.CharField(choices=[('PENDING', '대기'), ('APPROVED', '승인'), ('REJECTED', '반려'), ('READ', '열람')], max_length=10)),
+                ('comment', models.CharField(blank=True, max_length=300)),
+                ('acted_at', models.DateTimeField(blank=True, null=True)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='approvals.archiveddocument')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['order', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedDocumentViewer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='viewers', to='approvals.archiveddocument')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'document'), name='uniq_archived_document_viewer')],
+            },
+        ),
+    ]
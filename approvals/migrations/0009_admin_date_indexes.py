@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('approvals', '0008_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attachment',
+            index=models.Index(fields=['created_at'], name='attachment_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['created_at'], name='document_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documentline',
+            index=models.Index(fields=['acted_at'], name='docline_acted_idx'),
+        ),
+    ]
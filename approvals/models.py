@@ -19,9 +19,25 @@ class Document(models.Model):
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.DRAFT)
     current_line_order = models.PositiveIntegerField(default=1)
 
+    # 변경 버전: 상태/결재 라인/첨부가 바뀔 때마다 services.touch_document() 가 올린다.
+    # 화면 조각 캐시 키 등에 사용 (update_fields 저장은 updated_at 을 갱신하지 않으므로 별도 관리)
+    revision = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # 관리자 date_hierarchy / 기간 필터
+            models.Index(fields=["created_at"], name="document_created_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        # admin 등에서 전체 저장하는 경우에도 버전이 바뀌도록
+        if kwargs.get("update_fields") is None:
+            self.revision = (self.revision or 0) + 1
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return f"[{self.get_status_display()}] {self.title}"
 
@@ -49,6 +65,12 @@ class DocumentLine(models.Model):
 
     class Meta:
         ordering = ["order", "id"]
+        indexes = [
+            # 수신함 미열람 건수 / 일괄 읽음 처리
+            models.Index(fields=["user", "role", "decision"], name="docline_user_role_decision"),
+            # 관리자 date_hierarchy / 기간 필터
+            models.Index(fields=["acted_at"], name="docline_acted_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.document_id} {self.role}#{self.order} {self.user}"
@@ -65,5 +87,174 @@ class Attachment(models.Model):
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.PROTECT)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # 관리자 date_hierarchy / 기간 필터
+            models.Index(fields=["created_at"], name="attachment_created_idx"),
+        ]
+
     def __str__(self) -> str:
         return self.file.name
+
+
+class DocumentViewer(models.Model):
+    """
+    문서 열람 권한 캐시 (document, user)
+    - 작성자, 결재 라인 대상자, 첨부 업로더가 열람 대상
+    - services 계층이 문서/라인/첨부를 바꿀 때 함께 갱신한다 (sync_document_viewers)
+    """
+
+    document = models.ForeignKey(Document, on_delete=models.CASCADE, related_name="viewers")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="viewable_documents"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "document"], name="uniq_document_viewer"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.document_id} -> {self.user_id}"
+
+
+def export_upload_to(instance, filename: str) -> str:
+    dt = timezone.localtime(timezone.now())
+    return f"exports/{dt:%Y/%m}/{filename}"
+
+
+class ExportJob(models.Model):
+    """
+    CSV/ZIP 내보내기 백그라운드 작업
+    - 요청 시 PENDING 으로 적재되고 run_export_jobs 워커가 MEDIA_ROOT/exports 아래에 결과를 만든다.
+    - 완료된 결과물은 expires_at 이후 워커가 파일과 함께 정리한다.
+    """
+
+    class Kind(models.TextChoices):
+        DOCS_CSV = "DOCS_CSV", "문서함 CSV"
+        DOCS_ZIP = "DOCS_ZIP", "문서 첨부파일 ZIP"
+        ATTACHMENTS_ZIP = "ATTACHMENTS_ZIP", "첨부파일 ZIP"
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "대기"
+        RUNNING = "RUNNING", "처리중"
+        DONE = "DONE", "완료"
+        FAILED = "FAILED", "실패"
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="export_jobs"
+    )
+    params = models.JSONField(default=dict, blank=True)
+
+    file = models.FileField(upload_to=export_upload_to, blank=True)
+    filename = models.CharField(max_length=200, blank=True)
+    error = models.CharField(max_length=300, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+            models.Index(fields=["expires_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()} #{self.pk} ({self.get_status_display()})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    중복 제출 방지 키 (폼마다 발급한 submit_token)
+    - (user, token, action) 유일: 같은 토큰·같은 동작의 두 번째 POST 는 전이를 다시 실행하지 않고
+      처음 결과(document)를 돌려준다. 한 화면의 여러 폼(승인/반려/회수)이 토큰을 함께 쓰므로 동작까지 구분한다.
+    - 동작과 같은 트랜잭션에서 기록되므로 동작이 실패하면 키도 남지 않는다.
+    - cleanup_idempotency_keys 명령으로 만료분을 정리한다.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    token = models.CharField(max_length=64)
+    action = models.CharField(max_length=20)
+    document = models.ForeignKey(Document, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "token", "action"], name="uniq_idempotency_user_token_action"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id}:{self.action}:{self.token}"
+
+
+# -----------------------------
+# 보관(archive) 테이블
+# -----------------------------
+# 오래전에 끝난(완료/반려) 문서를 운영 테이블에서 옮겨 둔다 (archive.archive_documents).
+# 원래 id 를 그대로 기본 키로 쓰므로 상세/첨부 URL 이 바뀌지 않는다.
+# 보관 문서는 읽기 전용이다 (결재 전이/읽음 처리 없음). 첨부 파일은 원래 경로에 그대로 둔다.
+class ArchivedDocument(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    content = models.TextField(blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.PROTECT, related_name="+")
+    status = models.CharField(max_length=20, choices=Document.Status.choices)
+    current_line_order = models.PositiveIntegerField(default=1)
+    revision = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"[{self.get_status_display()}] {self.title} (보관)"
+
+
+class ArchivedDocumentLine(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    document = models.ForeignKey(ArchivedDocument, on_delete=models.CASCADE, related_name="lines")
+    role = models.CharField(max_length=10, choices=DocumentLine.Role.choices)
+    order = models.PositiveIntegerField()
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.PROTECT, related_name="+")
+
+    decision = models.CharField(max_length=10, choices=DocumentLine.Decision.choices)
+    comment = models.CharField(max_length=300, blank=True)
+    acted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["order", "id"]
+
+    def __str__(self) -> str:
+        return f"{self.document_id} {self.role}#{self.order} {self.user_id}"
+
+
+class ArchivedAttachment(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    document = models.ForeignKey(ArchivedDocument, on_delete=models.CASCADE, related_name="attachments")
+    file = models.FileField(upload_to=attachment_upload_to)
+    uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.PROTECT, related_name="+")
+    created_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return self.file.name
+
+
+class ArchivedDocumentViewer(models.Model):
+    """
+    보관 문서 열람 권한 (DocumentViewer 를 옮겨 온 것)
+    """
+
+    document = models.ForeignKey(ArchivedDocument, on_delete=models.CASCADE, related_name="viewers")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "document"], name="uniq_archived_document_viewer"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.document_id} -> {self.user_id}"
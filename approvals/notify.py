@@ -11,6 +11,9 @@ from django.core.mail import send_mail
 from django.urls import reverse
 from django.utils.html import strip_tags
 
+from accounts.utils import display_name
+
+from .metrics import EMAILS
 from .models import Document, DocumentLine
 
 
@@ -20,39 +23,6 @@ class Recipient:
     email: str
 
 
-def _display_name(user) -> str:
-    """
-    표시 이름 우선순위:
-    1) user.profile.display_name()
-    2) user.profile.full_name
-    3) user.get_full_name()
-    4) user.username
-    """
-    if not user:
-        return "사용자"
-
-    profile = getattr(user, "profile", None)
-    if profile and hasattr(profile, "display_name"):
-        try:
-            v = profile.display_name()
-            if v:
-                return v
-        except Exception:
-            pass
-
-    if profile and getattr(profile, "full_name", ""):
-        v = (profile.full_name or "").strip()
-        if v:
-            return v
-
-    if hasattr(user, "get_full_name"):
-        v = (user.get_full_name() or "").strip()
-        if v:
-            return v
-
-    return (getattr(user, "username", "") or "사용자").strip()
-
-
 def _get_user_email(user) -> str:
     if not user:
         return ""
@@ -110,7 +80,7 @@ def _send_email(subject: str, body: str, to_emails: list[str]) -> None:
 
     def _job() -> None:
         try:
-            send_mail(
+            sent = send_mail(
                 subject=subject,
                 message=strip_tags(body),
                 from_email=from_email,
@@ -118,20 +88,21 @@ def _send_email(subject: str, body: str, to_emails: list[str]) -> None:
                 fail_silently=True,
             )
         except Exception:
-            pass
+            sent = 0
+        EMAILS.inc(result="sent" if sent else "failed")
 
     threading.Thread(target=_job, daemon=True).start()
 
 
 def _pending_consult_lines(doc: Document):
-    return doc.lines.filter(
+    return doc.lines.select_related("user__profile").filter(
         role=DocumentLine.Role.CONSULT,
         decision=DocumentLine.Decision.PENDING,
     ).order_by("order", "id")
 
 
 def _pending_approve_lines(doc: Document):
-    return doc.lines.filter(
+    return doc.lines.select_related("user__profile").filter(
         role=DocumentLine.Role.APPROVE,
         decision=DocumentLine.Decision.PENDING,
     ).order_by("order", "id")
@@ -142,7 +113,7 @@ def _current_pending_approve_line(doc: Document):
 
 
 def _receive_lines(doc: Document):
-    return doc.lines.filter(role=DocumentLine.Role.RECEIVE).order_by("order", "id")
+    return doc.lines.select_related("user__profile").filter(role=DocumentLine.Role.RECEIVE).order_by("order", "id")
 
 
 def notify_on_submit(*, request=None, doc: Document, user=None) -> None:
@@ -153,7 +124,7 @@ def notify_on_submit(*, request=None, doc: Document, user=None) -> None:
     3) 둘 다 없으면 완료 알림
     """
     url = _doc_url(doc, request=request)
-    creator_name = _display_name(getattr(doc, "created_by", None))
+    creator_name = display_name(getattr(doc, "created_by", None), default="사용자")
 
     pending_consults = _pending_consult_lines(doc)
     if pending_consults.exists():
@@ -175,7 +146,7 @@ def notify_on_submit(*, request=None, doc: Document, user=None) -> None:
     next_approve = _current_pending_approve_line(doc)
     if next_approve:
         recipients = _iter_recipients([next_approve.user])
-        next_name = _display_name(next_approve.user)
+        next_name = display_name(next_approve.user, default="사용자")
 
         subject = f"[전자결재] 결재 요청: {doc.title}"
         body = (
@@ -202,7 +173,7 @@ def notify_on_line_approved(*, request=None, doc: Document, user) -> None:
     3) 더 이상 처리자가 없으면 완료 알림
     """
     url = _doc_url(doc, request=request)
-    actor_name = _display_name(user)
+    actor_name = display_name(user, default="사용자")
 
     pending_consults = _pending_consult_lines(doc)
     if pending_consults.exists():
@@ -217,7 +188,7 @@ def notify_on_line_approved(*, request=None, doc: Document, user) -> None:
     next_line = _current_pending_approve_line(doc)
     if next_line:
         recipients = _iter_recipients([next_line.user])
-        next_name = _display_name(next_line.user)
+        next_name = display_name(next_line.user, default="사용자")
 
         subject = f"[전자결재] 처리 요청: {doc.title}"
         body = (
@@ -249,7 +220,7 @@ def notify_on_completed(*, request=None, doc: Document, user=None) -> None:
     receive_users = [ln.user for ln in _receive_lines(doc)]
     recipients = _iter_recipients(([target] if target else []) + receive_users)
 
-    creator_name = _display_name(creator)
+    creator_name = display_name(creator, default="사용자")
 
     subject = f"[전자결재] 완료: {doc.title}"
     body = (
@@ -274,8 +245,8 @@ def notify_on_rejected(*, request=None, doc: Document, user, reason: str) -> Non
     creator = getattr(doc, "created_by", None)
     recipients = _iter_recipients([creator] if creator else [])
 
-    actor_name = _display_name(user)
-    creator_name = _display_name(creator)
+    actor_name = display_name(user, default="사용자")
+    creator_name = display_name(creator, default="사용자")
 
     subject = f"[전자결재] 반려: {doc.title}"
     body = (
@@ -0,0 +1,95 @@
+# approvals/perf.py
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("approvals.perf")
+
+
+class QueryStats:
+    """
+    connection.execute_wrapper 로 요청 중 실행된 쿼리 수/DB 시간을 모은다.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.db_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.count += 1
+
+
+def view_name(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    if not match:
+        return ""
+    return match.view_name or ""
+
+
+def query_budget(name: str) -> int | None:
+    budgets = getattr(settings, "VIEW_QUERY_BUDGETS", {}) or {}
+    return budgets.get(name)
+
+
+class PerfMiddleware:
+    """
+    뷰별 쿼리 수 / DB 시간 / 전체 시간 측정
+    - 응답 헤더: Server-Timing (db, app), DEBUG 이거나 스태프 요청만
+    - 로그: approvals.perf (LOGGING 의 file 핸들러)
+    - VIEW_QUERY_BUDGETS[url name] 을 넘으면 WARNING
+    측정값은 request.perf_stats 에도 남겨 테스트에서 예산 검사에 사용한다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "PERF_INSTRUMENTATION", True):
+            return self.get_response(request)
+
+        stats = QueryStats()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(stats))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        name = view_name(request)
+        db_ms = stats.db_seconds * 1000
+        total_ms = total * 1000
+        request.perf_stats = {
+            "view": name,
+            "queries": stats.count,
+            "db_ms": db_ms,
+            "total_ms": total_ms,
+        }
+
+        # 쿼리 수/DB 시간은 내부 정보라 DEBUG 이거나 스태프에게만 보낸다.
+        user = getattr(request, "user", None)
+        if settings.DEBUG or (user is not None and user.is_staff):
+            response["Server-Timing"] = (
+                f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={total_ms:.1f}'
+            )
+
+        fields = (
+            f"view={name or '-'} method={request.method} status={response.status_code} "
+            f"queries={stats.count} db_ms={db_ms:.1f} total_ms={total_ms:.1f} path={request.path}"
+        )
+        budget = query_budget(name)
+        if budget is not None and stats.count > budget:
+            logger.warning("query budget exceeded budget=%s %s", budget, fields)
+        else:
+            logger.info("%s", fields)
+
+        return response
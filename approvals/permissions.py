@@ -1,27 +1,118 @@
 #approvals/permissions.py
-from .models import Document, DocumentLine
+import time
+from typing import Iterable
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+from accounts.request_cache import memoize
+
+from .models import ArchivedDocument, ArchivedDocumentViewer, Document, DocumentLine, DocumentViewer
 
 CHAIR_GROUP = "CHAIR"
 
+# 위원장 멤버십 캐시(settings.CHAIR_CACHE_TTL): 버전 키가 바뀌면 이전 항목은 자연히 무시된다.
+_CHAIR_VERSION_KEY = "chair_members:version"
+
+
+def _chair_cache_version() -> int:
+    version = cache.get(_CHAIR_VERSION_KEY)
+    if version is None:
+        # 키가 밀려나도 예전 버전 번호와 겹치지 않도록 시각 기반으로 시작
+        cache.add(_CHAIR_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(_CHAIR_VERSION_KEY)
+    return version
+
+
+def chair_cache_key(name: str) -> str:
+    return f"chair_members:{_chair_cache_version()}:{name}"
+
+
+def _bump_chair_cache_version() -> None:
+    try:
+        cache.incr(_CHAIR_VERSION_KEY)
+    except ValueError:
+        cache.set(_CHAIR_VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+
+def invalidate_chair_cache() -> None:
+    """
+    CHAIR 그룹 구성/표시 이름이 바뀌었을 때 호출 (accounts.signals, 일괄 임명/해제)
+    트랜잭션 안이면 지금 한 번, 커밋 직후(on_commit) 한 번 더 버전을 올린다.
+    커밋 전 사이에 다른 요청이 옛 소속을 다시 캐시했더라도 커밋 시점에 버려진다.
+    트랜잭션 밖이면 on_commit 이 바로 실행되므로 한 번만 올린다.
+    """
+    if transaction.get_connection().in_atomic_block:
+        _bump_chair_cache_version()
+    transaction.on_commit(_bump_chair_cache_version)
+
+
+def _query_chair_user_ids() -> frozenset[int]:
+    User = get_user_model()
+    return frozenset(User.objects.filter(groups__name=CHAIR_GROUP).values_list("id", flat=True))
+
+
+def _load_chair_user_ids() -> frozenset[int]:
+    ttl = settings.CHAIR_CACHE_TTL
+    if ttl <= 0:
+        return _query_chair_user_ids()
+    key = chair_cache_key("ids")
+    ids = cache.get(key)
+    if ids is None:
+        ids = _query_chair_user_ids()
+        cache.set(key, ids, ttl)
+    return ids
+
+
+def chair_user_ids() -> frozenset[int]:
+    """
+    CHAIR 그룹 사용자 id 집합
+    요청 단위 메모 -> 캐시(CHAIR_CACHE_TTL > 0 일 때) -> DB(auth_group join 1회) 순으로 조회한다.
+    """
+    return memoize("chair_user_ids", _load_chair_user_ids)
+
 
 def is_chair(user) -> bool:
     if not user.is_authenticated:
         return False
-    return user.is_superuser or user.groups.filter(name=CHAIR_GROUP).exists()
+    return user.is_superuser or user.id in chair_user_ids()
 
 
-def can_view_document(user, doc: Document) -> bool:
+def can_view_document(user, doc: Document | ArchivedDocument) -> bool:
     if not user.is_authenticated:
         return False
     if user.is_superuser:
         return True
     if doc.created_by_id == user.id:
         return True
-    if doc.lines.filter(user_id=user.id).exists():
-        return True
-    if doc.attachments.filter(uploaded_by_id=user.id).exists():
-        return True
-    return False
+
+    # selectors.document_detail() 스냅샷이면 열람 대상(결재 라인/첨부 업로더)을 메모리에서 판단
+    prefetched = getattr(doc, "_prefetched_objects_cache", {})
+    if "lines" in prefetched and "attachments" in prefetched:
+        return any(line.user_id == user.id for line in doc.lines.all()) or any(
+            att.uploaded_by_id == user.id for att in doc.attachments.all()
+        )
+
+    viewers = ArchivedDocumentViewer if isinstance(doc, ArchivedDocument) else DocumentViewer
+    return viewers.objects.filter(user_id=user.id, document_id=doc.id).exists()
+
+
+def viewable_document_ids(user, ids: Iterable[int]) -> set[int]:
+    """
+    ids 중 user가 열람 가능한 문서 id 집합 (DocumentViewer 인덱스 1회 조회)
+    """
+    ids = set(ids)
+    if not ids or not user.is_authenticated:
+        return set()
+    if user.is_superuser:
+        return ids
+    return set(
+        DocumentViewer.objects.filter(user_id=user.id, document_id__in=ids).values_list(
+            "document_id", flat=True
+        )
+    )
 
 
 def can_act_on_line(user, line: DocumentLine) -> bool:
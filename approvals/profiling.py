@@ -0,0 +1,250 @@
+# approvals/profiling.py
+"""
+스태프 전용 요청 프로파일러
+
+- 켜는 방법: 서명된 토큰을 쿼리 파라미터(?_profile=...) 또는 쿠키로 보낸다.
+  토큰은 /approvals/profiling/ 화면에서 발급하며 발급한 스태프 본인 요청에만 유효하다.
+- 대상 요청은 cProfile 아래에서 실행하고, 모든 SQL 의 소요 시간과 호출 위치(프로젝트 코드 기준)를 모은다.
+- 결과는 PROFILER_DIR 에 <id>.prof (pstats) 와 <id>.sql.txt 로 남고 목록 화면에서 내려받는다.
+- 운영 안전장치: 표본 비율, 분당 최대 건수, 프로세스당 동시 1건, SQL 기록 수, 보관 파일 수 상한
+"""
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+import random
+import re
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PARAM = "_profile"
+PROFILE_COOKIE = "eapproval_profile"
+_SALT = "approvals.profiling"
+
+REPORT_NAME_RE = re.compile(r"^[0-9A-Za-z_-]+\.(prof|sql\.txt)$")
+
+_active = threading.Lock()
+_recent: deque[float] = deque()
+_recent_lock = threading.Lock()
+
+
+def _setting(name: str, default):
+    return getattr(settings, name, default)
+
+
+def profiler_dir() -> Path:
+    return Path(_setting("PROFILER_DIR", settings.BASE_DIR / "logs" / "profiles"))
+
+
+# -----------------------------
+# 토큰
+# -----------------------------
+def make_token(user) -> str:
+    return signing.dumps({"u": user.pk}, salt=_SALT)
+
+
+def token_user_id(token: str) -> int | None:
+    try:
+        data = signing.loads(token, salt=_SALT, max_age=_setting("PROFILER_TOKEN_MAX_AGE", 3600))
+    except signing.BadSignature:
+        return None
+    return data.get("u") if isinstance(data, dict) else None
+
+
+def _requested(request) -> bool:
+    token = request.GET.get(PROFILE_PARAM) or request.COOKIES.get(PROFILE_COOKIE)
+    if not token:
+        return False
+    user = getattr(request, "user", None)
+    if not (user and user.is_authenticated and user.is_staff):
+        return False
+    return token_user_id(token) == user.pk
+
+
+def _admit() -> bool:
+    """
+    표본 비율과 분당 상한을 적용한다 (프로세스 단위).
+    """
+    if random.random() >= _setting("PROFILER_SAMPLE_RATE", 1.0):
+        return False
+
+    now = time.monotonic()
+    with _recent_lock:
+        while _recent and now - _recent[0] > 60:
+            _recent.popleft()
+        if len(_recent) >= _setting("PROFILER_MAX_PER_MINUTE", 10):
+            return False
+        _recent.append(now)
+    return True
+
+
+# -----------------------------
+# SQL 수집
+# -----------------------------
+@dataclass
+class SqlCapture:
+    limit: int
+    base_dir: str
+    statements: list[tuple[float, str, str]] = field(default_factory=list)
+    total: int = 0
+    total_seconds: float = 0.0
+
+    def _origin(self) -> str:
+        # 프로젝트 코드 프레임만 남긴다 (라이브러리/이 모듈 제외)
+        frames = [
+            f"{os.path.relpath(f.filename, self.base_dir)}:{f.lineno} {f.name}"
+            for f in traceback.extract_stack()[:-3]
+            if f.filename.startswith(self.base_dir)
+            and "site-packages" not in f.filename
+            and not f.filename.endswith("profiling.py")
+        ]
+        return " > ".join(frames[-4:]) or "-"
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.total += 1
+            self.total_seconds += elapsed
+            if len(self.statements) < self.limit:
+                self.statements.append((elapsed, self._origin(), sql))
+
+
+def _write_sql_report(path: Path, request, response, capture: SqlCapture, total_seconds: float) -> None:
+    match = getattr(request, "resolver_match", None)
+    lines = [
+        f"# {request.method} {request.get_full_path()}",
+        f"# view={getattr(match, 'view_name', '') or '-'} status={response.status_code} "
+        f"user={request.user.pk} at={timezone.localtime():%Y-%m-%d %H:%M:%S}",
+        f"# total {total_seconds * 1000:.1f} ms, {capture.total} queries, db {capture.total_seconds * 1000:.1f} ms",
+    ]
+    if capture.total > len(capture.statements):
+        lines.append(f"# 앞의 {len(capture.statements)}건만 기록 (PROFILER_MAX_SQL)")
+    lines.append("")
+
+    max_sql = _setting("PROFILER_MAX_SQL_CHARS", 2000)
+    for i, (elapsed, origin, sql) in enumerate(capture.statements, start=1):
+        text = sql if len(sql) <= max_sql else sql[:max_sql] + " ..."
+        lines.append(f"[{i}] {elapsed * 1000:.2f} ms  {origin}")
+        lines.append(f"    {text}")
+
+    # 같은 SQL 반복(N+1) 요약
+    counts: dict[str, list[float]] = {}
+    for elapsed, _, sql in capture.statements:
+        counts.setdefault(sql, []).append(elapsed)
+    repeated = sorted(((len(v), sum(v), k) for k, v in counts.items() if len(v) > 1), reverse=True)
+    if repeated:
+        lines += ["", "# 반복 실행된 SQL"]
+        for n, seconds, sql in repeated[:20]:
+            lines.append(f"{n}회 {seconds * 1000:.2f} ms  {sql[:200]}")
+
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _prune(directory: Path) -> None:
+    keep = _setting("PROFILER_MAX_REPORTS", 50)
+    reports = sorted(directory.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in reports[keep:]:
+        stem = old.name[: -len(".prof")]
+        for path in (old, directory / f"{stem}.sql.txt"):
+            path.unlink(missing_ok=True)
+
+
+def list_reports() -> list[dict]:
+    directory = profiler_dir()
+    if not directory.is_dir():
+        return []
+    rows = []
+    for prof in sorted(directory.glob("*.prof"), key=lambda p: p.stat().st_mtime, reverse=True):
+        stem = prof.name[: -len(".prof")]
+        sql = directory / f"{stem}.sql.txt"
+        header = ""
+        if sql.exists():
+            with sql.open(encoding="utf-8") as fh:
+                header = " ".join(fh.readline().strip("# \n") for _ in range(3))
+        rows.append(
+            {
+                "id": stem,
+                "prof": prof.name,
+                "sql": sql.name if sql.exists() else "",
+                "summary": header,
+                "created_at": datetime.fromtimestamp(prof.stat().st_mtime, tz=timezone.get_current_timezone()),
+            }
+        )
+    return rows
+
+
+def report_path(name: str) -> Path | None:
+    if not REPORT_NAME_RE.match(name or ""):
+        return None
+    path = profiler_dir() / name
+    return path if path.is_file() else None
+
+
+# -----------------------------
+# 미들웨어
+# -----------------------------
+class ProfilerMiddleware:
+    """
+    AuthenticationMiddleware 뒤에 둔다. 조건을 만족하지 않는 요청은 토큰 유무만 보고 지나간다.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not _setting("PROFILER_ENABLED", False) or not _requested(request) or not _admit():
+            return self.get_response(request)
+
+        # cProfile 은 동시에 하나만 (다른 요청이 프로파일 중이면 이번 요청은 그냥 처리)
+        if not _active.acquire(blocking=False):
+            return self.get_response(request)
+        try:
+            return self._profile(request)
+        finally:
+            _active.release()
+
+    def _profile(self, request):
+        capture = SqlCapture(limit=_setting("PROFILER_MAX_SQL", 500), base_dir=str(settings.BASE_DIR))
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(capture))
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        total = time.perf_counter() - start
+
+        report_id = f"{timezone.localtime():%Y%m%d-%H%M%S}-{request.user.pk}-{uuid.uuid4().hex[:8]}"
+        try:
+            directory = profiler_dir()
+            directory.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(str(directory / f"{report_id}.prof"))
+            _write_sql_report(directory / f"{report_id}.sql.txt", request, response, capture, total)
+            _prune(directory)
+        except OSError:
+            logger.exception("failed to store profile %s", report_id)
+            return response
+
+        response["X-Profile-Id"] = report_id
+        return response
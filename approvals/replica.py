@@ -0,0 +1,118 @@
+# approvals/replica.py
+"""
+읽기 전용 복제본(replica) 라우팅
+
+- settings.READ_REPLICA 에 DB alias 가 있을 때만 동작한다 (없으면 모든 쿼리가 default).
+- read_replica() 안(데코레이터/with)의 읽기만 replica 로 보낸다. 쓰기는 항상 default.
+  문서함 목록, CSV/ZIP 내보내기처럼 조금 늦은 데이터를 보여줘도 되는 경로에만 붙인다.
+- read-your-writes: 요청 중 쓰기가 있었으면 그 요청의 이후 읽기와, 쿠키로 REPLICA_STICKY_SECONDS 동안
+  같은 브라우저의 읽기를 default 로 보낸다. (결재 후 목록으로 돌아갔을 때 복제 지연으로 옛 상태가 보이지 않게)
+"""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+STICKY_COOKIE = "eapproval_primary"
+
+
+@dataclass
+class _RequestState:
+    sticky: bool = False
+    wrote: bool = False
+
+
+_use_replica: ContextVar[bool] = ContextVar("use_replica", default=False)
+# 요청 단위 상태. 라우터가 값을 바꾸므로 (컨텍스트가 복사돼도 보이도록) 가변 객체로 둔다.
+_request_state: ContextVar[_RequestState | None] = ContextVar("replica_request_state", default=None)
+
+
+def replica_alias() -> str:
+    return getattr(settings, "READ_REPLICA", "") or ""
+
+
+@contextmanager
+def read_replica():
+    """
+    블록(또는 데코레이트한 함수) 안의 읽기 쿼리를 replica 로 보낸다.
+    """
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def _pinned_to_primary() -> bool:
+    state = _request_state.get()
+    return state is not None and (state.sticky or state.wrote)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = replica_alias()
+        if not alias:
+            return None
+        if _use_replica.get() and not _pinned_to_primary():
+            return alias
+        # replica 에서 읽은 객체의 관계 조회가 replica 로 따라가지 않도록 명시
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS if replica_alias() else None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        alias = replica_alias()
+        if alias and {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, alias}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # 스키마는 복제(또는 sync_sqlite_replica)로 따라간다.
+        if db == replica_alias():
+            return False
+        return None
+
+
+def _sticky_until(request) -> int:
+    try:
+        return int(request.COOKIES.get(STICKY_COOKIE, "0"))
+    except ValueError:
+        return 0
+
+
+class ReplicaStickinessMiddleware:
+    """
+    SessionMiddleware 뒤에 둔다 (세션 저장은 이 미들웨어가 끝난 뒤라 쓰기로 치지 않는다).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = _RequestState(sticky=_sticky_until(request) > time.time())
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        if state.wrote and replica_alias():
+            seconds = getattr(settings, "REPLICA_STICKY_SECONDS", 10)
+            response.set_cookie(
+                STICKY_COOKIE,
+                str(int(time.time()) + seconds),
+                max_age=seconds,
+                httponly=True,
+                samesite="Lax",
+                secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
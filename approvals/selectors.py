@@ -1,7 +1,18 @@
 # approvals/selectors.py
-from django.db.models import Exists, OuterRef, Q
+from django.contrib.auth import get_user_model
+from django.db.models import BooleanField, Count, Exists, Max, OuterRef, Prefetch, Q, Sum, Value
 
-from .models import Document, DocumentLine
+from .models import (
+    ArchivedAttachment,
+    ArchivedDocument,
+    ArchivedDocumentLine,
+    ArchivedDocumentViewer,
+    Attachment,
+    Document,
+    DocumentLine,
+    DocumentViewer,
+)
+from .permissions import chair_user_ids
 
 
 def my_documents(user):
@@ -63,8 +74,16 @@ def inbox_pending(user):
         .filter(has_earlier_pending_approve=False)
     )
 
+    # 후보는 본인 미처리 라인이 있는 문서로 먼저 좁힌다 (docline_user_role_decision 인덱스).
+    # 없으면 진행중 문서 전체를 훑으며 문서마다 서브쿼리를 돌게 된다.
+    candidate_ids = DocumentLine.objects.filter(
+        user=user,
+        role__in=[DocumentLine.Role.CONSULT, DocumentLine.Role.APPROVE],
+        decision=DocumentLine.Decision.PENDING,
+    ).values("document_id")
+
     return (
-        Document.objects.filter(status=Document.Status.IN_PROGRESS)
+        Document.objects.filter(status=Document.Status.IN_PROGRESS, id__in=candidate_ids)
         .annotate(
             has_pending_consult_for_user=Exists(pending_consult_for_user),
             has_pending_approve_for_user=Exists(pending_approve_for_user),
@@ -96,19 +115,143 @@ def received_docs(user):
     )
 
 
+def unread_received_count(user) -> int:
+    """
+    수신함 미열람 건수 (user, role, decision 인덱스)
+    """
+    return _unread_receipt_lines(user).filter(document__status=Document.Status.COMPLETED).count()
+
+
 def completed_docs(user):
-    return (
-        Document.objects.filter(status=Document.Status.COMPLETED)
-        .filter(Q(created_by=user) | Q(lines__user=user))
-        .distinct()
-        .order_by("-id")
-    )
+    # 작성자/결재 라인 대상자는 DocumentViewer 에 모두 들어 있으므로 join 1회로 충분 (distinct 불필요)
+    return Document.objects.filter(status=Document.Status.COMPLETED, viewers__user=user).order_by("-id")
 
 
 def rejected_docs(user):
-    return (
-        Document.objects.filter(status=Document.Status.REJECTED)
-        .filter(Q(created_by=user) | Q(lines__user=user))
-        .distinct()
-        .order_by("-id")
-    )
\ No newline at end of file
+    return Document.objects.filter(status=Document.Status.REJECTED, viewers__user=user).order_by("-id")
+
+
+def archived_docs(user, status: str):
+    """
+    보관 테이블의 user 열람 가능 문서 (ArchivedDocumentViewer (user, document) 인덱스)
+    """
+    return ArchivedDocument.objects.filter(status=status, viewers__user=user).order_by("-id")
+
+
+def with_archived(docs, archived):
+    """
+    운영 문서 + 보관 문서 목록 키 [(id, archived), ...] 를 -id 순으로 합친 QuerySet
+    (페이지 단위로 잘라 id 로 각 테이블에서 다시 읽는다)
+    """
+    hot = docs.order_by().annotate(archived=Value(False, output_field=BooleanField())).values_list("id", "archived")
+    cold = archived.order_by().annotate(archived=Value(True, output_field=BooleanField())).values_list(
+        "id", "archived"
+    )
+    return hot.union(cold, all=True).order_by("-id")
+
+
+def _unread_receipt_lines(user):
+    return DocumentLine.objects.filter(
+        user_id=user.id,
+        role=DocumentLine.Role.RECEIVE,
+        decision=DocumentLine.Decision.PENDING,
+    )
+
+
+def document_detail(doc_id: int, user=None) -> Document | ArchivedDocument | None:
+    """
+    상세 화면용 문서 스냅샷 (쿼리 3회 고정)
+    - 문서 + 작성자 + 작성자 프로필 (+ user 의 미열람 수신 라인 여부: unread_receipt)
+    - 결재 라인 + 대상자 + 프로필 (order, id 순)
+    - 첨부파일
+    권한/진행 단계/읽음 처리는 이 스냅샷에서 추가 쿼리 없이 계산한다.
+    운영 테이블에 없으면 보관 테이블에서 찾는다 (archived_document_detail).
+    """
+    qs = Document.objects.all()
+    if user is not None and user.is_authenticated:
+        qs = qs.annotate(unread_receipt=Exists(_unread_receipt_lines(user).filter(document_id=OuterRef("pk"))))
+
+    doc = (
+        qs.select_related("created_by__profile")
+        .prefetch_related(
+            Prefetch("lines", queryset=DocumentLine.objects.select_related("user__profile").order_by("order", "id")),
+            Prefetch("attachments", queryset=Attachment.objects.order_by("id")),
+        )
+        .filter(id=doc_id)
+        .first()
+    )
+    return doc if doc is not None else archived_document_detail(doc_id)
+
+
+def archived_document_detail(doc_id: int) -> ArchivedDocument | None:
+    """
+    보관 문서 스냅샷 (document_detail 과 같은 모양, 읽기 전용이라 unread_receipt 는 항상 False)
+    """
+    doc = (
+        ArchivedDocument.objects.select_related("created_by__profile")
+        .prefetch_related(
+            Prefetch(
+                "lines",
+                queryset=ArchivedDocumentLine.objects.select_related("user__profile").order_by("order", "id"),
+            ),
+            Prefetch("attachments", queryset=ArchivedAttachment.objects.order_by("id")),
+        )
+        .filter(id=doc_id)
+        .first()
+    )
+    if doc is not None:
+        doc.unread_receipt = False
+    return doc
+
+
+def document_validators(doc_id: int, *, user) -> dict | None:
+    """
+    조건부 GET 용 문서 변경 표식 (쿼리 1회)
+    - revision / updated_at: services.touch_document() 가 모든 상태 전이에서 올린다.
+    - last_acted: 결재 라인 처리 시각 최댓값 (admin 등 서비스 밖에서 라인을 바꾼 경우 대비)
+    운영 테이블에 없으면 보관 테이블 값 (쿼리 2회)
+    user 가 열람할 수 없는 문서는 None (permissions.can_view_document 와 같은 기준).
+    304 여부나 Last-Modified 로 남의 문서 존재/변경 시각이 드러나지 않게 한다.
+    """
+    for model, viewers in ((Document, DocumentViewer), (ArchivedDocument, ArchivedDocumentViewer)):
+        qs = model.objects.filter(id=doc_id)
+        if not user.is_superuser:
+            qs = qs.filter(
+                Q(created_by_id=user.id)
+                | Exists(viewers.objects.filter(user_id=user.id, document_id=OuterRef("pk")))
+            )
+        rows = (
+            qs.values("revision", "updated_at")
+            .annotate(last_acted=Max("lines__acted_at"))
+        )
+        row = next(iter(rows), None)
+        if row is not None:
+            return row
+    return None
+
+
+def mailbox_validators(user) -> dict:
+    """
+    조건부 GET 용 사용자별 문서함 세대 값 (DocumentViewer 기준 집계 1회)
+    열람 가능한 문서가 추가/삭제되거나 그중 하나라도 바뀌면 값이 달라진다.
+    """
+    return DocumentViewer.objects.filter(user_id=user.id).aggregate(
+        count=Count("id"),
+        revisions=Sum("document__revision"),
+        last_updated=Max("document__updated_at"),
+    )
+
+
+def chair_users_by_prefix(prefix: str):
+    """
+    결재선 선택용 위원장 검색 (표시 이름/아이디 앞부분 일치)
+    Profile.display_name 인덱스를 타도록 접두어 검색만 지원한다.
+    """
+    User = get_user_model()
+    qs = User.objects.filter(is_active=True, id__in=chair_user_ids())
+
+    prefix = (prefix or "").strip()
+    if prefix:
+        qs = qs.filter(Q(profile__display_name__startswith=prefix) | Q(username__istartswith=prefix))
+
+    return qs.order_by("profile__display_name", "id")
@@ -1,10 +1,16 @@
 # approvals/services.py
 from __future__ import annotations
 
+import time
+from functools import wraps
+
 from django.db import transaction
+from django.db.models import Case, CharField, Exists, F, Min, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from .models import Attachment, Document, DocumentLine
+from .metrics import TRANSITION_SECONDS, TRANSITIONS
+from .models import Attachment, Document, DocumentLine, DocumentViewer
 from .notify import (
     notify_on_completed,
     notify_on_line_approved,
@@ -13,6 +19,35 @@ from .notify import (
 )
 
 
+def _instrumented(action: str):
+    """
+    성공한 전이의 소요 시간을 기록하고, 커밋된 전이만 건수에 반영한다 (approvals.metrics).
+    권한/검증 오류로 예외가 난 호출은 소요 시간에도 넣지 않는다.
+    상신/승인/재기안으로 바로 완료된 문서는 complete 도 함께 센다.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            doc = fn(*args, **kwargs)
+            TRANSITION_SECONDS.observe(time.perf_counter() - start, action=action)
+
+            completed = doc.status == Document.Status.COMPLETED
+
+            def count():
+                TRANSITIONS.inc(action=action)
+                if completed:
+                    TRANSITIONS.inc(action="complete")
+
+            transaction.on_commit(count)
+            return doc
+
+        return wrapper
+
+    return decorator
+
+
 def _active_roles():
     return [DocumentLine.Role.CONSULT, DocumentLine.Role.APPROVE]
 
@@ -47,6 +82,16 @@ def _current_pending_approve_line(doc: Document):
     return _pending_approve_lines(doc).first()
 
 
+def touch_document(doc: Document) -> Document:
+    """
+    문서 변경 버전(revision)과 updated_at 을 올린다.
+    doc.lines.update(...) 처럼 Document.save() 를 거치지 않는 변경 뒤에도 반드시 호출.
+    """
+    Document.objects.filter(pk=doc.pk).update(revision=F("revision") + 1, updated_at=timezone.now())
+    doc.refresh_from_db(fields=["revision", "updated_at"])
+    return doc
+
+
 def _has_active_lines(doc: Document) -> bool:
     return doc.lines.filter(role__in=_active_roles()).exists()
 
@@ -109,6 +154,176 @@ def _get_actionable_line_for_actor(doc: Document, actor):
     return None
 
 
+def _viewer_ids(doc: Document) -> set[int]:
+    ids = {doc.created_by_id}
+    ids.update(doc.lines.values_list("user_id", flat=True))
+    ids.update(doc.attachments.values_list("uploaded_by_id", flat=True))
+    return ids
+
+
+def sync_document_viewers(doc: Document) -> None:
+    """
+    문서 열람 권한 캐시(DocumentViewer)를 현재 작성자/결재 라인/첨부 업로더 기준으로 맞춘다.
+    """
+    wanted = _viewer_ids(doc)
+    existing = set(DocumentViewer.objects.filter(document=doc).values_list("user_id", flat=True))
+
+    stale = existing - wanted
+    if stale:
+        DocumentViewer.objects.filter(document=doc, user_id__in=stale).delete()
+
+    missing = wanted - existing
+    if missing:
+        DocumentViewer.objects.bulk_create(
+            [DocumentViewer(document=doc, user_id=uid) for uid in missing],
+            ignore_conflicts=True,
+        )
+
+
+def rebuild_document_viewers(*, batch_size: int = 1000) -> int:
+    """
+    전체 문서의 열람 권한 캐시를 다시 만든다. (관리자 화면 수정 등으로 어긋났을 때 복구용)
+    문서 id 구간 단위로 처리하므로 메모리 사용량은 batch_size 에 비례한다.
+    """
+    changed = 0
+    last_id = 0
+    while True:
+        chunk = list(
+            Document.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", "created_by_id")[:batch_size]
+        )
+        if not chunk:
+            return changed
+        last_id = chunk[-1][0]
+        doc_ids = [doc_id for doc_id, _ in chunk]
+
+        wanted = set(chunk)
+        wanted.update(DocumentLine.objects.filter(document_id__in=doc_ids).values_list("document_id", "user_id"))
+        wanted.update(
+            Attachment.objects.filter(document_id__in=doc_ids).values_list("document_id", "uploaded_by_id")
+        )
+        existing_rows = {
+            (doc_id, user_id): row_id
+            for row_id, doc_id, user_id in DocumentViewer.objects.filter(document_id__in=doc_ids).values_list(
+                "id", "document_id", "user_id"
+            )
+        }
+        existing = set(existing_rows)
+
+        with transaction.atomic():
+            # (document, user) 쌍 단위라 id 로 한 번에 지운다 (document_id__in x user_id__in 은 필요한 행까지 지운다)
+            stale_ids = [existing_rows[pair] for pair in existing - wanted]
+            if stale_ids:
+                DocumentViewer.objects.filter(id__in=stale_ids).delete()
+            DocumentViewer.objects.bulk_create(
+                [DocumentViewer(document_id=d, user_id=u) for d, u in wanted - existing],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+        changed += len(existing ^ wanted)
+
+
+@transaction.atomic
+def sync_documents_after_edit(doc_ids) -> None:
+    """
+    서비스 밖(관리자 화면)에서 결재 라인/첨부를 바꾼 뒤 호출: 해당 문서들의 열람 권한 캐시를 다시 맞추고
+    revision 을 올린다 (상세 화면 조각 캐시/ETag 무효화).
+    """
+    for doc in Document.objects.filter(id__in={i for i in doc_ids if i}).order_by("id"):
+        sync_document_viewers(doc)
+        touch_document(doc)
+
+
+# 결재 라인으로부터 상태가 정해지는 문서 (DRAFT/REJECTED 는 서비스가 명시적으로 정한다)
+DERIVED_STATUSES = (Document.Status.SUBMITTED, Document.Status.IN_PROGRESS, Document.Status.COMPLETED)
+
+
+def _pending_active_lines():
+    return DocumentLine.objects.filter(
+        document_id=OuterRef("pk"),
+        role__in=_active_roles(),
+        decision=DocumentLine.Decision.PENDING,
+    )
+
+
+def _expected_line_order():
+    """
+    문서별 기대 current_line_order (_recalculate_doc_status_and_order 와 같은 규칙, 상관 서브쿼리)
+    협의 대기 라인 중 가장 작은 order, 없으면 결재 대기 라인 중 가장 작은 order. 둘 다 없으면 NULL.
+    """
+
+    def first_order(role):
+        return Subquery(
+            _pending_active_lines()
+            .filter(role=role)
+            .order_by()
+            .values("document_id")
+            .annotate(first=Min("order"))
+            .values("first")[:1]
+        )
+
+    return Coalesce(first_order(DocumentLine.Role.CONSULT), first_order(DocumentLine.Role.APPROVE))
+
+
+def _expected_status():
+    return Case(
+        When(Exists(_pending_active_lines()), then=Value(Document.Status.IN_PROGRESS)),
+        default=Value(Document.Status.COMPLETED),
+        output_field=CharField(),
+    )
+
+
+def document_status_drift():
+    """
+    status / current_line_order 가 결재 라인과 어긋난 문서.
+    문서 x 대기 라인을 한 번 조인해 GROUP BY 로 협의/결재 대기 order 의 MIN 을 구하는 쿼리 하나로 계산한다.
+    완료 문서의 current_line_order 는 마지막 값을 그대로 두므로 비교하지 않는다.
+    """
+    pending = Q(lines__decision=DocumentLine.Decision.PENDING)
+    consult_order = Min("lines__order", filter=pending & Q(lines__role=DocumentLine.Role.CONSULT))
+    approve_order = Min("lines__order", filter=pending & Q(lines__role=DocumentLine.Role.APPROVE))
+    return (
+        Document.objects.filter(status__in=DERIVED_STATUSES)
+        .annotate(expected_order=Coalesce(consult_order, approve_order))
+        .annotate(
+            expected_status=Case(
+                When(expected_order__isnull=True, then=Value(Document.Status.COMPLETED)),
+                default=Value(Document.Status.IN_PROGRESS),
+                output_field=CharField(),
+            )
+        )
+        .filter(
+            ~Q(status=F("expected_status"))
+            | (Q(expected_order__isnull=False) & ~Q(current_line_order=F("expected_order")))
+        )
+        .order_by("id")
+        .values("id", "status", "current_line_order", "expected_status", "expected_order")
+    )
+
+
+def repair_document_status(doc_ids, *, batch_size: int = 1000) -> int:
+    """
+    doc_ids 문서의 status / current_line_order 를 결재 라인 기준으로 다시 맞춘다. 고친 문서 수를 반환.
+    batch_size 건마다 UPDATE 한 번 (문장 단위로 원자적. 기대값은 UPDATE 안의 서브쿼리로 그 시점에 다시 계산하므로
+    점검 후 결재가 진행된 문서도 올바른 값이 된다). 그 사이 반려/회수된 문서는 건드리지 않는다.
+    revision 을 올려 화면 조각 캐시/ETag 도 무효화한다.
+    """
+    doc_ids = list(doc_ids)
+    fixed = 0
+    for start in range(0, len(doc_ids), batch_size):
+        fixed += Document.objects.filter(
+            id__in=doc_ids[start : start + batch_size], status__in=DERIVED_STATUSES
+        ).update(
+            status=_expected_status(),
+            current_line_order=Coalesce(_expected_line_order(), F("current_line_order")),
+            revision=F("revision") + 1,
+            updated_at=timezone.now(),
+        )
+    return fixed
+
+
+@_instrumented("submit")
 @transaction.atomic
 def create_document_with_lines_and_files(
     *,
@@ -166,17 +381,21 @@ def create_document_with_lines_and_files(
     for f in files:
         Attachment.objects.create(document=doc, file=f, uploaded_by=creator)
 
+    sync_document_viewers(doc)
+
     if _has_active_lines(doc):
         _recalculate_doc_status_and_order(doc)
     else:
         doc.status = Document.Status.COMPLETED
         doc.save(update_fields=["status"])
 
+    touch_document(doc)
     notify_on_submit(request=request, doc=doc, user=creator)
 
     return doc
 
 
+@_instrumented("approve")
 @transaction.atomic
 def approve_or_consult(
     *,
@@ -198,12 +417,14 @@ def approve_or_consult(
     line.save(update_fields=["decision", "comment", "acted_at"])
 
     _recalculate_doc_status_and_order(doc)
+    touch_document(doc)
 
     notify_on_line_approved(request=request, doc=doc, user=actor)
 
     return doc
 
 
+@_instrumented("reject")
 @transaction.atomic
 def reject(
     *,
@@ -226,6 +447,7 @@ def reject(
 
     doc.status = Document.Status.REJECTED
     doc.save(update_fields=["status"])
+    touch_document(doc)
 
     notify_on_rejected(
         request=request,
@@ -237,23 +459,65 @@ def reject(
     return doc
 
 
-@transaction.atomic
 def mark_read(*, doc: Document, actor) -> Document:
-    line = doc.lines.filter(
+    """
+    수신 라인을 열람 처리한다.
+    - 미열람 수신 라인이 있는지 SELECT 로 먼저 확인한다. 이미 읽었거나 수신자가 아니면
+      트랜잭션(SQLite IMMEDIATE 쓰기 잠금)을 열지 않는다.
+    - 열람 처리 UPDATE 와 touch_document(revision 올리기)는 한 트랜잭션에서 함께 커밋한다.
+      상세 화면의 결재 라인 조각 캐시(doc.revision 키)에 열람 상태가 들어가므로 따로 남으면 안 된다.
+    - 상세 화면은 selectors.document_detail(user=...) 의 unread_receipt 로 호출 자체를 건너뛴다.
+    """
+    receipt = DocumentLine.objects.filter(
+        document_id=doc.id,
         role=DocumentLine.Role.RECEIVE,
         user_id=actor.id,
-    ).first()
-    if not line:
+        decision=DocumentLine.Decision.PENDING,
+    )
+    if not receipt.exists():
         return doc
 
-    if line.decision == DocumentLine.Decision.PENDING:
-        line.decision = DocumentLine.Decision.READ
-        line.acted_at = timezone.now()
-        line.save(update_fields=["decision", "acted_at"])
-
+    now = timezone.now()
+    with transaction.atomic():
+        if not receipt.update(decision=DocumentLine.Decision.READ, acted_at=now):
+            return doc
+        touch_document(doc)
+
+    # prefetch 된 스냅샷도 맞춰 두어 같은 요청의 화면에 바로 반영
+    if "lines" in getattr(doc, "_prefetched_objects_cache", {}):
+        for line in doc.lines.all():
+            if (
+                line.role == DocumentLine.Role.RECEIVE
+                and line.user_id == actor.id
+                and line.decision == DocumentLine.Decision.PENDING
+            ):
+                line.decision = DocumentLine.Decision.READ
+                line.acted_at = now
+    doc.unread_receipt = False
     return doc
 
 
+@transaction.atomic
+def mark_all_received_read(*, actor) -> int:
+    """
+    완료 문서의 미열람 수신 라인을 모두 열람 처리하고 처리 건수를 반환한다.
+    - 문서 변경 버전 올리기 UPDATE 1회 + 라인 열람 처리 UPDATE 1회 (건수와 무관)
+    """
+    pending = DocumentLine.objects.filter(
+        user_id=actor.id,
+        role=DocumentLine.Role.RECEIVE,
+        decision=DocumentLine.Decision.PENDING,
+        document__status=Document.Status.COMPLETED,
+    )
+
+    now = timezone.now()
+    Document.objects.filter(Exists(pending.filter(document_id=OuterRef("pk")))).update(
+        revision=F("revision") + 1,
+        updated_at=now,
+    )
+    return pending.update(decision=DocumentLine.Decision.READ, acted_at=now)
+
+
 def _replace_lines(*, doc: Document, consultants, approvers, receivers) -> None:
     doc.lines.all().delete()
 
@@ -319,6 +583,9 @@ def update_draft_document(
     for f in files:
         Attachment.objects.create(document=doc, file=f, uploaded_by=actor)
 
+    sync_document_viewers(doc)
+    touch_document(doc)
+
     return doc
 
 
@@ -336,9 +603,12 @@ def delete_draft_attachment(*, doc: Document, actor, attachment_id: int) -> bool
 
     att.file.delete(save=False)
     att.delete()
+    sync_document_viewers(doc)
+    touch_document(doc)
     return True
 
 
+@_instrumented("withdraw")
 @transaction.atomic
 def withdraw_document(*, doc: Document, actor) -> Document:
     if doc.created_by_id != actor.id and not actor.is_superuser:
@@ -359,9 +629,11 @@ def withdraw_document(*, doc: Document, actor) -> Document:
     doc.status = Document.Status.DRAFT
     doc.current_line_order = 1
     doc.save(update_fields=["status", "current_line_order"])
+    touch_document(doc)
     return doc
 
 
+@_instrumented("redraft")
 @transaction.atomic
 def redraft_document(*, doc: Document, actor, request=None) -> Document:
     if doc.created_by_id != actor.id and not actor.is_superuser:
@@ -385,5 +657,6 @@ def redraft_document(*, doc: Document, actor, request=None) -> Document:
         doc.status = Document.Status.COMPLETED
         doc.save(update_fields=["status"])
 
+    touch_document(doc)
     notify_on_submit(request=request, doc=doc, user=actor)
     return doc
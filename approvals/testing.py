@@ -0,0 +1,52 @@
+# approvals/testing.py
+from __future__ import annotations
+
+import logging
+
+from django.test.runner import DiscoverRunner
+
+from .perf import query_budget
+
+
+class QueryBudgetTestMixin:
+    """
+    TestCase 용: PerfMiddleware 가 남긴 request.perf_stats 로
+    뷰가 VIEW_QUERY_BUDGETS 안에서 끝났는지 검사한다.
+    """
+
+    def assertWithinQueryBudget(self, response, budget: int | None = None):
+        stats = getattr(response.wsgi_request, "perf_stats", None)
+        self.assertIsNotNone(stats, "PerfMiddleware 측정값이 없습니다. (PERF_INSTRUMENTATION 확인)")
+
+        limit = budget if budget is not None else query_budget(stats["view"])
+        self.assertIsNotNone(limit, f"{stats['view'] or response.wsgi_request.path} 에 쿼리 예산이 없습니다.")
+        self.assertLessEqual(
+            stats["queries"],
+            limit,
+            f"{stats['view']}: 쿼리 {stats['queries']}개 (예산 {limit}개)",
+        )
+        return stats
+
+
+class PerfQuietTestRunner(DiscoverRunner):
+    """
+    manage.py test 용 (settings.TEST_RUNNER): 테스트 요청의 approvals.perf 로그가
+    logs/mysite.log 와 콘솔로 나가지 않게 핸들러를 떼어 둔다.
+    측정(request.perf_stats)과 assertLogs 는 그대로 동작한다.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        logger = logging.getLogger("approvals.perf")
+        self._perf_handlers = logger.handlers[:]
+        for handler in self._perf_handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(logging.NullHandler())
+
+    def teardown_test_environment(self, **kwargs):
+        logger = logging.getLogger("approvals.perf")
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+        for handler in self._perf_handlers:
+            logger.addHandler(handler)
+        super().teardown_test_environment(**kwargs)
@@ -1,17 +1,69 @@
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+import zipfile
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.cache.backends.base import CacheKeyWarning
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.core.management import call_command
+from django.db import connection
+from django.db.utils import ConnectionDoesNotExist
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
-from .models import Attachment, Document, DocumentLine
-from .permissions import CHAIR_GROUP
+from .archive import archive_documents, months_ago
+from .benchmark import dataset_counts
+from .concurrency import summarize as summarize_concurrency
+from .dataset import generate_dataset
+from .forms import DocumentForm
+from . import admin as approvals_admin, metrics, profiling, replica, views as approvals_views
+from .jobs import claim_next_job, cleanup_expired_jobs, process_pending_jobs, run_job
+from .idempotency import cleanup_expired_keys
+from .models import (
+    ArchivedAttachment,
+    ArchivedDocument,
+    ArchivedDocumentLine,
+    ArchivedDocumentViewer,
+    Attachment,
+    Document,
+    DocumentLine,
+    DocumentViewer,
+    ExportJob,
+    IdempotencyKey,
+)
+from .permissions import CHAIR_GROUP, can_view_document, is_chair, viewable_document_ids
+from .perf import query_budget
+from .replica import ReplicaRouter, read_replica
+from .selectors import inbox_pending
 from .services import (
+    approve_or_consult,
+    create_document_with_lines_and_files,
     delete_draft_attachment,
+    document_status_drift,
+    mark_all_received_read,
+    mark_read,
+    rebuild_document_viewers,
     redraft_document,
+    repair_document_status,
+    reject,
     update_draft_document,
     withdraw_document,
 )
+from .testing import QueryBudgetTestMixin
 
 User = get_user_model()
 
@@ -222,3 +274,1482 @@ class DocRedraftViewActionFallbackTests(TestCase):
         self.assertEqual(res.status_code, 302)
         doc.refresh_from_db()
         self.assertEqual(doc.status, Document.Status.IN_PROGRESS)
+
+
+class ExportJobTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.creator = User.objects.create_user(username="exporter", password="pw1234")
+        self.other = User.objects.create_user(username="stranger", password="pw1234")
+        self.doc = Document.objects.create(
+            title="내보내기 문서",
+            content="내용",
+            created_by=self.creator,
+            status=Document.Status.COMPLETED,
+        )
+
+    def test_csv_export_is_queued_and_processed_by_worker(self):
+        self.client.login(username="exporter", password="pw1234")
+        res = self.client.get(reverse("approvals:export_docs_csv", args=["my"]))
+
+        job = ExportJob.objects.get()
+        self.assertRedirects(res, reverse("approvals:export_job", args=[job.id]))
+        self.assertEqual(job.status, ExportJob.Status.PENDING)
+
+        self.assertEqual(process_pending_jobs(), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.DONE)
+        self.assertIsNotNone(job.expires_at)
+
+        status = self.client.get(reverse("approvals:export_job_status", args=[job.id])).json()
+        self.assertEqual(status["status"], ExportJob.Status.DONE)
+        self.assertTrue(status["download_url"])
+
+        res = self.client.get(status["download_url"])
+        body = b"".join(res.streaming_content).decode("utf-8-sig")
+        self.assertIn("내보내기 문서", body)
+
+    def test_job_is_private_to_requester(self):
+        job = ExportJob.objects.create(
+            kind=ExportJob.Kind.DOCS_CSV, requested_by=self.creator, params={"kind": "my"}
+        )
+        self.client.login(username="stranger", password="pw1234")
+        res = self.client.get(reverse("approvals:export_job_status", args=[job.id]))
+        self.assertEqual(res.status_code, 404)
+
+    def test_zip_without_files_fails_cleanly(self):
+        job = ExportJob.objects.create(
+            kind=ExportJob.Kind.DOCS_ZIP,
+            requested_by=self.creator,
+            params={"document_ids": [self.doc.id]},
+        )
+        process_pending_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.FAILED)
+
+    def test_cleanup_removes_expired_artifacts(self):
+        Attachment.objects.create(
+            document=self.doc,
+            file=SimpleUploadedFile("a.txt", b"a"),
+            uploaded_by=self.creator,
+        )
+        job = ExportJob.objects.create(
+            kind=ExportJob.Kind.DOCS_ZIP,
+            requested_by=self.creator,
+            params={"document_ids": [self.doc.id]},
+        )
+        process_pending_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.DONE)
+        storage, name = job.file.storage, job.file.name
+        self.assertTrue(storage.exists(name))
+
+        removed = cleanup_expired_jobs(now=job.expires_at + timedelta(seconds=1))
+
+        self.assertEqual(removed, 1)
+        self.assertFalse(ExportJob.objects.filter(id=job.id).exists())
+        self.assertFalse(storage.exists(name))
+
+    def test_cleanup_fails_stale_running_jobs(self):
+        job = ExportJob.objects.create(
+            kind=ExportJob.Kind.DOCS_CSV,
+            requested_by=self.creator,
+            status=ExportJob.Status.RUNNING,
+            started_at=timezone.now() - timedelta(hours=2),
+        )
+        cleanup_expired_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.FAILED)
+
+    def test_reaped_job_is_not_overwritten_by_late_worker(self):
+        ExportJob.objects.create(
+            kind=ExportJob.Kind.DOCS_CSV, requested_by=self.creator, params={"kind": "my"}
+        )
+        job = claim_next_job()
+        # 워커가 처리하는 사이 정리 작업이 시간 초과로 FAILED 처리
+        cleanup_expired_jobs(now=job.started_at + timedelta(hours=2))
+
+        run_job(job)
+
+        self.assertEqual(job.status, ExportJob.Status.FAILED)
+        self.assertEqual(job.error, "작업 시간이 초과되었습니다.")
+        self.assertFalse(job.file)
+        self.assertEqual([name for _, _, files in os.walk(self.media_root) for name in files], [])
+
+
+class DocumentNdjsonTests(TestCase):
+    def setUp(self):
+        self.creator = User.objects.create_user(username="nd_creator", password="pw1234")
+        self.approver = User.objects.create_user(username="nd_approver", password="pw1234")
+        self.doc = Document.objects.create(
+            title="백업 문서",
+            content="내용",
+            created_by=self.creator,
+            status=Document.Status.COMPLETED,
+        )
+        DocumentLine.objects.create(
+            document=self.doc,
+            role=DocumentLine.Role.APPROVE,
+            order=1,
+            user=self.approver,
+            decision=DocumentLine.Decision.APPROVED,
+            comment="ok",
+            acted_at=timezone.now(),
+        )
+        Attachment.objects.create(document=self.doc, file="attachments/2026/01/a.txt", uploaded_by=self.creator)
+        Document.objects.filter(id=self.doc.id).update(created_at=timezone.now() - timedelta(days=400))
+
+    def _export(self) -> str:
+        out = io.StringIO()
+        call_command("export_documents_ndjson", stdout=out, stderr=io.StringIO())
+        return out.getvalue()
+
+    def test_export_writes_one_document_per_line(self):
+        rows = [json.loads(line) for line in self._export().splitlines()]
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["created_by"], "nd_creator")
+        self.assertEqual(rows[0]["lines"][0]["user"], "nd_approver")
+        self.assertEqual(rows[0]["attachments"][0]["file"], "attachments/2026/01/a.txt")
+
+    def test_import_round_trip_remaps_ids_and_keeps_timestamps(self):
+        dump = self._export()
+        original_created_at = Document.objects.get(id=self.doc.id).created_at
+
+        fd, path = tempfile.mkstemp(suffix=".ndjson")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(dump)
+        self.addCleanup(os.remove, path)
+
+        call_command("import_documents_ndjson", path, batch_size=1, stdout=io.StringIO())
+
+        imported = Document.objects.exclude(id=self.doc.id).get()
+        self.assertEqual(imported.title, "백업 문서")
+        self.assertEqual(imported.created_at, original_created_at)
+        line = imported.lines.get()
+        self.assertEqual(line.user_id, self.approver.id)
+        self.assertEqual(line.decision, DocumentLine.Decision.APPROVED)
+        self.assertEqual(imported.attachments.get().file.name, "attachments/2026/01/a.txt")
+
+
+class DocumentViewerTests(TestCase):
+    def setUp(self):
+        self.creator = User.objects.create_user(username="acl_creator", password="pw1234")
+        self.approver = User.objects.create_user(username="acl_approver", password="pw1234")
+        self.receiver = User.objects.create_user(username="acl_receiver", password="pw1234")
+        self.other = User.objects.create_user(username="acl_other", password="pw1234")
+
+    def _create(self):
+        return create_document_with_lines_and_files(
+            creator=self.creator,
+            title="권한 문서",
+            content="내용",
+            consultants=[],
+            approvers=[self.approver],
+            receivers=[self.receiver],
+            files=[],
+        )
+
+    def test_service_maintains_viewer_rows(self):
+        doc = self._create()
+
+        viewers = set(DocumentViewer.objects.filter(document=doc).values_list("user_id", flat=True))
+        self.assertEqual(viewers, {self.creator.id, self.approver.id, self.receiver.id})
+
+        doc.status = Document.Status.DRAFT
+        doc.save(update_fields=["status"])
+        update_draft_document(
+            doc=doc,
+            actor=self.creator,
+            title="권한 문서",
+            content="내용",
+            consultants=[],
+            approvers=[self.approver],
+            receivers=[],
+            files=[],
+        )
+        self.assertFalse(can_view_document(self.receiver, doc))
+
+    def test_can_view_document_is_single_probe(self):
+        doc = self._create()
+
+        with self.assertNumQueries(1):
+            self.assertTrue(can_view_document(self.approver, doc))
+        with self.assertNumQueries(1):
+            self.assertFalse(can_view_document(self.other, doc))
+
+    def test_viewable_document_ids_filters_batch(self):
+        mine = self._create()
+        foreign = Document.objects.create(title="남의 문서", created_by=self.other)
+
+        with self.assertNumQueries(1):
+            ids = viewable_document_ids(self.approver, [mine.id, foreign.id])
+        self.assertEqual(ids, {mine.id})
+
+    def test_rebuild_restores_drifted_rows(self):
+        doc = self._create()
+        DocumentViewer.objects.filter(document=doc, user=self.receiver).delete()
+        DocumentViewer.objects.create(document=doc, user=self.other)
+
+        rebuild_document_viewers(batch_size=1)
+
+        viewers = set(DocumentViewer.objects.filter(document=doc).values_list("user_id", flat=True))
+        self.assertEqual(viewers, {self.creator.id, self.approver.id, self.receiver.id})
+
+    def test_rebuild_deletes_only_stale_pairs(self):
+        first, second = self._create(), self._create()
+        # (first, other) 와 (second, receiver) 만 어긋남. (first, receiver) 는 그대로 남아야 한다.
+        DocumentViewer.objects.create(document=first, user=self.other)
+        second.lines.filter(user=self.receiver).delete()
+
+        with CaptureQueriesContext(connection) as ctx:
+            rebuild_document_viewers()
+        self.assertEqual(sum(q["sql"].startswith("DELETE") for q in ctx.captured_queries), 1)
+
+        self.assertEqual(
+            set(DocumentViewer.objects.filter(document=first).values_list("user_id", flat=True)),
+            {self.creator.id, self.approver.id, self.receiver.id},
+        )
+        self.assertEqual(
+            set(DocumentViewer.objects.filter(document=second).values_list("user_id", flat=True)),
+            {self.creator.id, self.approver.id},
+        )
+
+    def test_admin_line_edits_sync_viewers(self):
+        doc = self._create()
+        line = doc.lines.get(user=self.receiver)
+        self.client.force_login(User.objects.create_superuser(username="acl_admin", password="pw1234"))
+
+        res = self.client.post(
+            reverse("admin:approvals_documentline_change", args=[line.id]),
+            {
+                "document": doc.id,
+                "role": line.role,
+                "order": line.order,
+                "user": self.other.id,
+                "decision": line.decision,
+                "comment": "",
+                "acted_at_0": "",
+                "acted_at_1": "",
+            },
+        )
+        self.assertEqual(res.status_code, 302)
+        self.assertTrue(can_view_document(self.other, doc))
+        self.assertFalse(can_view_document(self.receiver, doc))
+
+        self.client.post(reverse("admin:approvals_documentline_delete", args=[line.id]), {"post": "yes"})
+        self.assertFalse(can_view_document(self.other, doc))
+
+
+    def test_admin_author_change_syncs_viewers(self):
+        doc = self._create()
+        self.client.force_login(User.objects.create_superuser(username="acl_admin", password="pw1234"))
+
+        res = self.client.post(
+            reverse("admin:approvals_document_change", args=[doc.id]),
+            {
+                "title": doc.title,
+                "content": doc.content,
+                "created_by": self.other.id,
+                "status": doc.status,
+                "current_line_order": doc.current_line_order,
+                "revision": doc.revision,
+            },
+        )
+        self.assertEqual(res.status_code, 302)
+        doc.refresh_from_db()
+        self.assertTrue(can_view_document(self.other, doc))
+        self.assertFalse(can_view_document(self.creator, doc))
+        self.assertFalse(DocumentViewer.objects.filter(document=doc, user=self.creator).exists())
+
+
+class DocumentStatusRepairTests(TestCase):
+    def setUp(self):
+        self.creator = User.objects.create_user(username="fix_creator", password="pw1234")
+        self.consultant = User.objects.create_user(username="fix_consultant", password="pw1234")
+        self.approver1 = User.objects.create_user(username="fix_approver1", password="pw1234")
+        self.approver2 = User.objects.create_user(username="fix_approver2", password="pw1234")
+
+    def _create(self, consultants=()):
+        return create_document_with_lines_and_files(
+            creator=self.creator,
+            title="점검 문서",
+            content="내용",
+            consultants=list(consultants),
+            approvers=[self.approver1, self.approver2],
+            receivers=[],
+            files=[],
+        )
+
+    def test_service_made_documents_have_no_drift(self):
+        self._create(consultants=[self.consultant])
+        doc = self._create()
+        approve_or_consult(doc=doc, actor=self.approver1)
+        approve_or_consult(doc=doc, actor=self.approver2)
+        reject(doc=self._create(), actor=self.approver1, comment="반려")
+
+        with self.assertNumQueries(1):
+            self.assertEqual(list(document_status_drift()), [])
+
+    def test_repair_recomputes_status_and_order(self):
+        consulting = self._create(consultants=[self.consultant])
+        approving = self._create()
+        done = self._create()
+        done.lines.update(decision=DocumentLine.Decision.APPROVED)
+        rejected = self._create()
+        Document.objects.filter(pk=consulting.pk).update(current_line_order=3)
+        Document.objects.filter(pk=approving.pk).update(status=Document.Status.COMPLETED)
+        Document.objects.filter(pk=rejected.pk).update(status=Document.Status.REJECTED, current_line_order=9)
+
+        drift = {row["id"]: row for row in document_status_drift()}
+        self.assertEqual(set(drift), {consulting.id, approving.id, done.id})
+        self.assertEqual(drift[consulting.id]["expected_order"], 1)
+        self.assertEqual(drift[approving.id]["expected_status"], Document.Status.IN_PROGRESS)
+        self.assertEqual(drift[done.id]["expected_status"], Document.Status.COMPLETED)
+
+        revision = Document.objects.get(pk=approving.pk).revision
+        with self.assertNumQueries(2):  # 배치당 UPDATE 한 번
+            self.assertEqual(repair_document_status(list(drift), batch_size=2), 3)
+
+        self.assertEqual(list(document_status_drift()), [])
+        approving.refresh_from_db()
+        self.assertEqual(
+            (approving.status, approving.current_line_order, approving.revision),
+            (Document.Status.IN_PROGRESS, approving.lines.get(user=self.approver1).order, revision + 1),
+        )
+        rejected.refresh_from_db()
+        self.assertEqual((rejected.status, rejected.current_line_order), (Document.Status.REJECTED, 9))
+
+    def test_command_reports_and_fixes(self):
+        doc = self._create()
+        Document.objects.filter(pk=doc.pk).update(status=Document.Status.COMPLETED)
+
+        out = io.StringIO()
+        call_command("repair_document_status", stdout=out)
+        self.assertIn("IN_PROGRESS", out.getvalue())
+        doc.refresh_from_db()
+        self.assertEqual(doc.status, Document.Status.COMPLETED)
+
+        out = io.StringIO()
+        call_command("repair_document_status", "--fix", stdout=out)
+        self.assertIn("1건", out.getvalue())
+        doc.refresh_from_db()
+        self.assertEqual(doc.status, Document.Status.IN_PROGRESS)
+
+
+class DocumentDetailLoaderTests(TestCase):
+    def setUp(self):
+        self.creator = User.objects.create_user(username="dl_creator", password="pw1234")
+        self.users = [User.objects.create_user(username=f"dl_user{i}", password="pw1234") for i in range(6)]
+        self.client.force_login(self.creator)
+
+    def _create(self, n: int):
+        return create_document_with_lines_and_files(
+            creator=self.creator,
+            title="상세 문서",
+            content="내용",
+            consultants=[],
+            approvers=self.users[:n],
+            receivers=[],
+            files=[],
+        )
+
+    def _count_queries(self, doc) -> int:
+        url = reverse("approvals:doc_detail", args=[doc.id])
+        self.client.get(url)  # 세션/멤버십 캐시 예열
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_depend_on_line_count(self):
+        self.assertEqual(self._count_queries(self._create(1)), self._count_queries(self._create(6)))
+
+    def test_snapshot_drives_stage_and_permissions(self):
+        doc = self._create(2)
+        self.client.force_login(self.users[0])
+        res = self.client.get(reverse("approvals:doc_detail", args=[doc.id]))
+        self.assertTrue(res.context["can_act"])
+        self.assertEqual(res.context["current_line"].user_id, self.users[0].id)
+
+        self.client.force_login(self.users[5])
+        res = self.client.get(reverse("approvals:doc_detail", args=[doc.id]))
+        self.assertEqual(res.status_code, 404)
+
+
+class MailboxPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = User.objects.create_user(username="pg_creator", password="pw1234")
+        self.approver = User.objects.create_user(username="pg_approver", password="pw1234")
+        self.docs = [
+            create_document_with_lines_and_files(
+                creator=self.creator,
+                title=f"페이지 {i}",
+                content="",
+                consultants=[],
+                approvers=[self.approver],
+                receivers=[],
+                files=[],
+            )
+            for i in range(5)
+        ]
+        patcher = mock.patch.object(approvals_views, "MAILBOX_PAGE_SIZE", 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client.force_login(self.creator)
+
+    def _ids(self, res):
+        return [d.id for d in res.context["docs"]]
+
+    def test_pages_are_split_newest_first(self):
+        url = reverse("approvals:doc_list")
+        newest_first = [d.id for d in reversed(self.docs)]
+
+        res = self.client.get(url)
+        self.assertEqual(self._ids(res), newest_first[:2])
+        self.assertEqual(res.context["page_obj"].paginator.num_pages, 3)
+        self.assertContains(res, 'href="?page=2"')
+        self.assertNotContains(res, "이전")
+
+        res = self.client.get(url, {"page": 3})
+        self.assertEqual(self._ids(res), newest_first[4:])
+        self.assertContains(res, 'href="?page=2"')
+        self.assertNotContains(res, "다음")
+
+        # 잘못된 값은 첫 페이지, 범위를 넘으면 마지막 페이지
+        self.assertEqual(self._ids(self.client.get(url, {"page": "abc"})), newest_first[:2])
+        self.assertEqual(self._ids(self.client.get(url, {"page": 99})), newest_first[4:])
+
+    def test_inbox_etag_and_single_page(self):
+        self.client.force_login(self.approver)
+        res = self.client.get(reverse("approvals:inbox"))
+        self.assertEqual(len(res.context["docs"]), 2)
+
+        self.client.force_login(self.creator)
+        url = reverse("approvals:doc_list")
+        self.assertNotEqual(self.client.get(url)["ETag"], self.client.get(url, {"page": 2})["ETag"])
+
+        with mock.patch.object(approvals_views, "MAILBOX_PAGE_SIZE", 10):
+            res = self.client.get(url)
+        self.assertEqual(len(res.context["docs"]), 5)
+        self.assertNotContains(res, "?page=")
+
+
+class DocumentFragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = User.objects.create_user(username="fc_creator", password="pw1234")
+        self.approvers = [User.objects.create_user(username=f"fc_approver{i}", password="pw1234") for i in range(2)]
+        self.doc = create_document_with_lines_and_files(
+            creator=self.creator,
+            title="조각 캐시",
+            content="내용",
+            consultants=[],
+            approvers=self.approvers,
+            receivers=[],
+            files=[],
+        )
+        self.client.force_login(self.creator)
+
+    def test_transitions_bump_revision(self):
+        revision = self.doc.revision
+        approve_or_consult(doc=self.doc, actor=self.approvers[0])
+        self.assertGreater(self.doc.revision, revision)
+
+        revision = self.doc.revision
+        withdraw_document(doc=self.doc, actor=self.creator)
+        self.assertEqual(Document.objects.get(id=self.doc.id).revision, revision + 1)
+
+    def test_cached_rows_follow_revision(self):
+        url = reverse("approvals:doc_list")
+        self.assertContains(self.client.get(url), "1번째 결재 진행 중")
+
+        # 진행 상태는 목록 쿼리의 서브쿼리로 함께 읽으므로 행마다 결재 라인을 따로 조회하지 않는다.
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        self.assertFalse(any('FROM "approvals_documentline" WHERE' in q["sql"] for q in ctx.captured_queries))
+
+        approve_or_consult(doc=self.doc, actor=self.approvers[0])
+        self.assertContains(self.client.get(url), "2번째 결재 진행 중")
+
+        res = self.client.get(reverse("approvals:doc_detail", args=[self.doc.id]))
+        self.assertContains(res, "현재 진행중")
+
+    def test_cached_rows_follow_creator_name(self):
+        # 작성자 본인 화면은 상단 사용자 이름에도 이름이 나오므로 결재자의 결재함으로 확인한다.
+        self.client.force_login(self.approvers[0])
+        url = reverse("approvals:inbox")
+        self.assertContains(self.client.get(url), "fc_creator")
+
+        # 이름 변경은 revision 을 올리지 않지만 행 조각 키에 표시 이름이 들어가 다시 렌더링된다.
+        profile = self.creator.profile
+        profile.full_name = "새작성자"
+        profile.save()
+        revision = Document.objects.get(id=self.doc.id).revision
+        res = self.client.get(url)
+        self.assertContains(res, "새작성자")
+        self.assertEqual(Document.objects.get(id=self.doc.id).revision, revision)
+
+    def test_detail_fragment_follows_admin_edits_and_names(self):
+        url = reverse("approvals:doc_detail", args=[self.doc.id])
+        self.assertContains(self.client.get(url), "대기")
+
+        # 관리자 화면에서 라인을 고치면 revision 이 올라 조각이 다시 렌더링된다.
+        line = self.doc.lines.get(user=self.approvers[1])
+        admin_user = User.objects.create_superuser(username="fc_admin", password="pw1234")
+        self.client.force_login(admin_user)
+        self.client.post(
+            reverse("admin:approvals_documentline_change", args=[line.id]),
+            {
+                "document": self.doc.id,
+                "role": line.role,
+                "order": line.order,
+                "user": line.user_id,
+                "decision": DocumentLine.Decision.APPROVED,
+                "comment": "관리자 수정",
+                "acted_at_0": "",
+                "acted_at_1": "",
+            },
+        )
+        self.client.force_login(self.creator)
+        self.assertContains(self.client.get(url), "관리자 수정")
+
+        # 표시 이름 변경은 revision 과 무관하게 반영
+        profile = self.approvers[0].profile
+        profile.full_name = "새이름"
+        profile.save()
+        self.assertContains(self.client.get(url), "새이름")
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = User.objects.create_user(username="cg_creator", password="pw1234")
+        self.approver = User.objects.create_user(username="cg_approver", password="pw1234")
+        self.doc = create_document_with_lines_and_files(
+            creator=self.creator,
+            title="조건부 GET",
+            content="내용",
+            consultants=[],
+            approvers=[self.approver],
+            receivers=[],
+            files=[],
+        )
+        self.client.force_login(self.creator)
+
+    def _revalidate(self, url):
+        self.client.get(url)  # 첫 방문에서 CSRF 쿠키가 발급되면 ETag 가 한 번 바뀐다.
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("private", first["Cache-Control"])
+        return self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]), first["ETag"]
+
+    def test_detail_returns_304_until_document_changes(self):
+        url = reverse("approvals:doc_detail", args=[self.doc.id])
+        res, etag = self._revalidate(url)
+        self.assertEqual(res.status_code, 304)
+
+        # withdraw 는 lines.update() 로 라인을 되돌리지만 revision 이 올라가 검증값이 바뀐다.
+        withdraw_document(doc=self.doc, actor=self.creator)
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+
+    def test_detail_validators_hidden_from_non_viewers(self):
+        url = reverse("approvals:doc_detail", args=[self.doc.id])
+        outsider = User.objects.create_user(username="cg_outsider", password="pw1234")
+        self.client.force_login(outsider)
+
+        # 미래 시각 If-Modified-Since 로 문서 존재/변경 시각을 떠볼 수 없어야 한다.
+        res = self.client.get(url, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT")
+        self.assertEqual(res.status_code, 404)
+        self.assertFalse(res.has_header("Last-Modified"))
+        self.assertFalse(res.has_header("ETag"))
+        res = self.client.get(url, HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(res.status_code, 404)
+
+    def test_mailbox_returns_304_and_skips_selectors(self):
+        url = reverse("approvals:inbox")
+        res, etag = self._revalidate(url)
+        self.assertEqual(res.status_code, 304)
+
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+        self.assertFalse(any("approvals_documentline" in q["sql"] for q in ctx.captured_queries))
+
+        approve_or_consult(doc=self.doc, actor=self.approver)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_pending_messages_bypass_304(self):
+        url = reverse("approvals:doc_list")
+        res, etag = self._revalidate(url)
+        self.assertEqual(res.status_code, 304)
+
+        # 문서는 그대로 두고 messages 만 남기는 요청 (진행 중 문서는 재기안 불가 안내)
+        self.client.get(reverse("approvals:doc_redraft", args=[self.doc.id]))
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertContains(res, "임시 저장 문서만")
+
+
+class ReadReceiptTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = User.objects.create_user(username="rr_creator", password="pw1234")
+        self.receiver = User.objects.create_user(username="rr_receiver", password="pw1234")
+        self.docs = [
+            create_document_with_lines_and_files(
+                creator=self.creator,
+                title=f"수신 {i}",
+                content="내용",
+                consultants=[],
+                approvers=[],
+                receivers=[self.receiver],
+                files=[],
+            )
+            for i in range(3)
+        ]
+
+    def _receipt(self, doc):
+        return DocumentLine.objects.get(document=doc, role=DocumentLine.Role.RECEIVE)
+
+    def test_detail_marks_read_once_and_skips_writes_afterwards(self):
+        doc = self.docs[0]
+        url = reverse("approvals:doc_detail", args=[doc.id])
+
+        self.client.force_login(self.receiver)
+        res = self.client.get(url)
+        self.assertContains(res, "열람")
+        self.assertEqual(self._receipt(doc).decision, DocumentLine.Decision.READ)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        self.assertFalse(any(q["sql"].startswith("UPDATE") for q in ctx.captured_queries))
+
+        self.client.force_login(self.creator)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        self.assertFalse(any(q["sql"].startswith(("UPDATE", "SAVEPOINT")) for q in ctx.captured_queries))
+
+    def test_mark_read_opens_transaction_only_when_changed(self):
+        doc = self.docs[1]
+        with CaptureQueriesContext(connection) as ctx:
+            mark_read(doc=doc, actor=self.receiver)
+        self.assertTrue(any(q["sql"].startswith("SAVEPOINT") for q in ctx.captured_queries))
+
+        with CaptureQueriesContext(connection) as ctx:
+            mark_read(doc=doc, actor=self.receiver)
+            mark_read(doc=doc, actor=self.creator)
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertFalse(any(q["sql"].startswith(("SAVEPOINT", "UPDATE")) for q in ctx.captured_queries))
+
+    def test_receipt_write_is_committed_with_revision(self):
+        doc = self.docs[1]
+        with mock.patch("approvals.services.touch_document", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                mark_read(doc=doc, actor=self.receiver)
+        self.assertEqual(self._receipt(doc).decision, DocumentLine.Decision.PENDING)
+
+        # 조각 캐시가 있는 상세 화면도 일괄 열람 처리 후 바로 "열람" 으로 바뀐다.
+        url = reverse("approvals:doc_detail", args=[doc.id])
+        self.client.force_login(self.creator)
+        self.assertContains(self.client.get(url), '<span class="badge">대기</span>')
+        mark_all_received_read(actor=self.receiver)
+        self.assertContains(self.client.get(url), '<span class="badge">열람</span>')
+
+    def test_mark_all_read_and_unread_count(self):
+        self.client.force_login(self.receiver)
+        res = self.client.get(reverse("approvals:received"))
+        self.assertEqual(res.context["unread_count"], 3)
+
+        revisions = {d.id: d.revision for d in self.docs}
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(mark_all_received_read(actor=self.receiver), 3)
+        self.assertEqual(len([q for q in ctx.captured_queries if q["sql"].startswith(("UPDATE", "SELECT"))]), 2)
+
+        self.assertFalse(
+            DocumentLine.objects.filter(user=self.receiver, decision=DocumentLine.Decision.PENDING).exists()
+        )
+        for doc in Document.objects.filter(id__in=revisions):
+            self.assertEqual(doc.revision, revisions[doc.id] + 1)
+
+        res = self.client.post(reverse("approvals:received_mark_all_read"), follow=True)
+        self.assertEqual(res.context["unread_count"], 0)
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        chair_group, _ = Group.objects.get_or_create(name=CHAIR_GROUP)
+        self.creator = User.objects.create_user(username="idem_creator", password="pw1234")
+        self.approver = User.objects.create_user(username="idem_approver", password="pw1234")
+        self.approver.groups.add(chair_group)
+        self.client.force_login(self.creator)
+
+    def test_duplicate_create_returns_first_document(self):
+        data = {
+            "title": "중복 상신",
+            "content": "내용",
+            "approvers": [self.approver.id],
+            "approvers_order": str(self.approver.id),
+            "submit_token": "tok-create",
+        }
+        first = self.client.post(reverse("approvals:doc_create"), data)
+        second = self.client.post(reverse("approvals:doc_create"), data)
+
+        self.assertEqual(Document.objects.filter(title="중복 상신").count(), 1)
+        self.assertEqual(first["Location"], second["Location"])
+        self.assertFalse(self.client.session.get("processed_submit_tokens"))
+
+    def test_duplicate_approve_is_not_reapplied(self):
+        doc = create_document_with_lines_and_files(
+            creator=self.creator,
+            title="중복 승인",
+            content="내용",
+            consultants=[],
+            approvers=[self.approver],
+            receivers=[],
+            files=[],
+        )
+        self.client.force_login(self.approver)
+        url = reverse("approvals:act_approve", args=[doc.id])
+
+        self.client.post(url, {"comment": "첫 승인", "submit_token": "tok-approve"})
+        doc.refresh_from_db()
+        revision = doc.revision
+
+        res = self.client.post(url, {"comment": "두 번째", "submit_token": "tok-approve"}, follow=True)
+        self.assertContains(res, "이미 처리된 요청입니다.")
+        doc.refresh_from_db()
+        self.assertEqual(doc.revision, revision)
+        self.assertEqual(DocumentLine.objects.get(document=doc).comment, "첫 승인")
+
+    def test_same_token_for_another_action_is_not_a_duplicate(self):
+        doc = create_document_with_lines_and_files(
+            creator=self.creator,
+            title="다른 동작",
+            content="내용",
+            consultants=[],
+            approvers=[self.approver],
+            receivers=[],
+            files=[],
+        )
+        # 상세 화면의 회수/재기안 폼은 같은 submit_token 을 쓴다.
+        self.client.post(reverse("approvals:act_withdraw", args=[doc.id]), {"submit_token": "tok-shared"})
+        doc.refresh_from_db()
+        self.assertEqual(doc.status, Document.Status.DRAFT)
+
+        res = self.client.post(
+            reverse("approvals:act_redraft", args=[doc.id]), {"submit_token": "tok-shared"}, follow=True
+        )
+        self.assertNotContains(res, "이미 처리된 요청입니다.")
+        doc.refresh_from_db()
+        self.assertNotEqual(doc.status, Document.Status.DRAFT)
+        self.assertEqual(IdempotencyKey.objects.filter(token="tok-shared").count(), 2)
+
+        # 같은 동작으로 다시 보내면 중복
+        res = self.client.post(
+            reverse("approvals:act_redraft", args=[doc.id]), {"submit_token": "tok-shared"}, follow=True
+        )
+        self.assertContains(res, "이미 처리된 요청입니다.")
+
+    def test_failed_action_does_not_consume_token_and_cleanup(self):
+        doc = create_document_with_lines_and_files(
+            creator=self.creator,
+            title="실패",
+            content="내용",
+            consultants=[],
+            approvers=[self.approver],
+            receivers=[],
+            files=[],
+        )
+        # 기안자는 승인 권한이 없으므로 키가 롤백되어야 한다.
+        self.client.post(reverse("approvals:act_approve", args=[doc.id]), {"submit_token": "tok-fail"})
+        self.assertFalse(IdempotencyKey.objects.filter(token="tok-fail").exists())
+
+        self.client.post(reverse("approvals:act_withdraw", args=[doc.id]), {"submit_token": "tok-old"})
+        self.assertEqual(cleanup_expired_keys(now=timezone.now() + timedelta(days=2)), 1)
+
+
+class QueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        chair_group, _ = Group.objects.get_or_create(name=CHAIR_GROUP)
+        self.creator = User.objects.create_user(username="qb_creator", password="pw1234")
+        self.chair = User.objects.create_user(username="qb_chair", password="pw1234")
+        self.chair.groups.add(chair_group)
+        self.receiver = User.objects.create_user(username="qb_receiver", password="pw1234")
+        self.docs = [
+            create_document_with_lines_and_files(
+                creator=self.creator,
+                title=f"예산 문서 {i}",
+                content="내용",
+                consultants=[self.chair],
+                approvers=[self.chair],
+                receivers=[self.receiver],
+                files=[],
+            )
+            for i in range(5)
+        ]
+
+    def _get(self, name, *args):
+        cache.clear()
+        res = self.client.get(reverse(f"approvals:{name}", args=args))
+        self.assertEqual(res.status_code, 200)
+        return res
+
+    def test_views_stay_within_budget(self):
+        doc = self.docs[0]
+        pages = {
+            self.creator: [("home",), ("doc_list",), ("completed",), ("rejected",), ("doc_create",), ("doc_detail", doc.id)],
+            self.chair: [("inbox",), ("user_autocomplete",), ("doc_detail", doc.id)],
+            self.receiver: [("received",)],
+        }
+        for user, names in pages.items():
+            self.client.force_login(user)
+            for name, *args in names:
+                with self.subTest(user=user.username, view=name):
+                    self.assertWithinQueryBudget(self._get(name, *args))
+
+    def test_server_timing_header_is_staff_only(self):
+        self.client.force_login(self.creator)
+        res = self._get("doc_list")
+        self.assertNotIn("Server-Timing", res)
+        self.assertEqual(res.wsgi_request.perf_stats["view"], "approvals:doc_list")
+
+        self.creator.is_staff = True
+        self.creator.save(update_fields=["is_staff"])
+        res = self._get("doc_list")
+        self.assertIn("db;dur=", res["Server-Timing"])
+        self.assertIn("app;dur=", res["Server-Timing"])
+
+    def test_over_budget_logs_warning(self):
+        self.client.force_login(self.creator)
+        budgets = {"approvals:doc_list": 0}
+        with override_settings(VIEW_QUERY_BUDGETS=budgets), self.assertLogs("approvals.perf", "WARNING") as logs:
+            self._get("doc_list")
+            self.assertEqual(query_budget("approvals:doc_list"), 0)
+        self.assertIn("view=approvals:doc_list", logs.output[0])
+
+    @override_settings(PERF_INSTRUMENTATION=False)
+    def test_can_be_disabled(self):
+        self.client.force_login(self.creator)
+        res = self._get("doc_list")
+        self.assertNotIn("Server-Timing", res)
+
+
+class DatasetBenchmarkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _generate(self, **options):
+        return generate_dataset(users=8, chairs=5, documents=40, prefix="t", seed=7, attachment_bytes=16, **options)
+
+    def test_generated_documents_follow_workflow_rules(self):
+        summary = self._generate(attachments=0.5)
+        self.assertEqual(summary.documents, Document.objects.count())
+        self.assertEqual(summary.attachments, Attachment.objects.count())
+        self.assertEqual(User.objects.filter(groups__name=CHAIR_GROUP).count(), 5)
+
+        chairs = list(User.objects.filter(groups__name=CHAIR_GROUP))
+        for doc in Document.objects.filter(status=Document.Status.IN_PROGRESS):
+            # 진행중 문서는 누군가의 처리 대기함에 있어야 한다.
+            self.assertTrue(any(inbox_pending(u).filter(id=doc.id).exists() for u in chairs), doc.id)
+        self.assertFalse(
+            DocumentLine.objects.filter(document__status=Document.Status.DRAFT)
+            .exclude(decision=DocumentLine.Decision.PENDING)
+            .exists()
+        )
+        self.assertEqual(
+            DocumentViewer.objects.filter(document__created_by=F("user")).count(), Document.objects.count()
+        )
+
+    def test_same_seed_is_repeatable_and_users_are_reused(self):
+        first = self._generate(attachments=0)
+        second = self._generate(attachments=0)
+        self.assertEqual(first.statuses, second.statuses)
+        self.assertEqual(User.objects.filter(username__startswith="t").count(), 8)
+
+    def test_benchmark_writes_json(self):
+        self._generate(attachments=1)
+        out = os.path.join(self.media_root, "bench.json")
+        call_command("run_benchmarks", "--repeat", "1", "-o", out, stdout=io.StringIO())
+
+        with open(out, encoding="utf-8") as fh:
+            result = json.load(fh)
+        self.assertEqual(result["meta"]["dataset"]["documents"], 40)
+        self.assertEqual(result["meta"]["repeat"], 1)
+        for name in ("selector.inbox_pending", "view.inbox", "view.doc_detail", "export.docs_csv", "transition.approve"):
+            self.assertIn("median_ms", result["results"][name], name)
+        # 결재 전이는 롤백되므로 데이터가 바뀌지 않는다.
+        self.assertEqual(result["meta"]["dataset"], dataset_counts())
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        self.creator = User.objects.create_user(username="mt_creator", password="pw1234")
+        self.approver = User.objects.create_user(username="mt_approver", password="pw1234")
+
+    def _value(self, metric, *labels):
+        return metrics.collect()[metric.name].get(labels)
+
+    def test_committed_transitions_are_counted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            doc = create_document_with_lines_and_files(
+                creator=self.creator,
+                title="지표",
+                content="",
+                consultants=[],
+                approvers=[self.approver],
+                receivers=[],
+                files=[],
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            approve_or_consult(doc=doc, actor=self.approver)
+
+        self.assertEqual(self._value(metrics.TRANSITIONS, "submit"), 1)
+        self.assertEqual(self._value(metrics.TRANSITIONS, "approve"), 1)
+        self.assertEqual(self._value(metrics.TRANSITIONS, "complete"), 1)
+        self.assertEqual(self._value(metrics.TRANSITION_SECONDS, "approve")[-1], 1)
+
+        with self.assertRaises(PermissionError):
+            approve_or_consult(doc=doc, actor=self.creator)
+        self.assertEqual(self._value(metrics.TRANSITION_SECONDS, "approve")[-1], 1)
+
+    def test_values_are_merged_across_process_files(self):
+        metrics_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, metrics_dir, ignore_errors=True)
+        other = [[["approve"], 2], [["reject"], 1]]
+        with open(os.path.join(metrics_dir, "99999_0.json"), "w", encoding="utf-8") as fh:
+            json.dump({metrics.TRANSITIONS.name: other}, fh)
+
+        with override_settings(METRICS_DIR=metrics_dir, METRICS_FLUSH_SECONDS=0):
+            metrics.TRANSITIONS.inc(action="approve")
+            # 기록 경로에서는 파일을 쓰지 않고, 수집 시 내려쓴다.
+            self.assertEqual(os.listdir(metrics_dir), ["99999_0.json"])
+            self.assertEqual(self._value(metrics.TRANSITIONS, "approve"), 3)
+            self.assertEqual(self._value(metrics.TRANSITIONS, "reject"), 1)
+            self.assertEqual(len(os.listdir(metrics_dir)), 2)
+
+    def test_endpoint_is_staff_only_text_format(self):
+        metrics.EXPORT_BYTES.inc(128, kind="zip")
+        url = reverse("approvals:metrics")
+
+        self.client.force_login(self.creator)
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.creator.is_staff = True
+        self.creator.save()
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = res.content.decode()
+        self.assertIn("# TYPE eapproval_transitions_total counter", body)
+        self.assertIn('eapproval_export_bytes_total{kind="zip"} 128.0', body)
+
+
+class ProfilerTests(TestCase):
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir, ignore_errors=True)
+        override = override_settings(
+            PROFILER_ENABLED=True, PROFILER_DIR=self.profile_dir, PROFILER_SAMPLE_RATE=1.0
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        profiling._recent.clear()
+
+        self.staff = User.objects.create_user(username="pf_staff", password="pw1234", is_staff=True)
+        self.member = User.objects.create_user(username="pf_member", password="pw1234")
+
+    def _get(self, user, token):
+        self.client.force_login(user)
+        return self.client.get(reverse("approvals:doc_list"), {profiling.PROFILE_PARAM: token})
+
+    def test_signed_token_profiles_staff_request(self):
+        res = self._get(self.staff, profiling.make_token(self.staff))
+        report_id = res["X-Profile-Id"]
+
+        self.assertTrue(os.path.exists(os.path.join(self.profile_dir, f"{report_id}.prof")))
+        with open(os.path.join(self.profile_dir, f"{report_id}.sql.txt"), encoding="utf-8") as fh:
+            report = fh.read()
+        self.assertIn("view=approvals:doc_list", report)
+        self.assertIn("approvals/views.py", report)
+        self.assertIn("SELECT", report)
+
+    def test_disabled_profiler_ignores_tokens(self):
+        with override_settings(PROFILER_ENABLED=False):
+            self.assertNotIn("X-Profile-Id", self._get(self.staff, profiling.make_token(self.staff)))
+        self.assertEqual(os.listdir(self.profile_dir), [])
+
+    def test_token_must_belong_to_staff_user(self):
+        self.assertNotIn("X-Profile-Id", self._get(self.member, profiling.make_token(self.member)))
+        self.assertNotIn("X-Profile-Id", self._get(self.staff, profiling.make_token(self.member)))
+        self.assertNotIn("X-Profile-Id", self._get(self.staff, "forged"))
+
+    @override_settings(PROFILER_MAX_PER_MINUTE=1, PROFILER_MAX_REPORTS=1)
+    def test_rate_and_retention_caps(self):
+        token = profiling.make_token(self.staff)
+        self.assertIn("X-Profile-Id", self._get(self.staff, token))
+        self.assertNotIn("X-Profile-Id", self._get(self.staff, token))
+
+        profiling._recent.clear()
+        self._get(self.staff, token)
+        self.assertEqual(len([n for n in os.listdir(self.profile_dir) if n.endswith(".prof")]), 1)
+
+    def test_cookie_toggle_list_and_download(self):
+        self.client.force_login(self.staff)
+        self.client.post(reverse("approvals:profiling_toggle"), {"action": "on"})
+        report_id = self.client.get(reverse("approvals:home"))["X-Profile-Id"]
+
+        res = self.client.get(reverse("approvals:profiling"))
+        self.assertContains(res, f"{report_id}.sql.txt")
+        res = self.client.get(reverse("approvals:profiling_download", args=[f"{report_id}.prof"]))
+        self.assertEqual(res.status_code, 200)
+        res.close()
+        self.assertEqual(self.client.get(reverse("approvals:profiling_download", args=["..env"])).status_code, 404)
+
+        self.client.post(reverse("approvals:profiling_toggle"), {"action": "off"})
+        self.assertNotIn("X-Profile-Id", self.client.get(reverse("approvals:home")))
+
+        self.client.force_login(self.member)
+        self.assertEqual(self.client.get(reverse("approvals:profiling")).status_code, 302)
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "SQLite 설정")
+class SqliteSettingsTests(TestCase):
+    def _pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_on_connect(self):
+        self.assertEqual(self._pragma("synchronous"), 1)  # NORMAL
+        self.assertEqual(self._pragma("busy_timeout"), settings.SQLITE_OPTIONS["timeout"] * 1000)
+        self.assertEqual(self._pragma("temp_store"), 2)  # MEMORY
+        self.assertLess(self._pragma("cache_size"), 0)  # KiB 단위 지정
+        # 테스트 DB 는 메모리 DB 라 journal_mode 는 memory 로 남는다. 파일 DB 에서는 wal.
+        self.assertIn(self._pragma("journal_mode"), ("wal", "memory"))
+
+    def test_atomic_blocks_begin_immediate(self):
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
+
+    def test_concurrency_summary(self):
+        workers = [
+            {"reads": 8, "writes": 2, "errors": 1, "read_ms": [1.0] * 8, "write_ms": [5.0, 15.0]},
+            {"reads": 6, "writes": 4, "errors": 0, "read_ms": [3.0] * 6, "write_ms": [5.0] * 4},
+        ]
+        result = summarize_concurrency(workers, seconds=2)
+        self.assertEqual(result["ops_per_sec"], 10.0)
+        self.assertEqual(result["writes_per_sec"], 3.0)
+        self.assertEqual(result["errors"], 1)
+        self.assertEqual(result["write_p95_ms"], 15.0)
+
+
+@override_settings(READ_REPLICA="replica")
+class ReplicaRoutingTests(TestCase):
+    """
+    테스트에는 replica 연결이 없으므로 replica 로 라우팅된 쿼리는 ConnectionDoesNotExist 로 드러난다.
+    """
+
+    def setUp(self):
+        cache.clear()
+        chair_group, _ = Group.objects.get_or_create(name=CHAIR_GROUP)
+        self.creator = User.objects.create_user(username="rep_creator", password="pw1234")
+        self.approver = User.objects.create_user(username="rep_approver", password="pw1234")
+        self.approver.groups.add(chair_group)
+        self.router = ReplicaRouter()
+
+    def test_only_marked_reads_go_to_replica(self):
+        self.assertEqual(self.router.db_for_read(Document), "default")
+        with read_replica():
+            self.assertEqual(self.router.db_for_read(Document), "replica")
+            self.assertEqual(self.router.db_for_write(Document), "default")
+        self.assertFalse(self.router.allow_migrate("replica", "approvals"))
+        self.assertIsNone(self.router.allow_migrate("default", "approvals"))
+
+        with override_settings(READ_REPLICA=""), read_replica():
+            self.assertIsNone(self.router.db_for_read(Document))
+
+    def test_write_pins_reads_to_primary_within_request(self):
+        state = replica._RequestState()
+        token = replica._request_state.set(state)
+        self.addCleanup(replica._request_state.reset, token)
+
+        with read_replica():
+            self.assertEqual(self.router.db_for_read(Document), "replica")
+            self.router.db_for_write(Document)
+            self.assertEqual(self.router.db_for_read(Document), "default")
+
+    def test_list_views_read_from_replica_until_user_acts(self):
+        doc = create_document_with_lines_and_files(
+            creator=self.creator,
+            title="복제본",
+            content="내용",
+            consultants=[],
+            approvers=[self.approver],
+            receivers=[],
+            files=[],
+        )
+        self.client.force_login(self.approver)
+        with self.assertRaises(ConnectionDoesNotExist):
+            self.client.get(reverse("approvals:inbox"))
+
+        res = self.client.post(reverse("approvals:act_approve", args=[doc.id]), {"submit_token": "tok-rep"})
+        self.assertEqual(res.status_code, 302)
+        self.assertIn(replica.STICKY_COOKIE, res.cookies)
+
+        # 결재 직후 목록은 default 에서 읽는다.
+        res = self.client.get(reverse("approvals:inbox"))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(list(res.context["docs"]), [])
+
+    def test_reads_do_not_set_sticky_cookie(self):
+        self.client.force_login(self.creator)
+        res = self.client.get(reverse("approvals:doc_create"))
+        self.assertEqual(res.status_code, 200)
+        self.assertNotIn(replica.STICKY_COOKIE, res.cookies)
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        chair_group, _ = Group.objects.get_or_create(name=CHAIR_GROUP)
+        self.creator = User.objects.create_user(username="arc_creator", password="pw1234")
+        self.approver = User.objects.create_user(username="arc_approver", password="pw1234")
+        self.receiver = User.objects.create_user(username="arc_receiver", password="pw1234")
+        self.outsider = User.objects.create_user(username="arc_outsider", password="pw1234")
+        for u in (self.approver, self.receiver):
+            u.groups.add(chair_group)
+
+        def create(title, files=()):
+            return create_document_with_lines_and_files(
+                creator=self.creator,
+                title=title,
+                content="내용",
+                consultants=[],
+                approvers=[self.approver],
+                receivers=[self.receiver],
+                files=list(files),
+            )
+
+        self.old = approve_or_consult(
+            doc=create("오래된 완료", [SimpleUploadedFile("old.txt", b"archived-bytes")]), actor=self.approver
+        )
+        self.old_rejected = reject(doc=create("오래된 반려"), actor=self.approver, comment="반려")
+        self.recent = approve_or_consult(doc=create("최근 완료"), actor=self.approver)
+        self.pending = create("진행중")
+
+        two_years_ago = timezone.now() - timedelta(days=730)
+        Document.objects.filter(id__in=[self.old.id, self.old_rejected.id, self.pending.id]).update(
+            updated_at=two_years_ago
+        )
+
+    def _archive(self):
+        return archive_documents(before=months_ago(12), batch_size=1)
+
+    def test_moves_finished_documents_with_lines_and_attachments(self):
+        line_count = self.old.lines.count()
+        att_id = self.old.attachments.get().id
+
+        self.assertEqual(self._archive(), 2)
+
+        self.assertEqual(
+            set(Document.objects.values_list("id", flat=True)), {self.recent.id, self.pending.id}
+        )
+        archived = ArchivedDocument.objects.get(id=self.old.id)
+        self.assertEqual(archived.status, Document.Status.COMPLETED)
+        self.assertEqual(archived.revision, self.old.revision)
+        self.assertEqual(archived.lines.count(), line_count)
+        self.assertEqual(archived.attachments.get().id, att_id)
+        self.assertFalse(DocumentLine.objects.filter(document_id=self.old.id).exists())
+        self.assertTrue(ArchivedDocumentViewer.objects.filter(document=archived, user=self.receiver).exists())
+        self.assertEqual(self._archive(), 0)
+
+    def test_archived_document_is_readable_through_same_urls(self):
+        self._archive()
+        att_id = ArchivedDocument.objects.get(id=self.old.id).attachments.get().id
+
+        self.client.force_login(self.receiver)
+        res = self.client.get(reverse("approvals:doc_detail", args=[self.old.id]))
+        self.assertContains(res, "오래된 완료")
+        self.assertContains(res, "보관")
+
+        res = self.client.get(reverse("approvals:attachment_download", args=[att_id]))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(b"".join(res.streaming_content), b"archived-bytes")
+        self.assertEqual(self.client.get(reverse("approvals:attachments_zip", args=[self.old.id])).status_code, 200)
+
+        self.client.force_login(self.outsider)
+        self.assertEqual(self.client.get(reverse("approvals:doc_detail", args=[self.old.id])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("approvals:attachment_download", args=[att_id])).status_code, 404)
+
+    def test_archived_rejected_document_is_read_only(self):
+        self._archive()
+        self.client.force_login(self.creator)
+        res = self.client.get(reverse("approvals:doc_detail", args=[self.old_rejected.id]))
+        self.assertEqual(res.status_code, 200)
+        self.assertFalse(res.context["can_withdraw"])
+
+    def test_mailboxes_merge_hot_and_archived_documents(self):
+        self._archive()
+        self.client.force_login(self.creator)
+
+        res = self.client.get(reverse("approvals:completed"))
+        self.assertEqual([d.id for d in res.context["docs"]], [self.recent.id, self.old.id])
+        self.assertEqual(res.context["page_obj"].paginator.count, 2)
+
+        res = self.client.get(reverse("approvals:rejected"))
+        self.assertEqual([d.id for d in res.context["docs"]], [self.old_rejected.id])
+
+    def test_exports_include_archived_documents(self):
+        self._archive()
+
+        job = ExportJob.objects.create(
+            kind=ExportJob.Kind.DOCS_CSV, requested_by=self.creator, params={"kind": "completed"}
+        )
+        process_pending_jobs()
+        job.refresh_from_db()
+        with job.file.open("rb") as fh:
+            rows = list(csv.reader(io.StringIO(fh.read().decode("utf-8-sig"))))
+        self.assertEqual([int(r[0]) for r in rows[1:]], [self.recent.id, self.old.id])
+
+        # 관리자가 등록한 뒤 보관된 문서도 첨부 ZIP 에 들어간다.
+        job = ExportJob.objects.create(
+            kind=ExportJob.Kind.DOCS_ZIP, requested_by=self.creator, params={"document_ids": [self.old.id]}
+        )
+        process_pending_jobs()
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.Status.DONE)
+        with job.file.open("rb") as fh, zipfile.ZipFile(fh) as zf:
+            self.assertEqual([zf.read(name) for name in zf.namelist()], [b"archived-bytes"])
+
+    def test_ndjson_round_trip_restores_archived_documents(self):
+        self._archive()
+        archived_ids = {self.old.id, self.old_rejected.id}
+        line_ids = set(ArchivedDocumentLine.objects.values_list("id", flat=True))
+        att_id = ArchivedAttachment.objects.get().id
+        viewers = set(ArchivedDocumentViewer.objects.values_list("document_id", "user_id"))
+
+        out = io.StringIO()
+        call_command("export_documents_ndjson", stdout=out, stderr=io.StringIO())
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual({r["id"] for r in rows if r.get("archived")}, archived_ids)
+        self.assertEqual(len(rows), 4)
+
+        out = io.StringIO()
+        call_command("export_documents_ndjson", "--no-include-archived", stdout=out, stderr=io.StringIO())
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+        fd, path = tempfile.mkstemp(suffix=".ndjson")
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows if r.get("archived")))
+        self.addCleanup(os.remove, path)
+
+        ArchivedDocument.objects.all().delete()
+        call_command("import_documents_ndjson", path, batch_size=1, stdout=io.StringIO())
+
+        self.assertEqual(set(ArchivedDocument.objects.values_list("id", flat=True)), archived_ids)
+        self.assertEqual(set(ArchivedDocumentLine.objects.values_list("id", flat=True)), line_ids)
+        self.assertEqual(ArchivedAttachment.objects.get().id, att_id)
+        self.assertEqual(set(ArchivedDocumentViewer.objects.values_list("document_id", "user_id")), viewers)
+        self.assertEqual(Document.objects.count(), 2)
+
+        # 같은 파일을 다시 가져와도 중복되지 않는다.
+        call_command("import_documents_ndjson", path, stdout=io.StringIO())
+        self.assertEqual(ArchivedDocument.objects.count(), 2)
+
+        self.client.force_login(self.receiver)
+        self.assertContains(self.client.get(reverse("approvals:doc_detail", args=[self.old.id])), "오래된 완료")
+        new_doc = create_document_with_lines_and_files(
+            creator=self.creator,
+            title="새 문서",
+            content="",
+            consultants=[],
+            approvers=[self.approver],
+            receivers=[],
+            files=[],
+        )
+        self.assertNotIn(new_doc.id, archived_ids)
+
+    def test_command_dry_run(self):
+        out = io.StringIO()
+        call_command("archive_documents", "--dry-run", stdout=out)
+        self.assertIn("2건", out.getvalue())
+        self.assertEqual(Document.objects.count(), 4)
+
+
+class ChairMembershipCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.chair_group, _ = Group.objects.get_or_create(name=CHAIR_GROUP)
+        self.chair = User.objects.create_user(username="cache_chair", password="pw1234")
+        self.member = User.objects.create_user(username="cache_member", password="pw1234")
+        self.chair.groups.add(self.chair_group)
+
+    def test_membership_is_served_from_cache(self):
+        self.assertTrue(is_chair(self.chair))
+
+        with self.assertNumQueries(0):
+            self.assertTrue(is_chair(self.chair))
+            self.assertFalse(is_chair(self.member))
+
+    def test_group_change_invalidates_cache(self):
+        self.assertFalse(is_chair(self.member))
+
+        self.member.groups.add(self.chair_group)
+        self.assertTrue(is_chair(self.member))
+        self.member.profile.refresh_from_db()
+        self.assertEqual(self.member.profile.role, "CHAIR")
+
+        self.chair_group.user_set.remove(self.member)
+        self.assertFalse(is_chair(self.member))
+        self.member.profile.refresh_from_db()
+        self.assertEqual(self.member.profile.role, "MEMBER")
+
+    @override_settings(CHAIR_CACHE_TTL=0)
+    def test_ttl_zero_reads_membership_every_time(self):
+        self.assertTrue(is_chair(self.chair))
+
+        # 다른 워커에서 강등된 경우처럼 신호/무효화 없이 그룹에서 뺀다.
+        User.groups.through.objects.filter(user_id=self.chair.id).delete()
+        with self.assertNumQueries(1):
+            self.assertFalse(is_chair(self.chair))
+
+    def test_form_renders_only_selected_users(self):
+        is_chair(self.chair)  # 멤버십 캐시 적재
+
+        with self.assertNumQueries(0):
+            html = str(DocumentForm()["approvers"])
+        self.assertNotIn('type="checkbox"', html)
+
+        html = str(DocumentForm(initial={"approvers": [self.chair.id]})["approvers"])
+        self.assertIn(f'value="{self.chair.id}"', html)
+        self.assertNotIn(f'value="{self.member.id}"', html)
+
+    def test_form_rejects_non_chair(self):
+        form = DocumentForm(
+            data={"title": "t", "content": "c", "approvers": [self.member.id], "approvers_order": ""}
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn("approvers", form.errors)
+
+
+class UserAutocompleteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        chair_group, _ = Group.objects.get_or_create(name=CHAIR_GROUP)
+        self.viewer = User.objects.create_user(username="ac_viewer", password="pw1234")
+        self.outsider = User.objects.create_user(username="kim_outsider", password="pw1234")
+        self.chairs = []
+        for i in range(25):
+            u = User.objects.create_user(username=f"kim{i:02d}", password="pw1234")
+            u.groups.add(chair_group)
+            self.chairs.append(u)
+        self.client.force_login(self.viewer)
+
+    def _get(self, **params):
+        res = self.client.get(reverse("approvals:user_autocomplete"), params)
+        self.assertEqual(res.status_code, 200)
+        return res.json()
+
+    def test_prefix_search_only_returns_chairs(self):
+        data = self._get(q="kim")
+        ids = {r["id"] for r in data["results"]}
+        self.assertNotIn(self.outsider.id, ids)
+        self.assertEqual(len(data["results"]), 20)
+        self.assertTrue(data["has_more"])
+
+        data = self._get(q="kim", page=2)
+        self.assertEqual(len(data["results"]), 5)
+        self.assertFalse(data["has_more"])
+
+    def test_display_name_prefix(self):
+        target = self.chairs[3]
+        target.profile.full_name = "홍길동"
+        target.profile.save()
+
+        data = self._get(q="홍길")
+        self.assertEqual(data["results"], [{"id": target.id, "label": "홍길동"}])
+
+    def test_cache_key_is_safe_for_any_query(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            self.assertEqual(self._get(q="kim 0\t1")["results"], [])
+        self.assertFalse([w for w in caught if issubclass(w.category, CacheKeyWarning)])
+
+
+class AdminChangeListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(username="adm_root", password="pw1234")
+        self.approver = User.objects.create_user(username="adm_approver", password="pw1234")
+        for i in range(3):
+            create_document_with_lines_and_files(
+                creator=self.admin,
+                title=f"관리 문서 {i}",
+                content="본문" * 100,
+                consultants=[],
+                approvers=[self.approver],
+                receivers=[],
+                files=[],
+            )
+        self.client.force_login(self.admin)
+
+    def _changelist(self, model, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get(reverse(f"admin:approvals_{model}_changelist"), params)
+        self.assertEqual(res.status_code, 200)
+        return res, [q["sql"] for q in ctx.captured_queries]
+
+    def test_line_list_counts_once_and_skips_document_body(self):
+        res, queries = self._changelist("documentline")
+        counts = [sql for sql in queries if "COUNT(" in sql]
+        self.assertEqual(len(counts), 1)  # show_full_result_count=False
+        rows = [sql for sql in queries if '"approvals_document"."title"' in sql]
+        self.assertEqual(len(rows), 1)
+        self.assertNotIn('"approvals_document"."content"', rows[0])
+        self.assertContains(res, "관리 문서 0")
+
+        # 같은 조건의 건수는 캐시에서
+        _, queries = self._changelist("documentline")
+        self.assertFalse([sql for sql in queries if "COUNT(" in sql])
+
+    def test_unfiltered_list_uses_estimate_for_large_tables(self):
+        with mock.patch.object(approvals_admin, "_estimated_rows", return_value=2_000_000):
+            res, queries = self._changelist("document")
+        self.assertFalse([sql for sql in queries if "COUNT(" in sql])
+        self.assertEqual(res.context["cl"].result_count, 2_000_000)
+
+        with mock.patch.object(approvals_admin, "_estimated_rows", return_value=2_000_000):
+            res, _ = self._changelist("document", status__exact=Document.Status.IN_PROGRESS)
+        self.assertEqual(res.context["cl"].result_count, 3)
+
+    def test_date_hierarchy_and_raw_id_fields(self):
+        self._changelist("attachment")
+        res, _ = self._changelist("document", created_at__year=timezone.localdate().year)
+        self.assertEqual(res.context["cl"].result_count, 3)
+
+        line = DocumentLine.objects.first()
+        res = self.client.get(reverse("admin:approvals_documentline_change", args=[line.id]))
+        self.assertContains(res, "vForeignKeyRawIdAdminField")
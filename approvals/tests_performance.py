@@ -0,0 +1,207 @@
+import re
+import shutil
+import statistics
+import tempfile
+import time
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .dataset import generate_documents
+from .models import Document, DocumentLine, ExportJob
+from .permissions import CHAIR_GROUP
+from .selectors import (
+    _unread_receipt_lines,
+    archived_docs,
+    completed_docs,
+    inbox_pending,
+    my_documents,
+    received_docs,
+    rejected_docs,
+)
+from .services import approve_or_consult, create_document_with_lines_and_files, reject, withdraw_document
+
+User = get_user_model()
+
+SMALL, LARGE = 10, 500
+# 큰 데이터에서의 전체 렌더링 시간이 작은 데이터의 몇 배까지 허용되는지
+TIME_RATIO = 4.0
+REPEAT = 3
+
+
+class ScalingFixtureMixin:
+    """
+    작성자 1명 / 위원장 4명 기준 데이터
+    - 모든 문서함이 작은 데이터에서도 비어 있지 않도록 대표 문서 4건은 services 로 만든다.
+      (진행 중 문서에는 첨부 1건, 회수한 문서는 재기안 화면용, 내보내기 작업 1건)
+    - 나머지는 dataset.generate_documents 로 채운다 (같은 사용자들만 결재 라인에 등장).
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        chair_group, _ = Group.objects.get_or_create(name=CHAIR_GROUP)
+        self.creator = User.objects.create_user(username="sc_creator", password="pw1234", is_staff=True)
+        self.chair = User.objects.create_user(username="sc_chair", password="pw1234")
+        self.receiver = User.objects.create_user(username="sc_receiver", password="pw1234")
+        self.others = [User.objects.create_user(username=f"sc_chair{i}", password="pw1234") for i in range(2)]
+        for u in (self.chair, self.receiver, *self.others):
+            u.groups.add(chair_group)
+        # 위원장이면서 스태프 (회원 목록의 일괄 임명/해임 폼)
+        self.staff_chair = self.others[0]
+        self.staff_chair.is_staff = True
+        self.staff_chair.save(update_fields=["is_staff"])
+
+        def create(files=()):
+            return create_document_with_lines_and_files(
+                creator=self.creator,
+                title="대표 문서",
+                content="내용",
+                consultants=[],
+                approvers=[self.chair],
+                receivers=[self.receiver],
+                files=list(files),
+            )
+
+        self.pending_doc = create([SimpleUploadedFile("scale.txt", b"scale")])
+        approve_or_consult(doc=create(), actor=self.chair)
+        reject(doc=create(), actor=self.chair, comment="반려")
+        self.draft_doc = withdraw_document(doc=create(), actor=self.creator)
+        self.export_job = ExportJob.objects.create(
+            kind=ExportJob.Kind.DOCS_CSV, requested_by=self.creator, params={"kind": "completed"}
+        )
+
+    def grow_to(self, total: int) -> None:
+        generate_documents(
+            count=total - Document.objects.count(),
+            user_ids=[self.creator.id],
+            chair_ids=[u.id for u in (self.chair, self.receiver, *self.others)],
+            prefix="sc",
+            attachments=0,
+            seed=total,
+        )
+
+
+class QueryScalingTests(ScalingFixtureMixin, TestCase):
+    """
+    GET 으로 열리는 approvals/accounts 화면 전부 (기대 상태 코드가 200 이 아니면 네 번째 값).
+    제외: POST 전용 처리(act_*, received_mark_all_read, appoint/demote/bulk_chair, profiling_toggle,
+    logout), 결과 파일이 있어야 하는 export_job_download(ExportJobTests), 문서 수와 무관한
+    스태프 도구(profiling, profiling_download, metrics), 다른 URL 로 같은 뷰를 여는
+    doc_detail_legacy / documents_export_csv, 완료 안내뿐인 password_change_done.
+    """
+
+    def _pages(self):
+        doc_id = self.pending_doc.id
+        att_id = self.pending_doc.attachments.get().id
+        return [
+            (self.creator, "approvals:home", []),
+            (self.creator, "approvals:doc_list", []),
+            (self.creator, "approvals:completed", []),
+            (self.creator, "approvals:rejected", []),
+            (self.creator, "approvals:doc_create", []),
+            (self.creator, "approvals:doc_detail", [doc_id]),
+            (self.creator, "approvals:doc_redraft", [self.draft_doc.id]),
+            (self.creator, "approvals:attachment_download", [att_id]),
+            (self.creator, "approvals:attachments_zip", [doc_id]),
+            (self.creator, "approvals:export_docs_csv", ["completed"], 302),
+            (self.creator, "approvals:export_job", [self.export_job.id]),
+            (self.creator, "approvals:export_job_status", [self.export_job.id]),
+            (self.chair, "approvals:inbox", []),
+            (self.chair, "approvals:doc_detail", [doc_id]),
+            (self.chair, "approvals:user_autocomplete", []),
+            (self.chair, "approvals:admin_chair", []),
+            (self.receiver, "approvals:received", []),
+            (self.creator, "accounts:profile_list", []),
+            (self.staff_chair, "accounts:profile_list", []),
+            (self.creator, "accounts:profile_detail", []),
+            (self.creator, "accounts:profile_edit", []),
+            (self.creator, "accounts:password_change", []),
+            (None, "accounts:login", []),
+            (None, "accounts:signup", []),
+        ]
+
+    def _measure(self) -> dict:
+        """
+        화면별 (쿼리 수, 렌더링 시간 중앙값 ms). 조각 캐시가 없는 상태에서 잰다.
+        """
+        result = {}
+        for user, name, args, *expected in self._pages():
+            if user:
+                self.client.force_login(user)
+            else:
+                self.client.logout()
+            url = reverse(name, args=args)
+            self.client.get(url)  # 세션/CSRF 예열
+
+            timings, queries = [], 0
+            for _ in range(REPEAT):
+                cache.clear()
+                with CaptureQueriesContext(connection) as ctx:
+                    start = time.perf_counter()
+                    res = self.client.get(url)
+                    timings.append((time.perf_counter() - start) * 1000)
+                self.assertEqual(res.status_code, expected[0] if expected else 200, url)
+                queries = len(ctx.captured_queries)
+            result[(user and user.username, name)] = (queries, statistics.median(timings))
+        return result
+
+    def test_query_count_and_time_do_not_grow_with_documents(self):
+        self.grow_to(SMALL)
+        small = self._measure()
+        self.grow_to(LARGE)
+        large = self._measure()
+        self.assertEqual(Document.objects.count(), LARGE)
+
+        for key, (queries, _) in small.items():
+            with self.subTest(page=key):
+                self.assertEqual(large[key][0], queries, f"{key}: {queries} -> {large[key][0]} queries")
+
+        small_ms = sum(ms for _, ms in small.values())
+        large_ms = sum(ms for _, ms in large.values())
+        self.assertLessEqual(
+            large_ms,
+            small_ms * TIME_RATIO,
+            f"문서 {SMALL}건 {small_ms:.1f}ms -> {LARGE}건 {large_ms:.1f}ms",
+        )
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN 형식은 SQLite 기준")
+class SelectorIndexTests(ScalingFixtureMixin, TestCase):
+    # 문서 수에 비례해 커지는 테이블은 전체 스캔하지 않아야 한다.
+    SCAN_RE = re.compile(r"\bSCAN (?!CONSTANT ROW)(\S+)")
+
+    def assertUsesIndexes(self, qs):
+        plan = qs.explain()
+        scans = self.SCAN_RE.findall(plan)
+        self.assertEqual(scans, [], plan)
+
+    def test_selectors_use_indexes(self):
+        self.grow_to(LARGE)
+        cases = {
+            "my_documents": my_documents(self.creator),
+            "inbox_pending": inbox_pending(self.chair),
+            "received_docs": received_docs(self.receiver),
+            "completed_docs": completed_docs(self.creator),
+            "rejected_docs": rejected_docs(self.creator),
+            "archived_docs": archived_docs(self.creator, Document.Status.COMPLETED),
+            "unread_receipts": _unread_receipt_lines(self.receiver).filter(
+                document__status=Document.Status.COMPLETED
+            ),
+            "document_lines": DocumentLine.objects.filter(document_id=self.pending_doc.id),
+        }
+        for name, qs in cases.items():
+            with self.subTest(selector=name):
+                self.assertUsesIndexes(qs)
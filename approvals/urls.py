@@ -16,6 +16,7 @@ urlpatterns = [
 
     # ✅ 수신/열람함 name 기준 확정: "received"
     path("approvals/received/", views.received_list, name="received"),
+    path("approvals/received/read-all/", views.received_mark_all_read, name="received_mark_all_read"),
 
     # ✅ CSV Export (Documents 클릭 후 저장)
     # kind 예: "documents", "received", "completed", "rejected" 등 (views.export_docs_csv 구현 기준)
@@ -24,6 +25,11 @@ urlpatterns = [
     # ✅ 호환용(이름만 documents_export_csv) - 템플릿 구버전 대응
     path("approvals/docs/export.csv", views.documents_export_csv, name="documents_export_csv"),
 
+    # 내보내기 작업(백그라운드 CSV/ZIP) 진행/상태/다운로드
+    path("approvals/exports/<int:job_id>/", views.export_job, name="export_job"),
+    path("approvals/exports/<int:job_id>/status/", views.export_job_status, name="export_job_status"),
+    path("approvals/exports/<int:job_id>/download/", views.export_job_download, name="export_job_download"),
+
     # ✅ 완료함 / 반려함
     path("approvals/completed/", views.completed_list, name="completed"),
     path("approvals/rejected/", views.rejected_list, name="rejected"),
@@ -52,6 +58,9 @@ urlpatterns = [
     path("approvals/<int:doc_id>/withdraw/", views.act_withdraw, name="act_withdraw"),
     path("approvals/<int:doc_id>/redraft/", views.act_redraft, name="act_redraft"),
 
+    # 결재선 선택용 사용자 자동완성(JSON)
+    path("approvals/users/autocomplete/", views.user_autocomplete, name="user_autocomplete"),
+
     # 관리자(의장/위원장 등)
     path("approvals/admin/chair/", views.admin_chair, name="admin_chair"),
 
@@ -61,4 +70,12 @@ urlpatterns = [
         views.attachment_download,
         name="attachment_download",
     ),
+
+    # 요청 프로파일러 (스태프 전용)
+    path("approvals/profiling/", views.profiling_index, name="profiling"),
+    path("approvals/profiling/toggle/", views.profiling_toggle, name="profiling_toggle"),
+    path("approvals/profiling/<str:name>", views.profiling_download, name="profiling_download"),
+
+    # 운영 지표 (Prometheus 텍스트 형식, 스태프 전용)
+    path("metrics", views.metrics_view, name="metrics"),
 ]
@@ -1,27 +1,56 @@
 # approvals/views.py
-import csv
+import hashlib
 import io
 import os
 import zipfile
+from functools import partial
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import Group
-from django.http import FileResponse, Http404, HttpResponse
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.utils import timezone
 from django.utils.encoding import smart_str
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_POST
 
-from accounts.utils import sync_profile_role_from_groups
+from accounts.utils import appoint_chairs, demote_chairs, display_name
+from accounts.views import staff_required
+from .exports import MAILBOX_EXPORTS
 from .forms import DocumentForm
-from .models import Attachment, Document, DocumentLine
-from .permissions import CHAIR_GROUP, can_view_document, is_chair
-from .selectors import inbox_pending, my_documents, received_docs, completed_docs, rejected_docs
+from .idempotency import already_done, new_token, run_once, token_from
+from .jobs import can_access_job, enqueue_export_job, job_file_basename
+from . import metrics, profiling
+from .models import ArchivedAttachment, ArchivedDocument, Attachment, Document, DocumentLine, ExportJob
+from .permissions import CHAIR_GROUP, can_view_document, chair_cache_key, is_chair
+from .replica import read_replica
+from .selectors import (
+    archived_docs,
+    chair_users_by_prefix,
+    completed_docs,
+    document_detail,
+    document_validators,
+    inbox_pending,
+    mailbox_validators,
+    my_documents,
+    received_docs,
+    rejected_docs,
+    unread_received_count,
+    with_archived,
+)
 from .services import (
     approve_or_consult,
     create_document_with_lines_and_files,
     delete_draft_attachment,
+    mark_all_received_read,
     mark_read,
     redraft_document,
     reject,
@@ -31,88 +60,56 @@ from .services import (
 
 User = get_user_model()
 
-
-def _display_name(user) -> str:
-    """
-    화면/내보내기 표시용 이름: Profile > full_name > username
-    """
-    if not user:
-        return "-"
-
-    profile = getattr(user, "profile", None)
-    if profile:
-        disp = getattr(profile, "display_name", None)
-        if callable(disp):
-            name = disp()
-            if name:
-                return str(name).strip()
-
-        for attr in ("name", "full_name", "real_name", "nickname"):
-            v = getattr(profile, attr, None)
-            if v:
-                v = str(v).strip()
-                if v:
-                    return v
-
-    get_full = getattr(user, "get_full_name", None)
-    if callable(get_full):
-        full = (get_full() or "").strip()
-        if full:
-            return full
-
-    return (getattr(user, "username", "") or getattr(user, "email", "") or "-").strip() or "-"
+# 사용자 자동완성: 한 페이지 크기 / 결과 캐시 시간(초)
+AUTOCOMPLETE_PAGE_SIZE = 20
+AUTOCOMPLETE_CACHE_TTL = 60
+ADMIN_CHAIR_PAGE_SIZE = 50
+# 문서함 목록 한 페이지 크기
+MAILBOX_PAGE_SIZE = 50
 
 
 def _get_current_stage_info(doc: Document, user):
     """
     현재 문서의 진행 단계를 계산하여 상세 화면용 정보를 반환한다.
+    doc.lines 가 prefetch 되어 있으면 추가 쿼리 없이 계산한다.
 
     반환값:
     - current_stage: "CONSULT" | "APPROVE" | None
     - current_stage_label: "협의" | "결재" | None
-    - current_lines: 현재 처리중인 라인들(QuerySet)
+    - current_lines: 현재 처리중인 라인들(list)
       * 협의 단계: pending 협의 전체
       * 결재 단계: 현재 순차 결재자 1명
-    - current_line: current_lines.first()
+    - current_line: current_lines[0]
     - can_act: 현재 사용자가 처리 가능한지
     """
-    pending_consults = doc.lines.filter(
-        role=DocumentLine.Role.CONSULT,
-        decision=DocumentLine.Decision.PENDING,
-    ).order_by("order", "id")
-
-    if pending_consults.exists():
-        current_lines = pending_consults
-        can_act = user.is_superuser or current_lines.filter(user_id=user.id).exists()
+    lines = sorted(doc.lines.all(), key=lambda l: (l.order, l.id))
+    pending = [l for l in lines if l.decision == DocumentLine.Decision.PENDING]
+
+    pending_consults = [l for l in pending if l.role == DocumentLine.Role.CONSULT]
+    if pending_consults:
         return {
             "current_stage": "CONSULT",
             "current_stage_label": "협의",
-            "current_lines": current_lines,
-            "current_line": current_lines.first(),
-            "can_act": can_act,
+            "current_lines": pending_consults,
+            "current_line": pending_consults[0],
+            "can_act": user.is_superuser or any(l.user_id == user.id for l in pending_consults),
         }
 
-    pending_approves = doc.lines.filter(
-        role=DocumentLine.Role.APPROVE,
-        decision=DocumentLine.Decision.PENDING,
-    ).order_by("order", "id")
-
-    if pending_approves.exists():
-        current_line = pending_approves.first()
-        current_lines = doc.lines.filter(id=current_line.id)
-        can_act = user.is_superuser or current_line.user_id == user.id
+    pending_approves = [l for l in pending if l.role == DocumentLine.Role.APPROVE]
+    if pending_approves:
+        current_line = pending_approves[0]
         return {
             "current_stage": "APPROVE",
             "current_stage_label": "결재",
-            "current_lines": current_lines,
+            "current_lines": [current_line],
             "current_line": current_line,
-            "can_act": can_act,
+            "can_act": user.is_superuser or current_line.user_id == user.id,
         }
 
     return {
         "current_stage": None,
         "current_stage_label": None,
-        "current_lines": doc.lines.none(),
+        "current_lines": [],
         "current_line": None,
         "can_act": False,
     }
@@ -134,21 +131,27 @@ def _list_progress_text(doc: Document) -> str:
     if doc.status == Document.Status.DRAFT:
         return "임시 저장"
 
-    pending_consults = doc.lines.filter(
-        role=DocumentLine.Role.CONSULT,
-        decision=DocumentLine.Decision.PENDING,
-    ).count()
+    # 목록 쿼리에서 annotate 한 값이 있으면 그대로 사용 (_attach_progress_text)
+    if hasattr(doc, "pending_consult_count"):
+        pending_consults = doc.pending_consult_count or 0
+        current_order = doc.current_approve_order
+    else:
+        pending_consults = doc.lines.filter(
+            role=DocumentLine.Role.CONSULT,
+            decision=DocumentLine.Decision.PENDING,
+        ).count()
+        current_order = (
+            doc.lines.filter(role=DocumentLine.Role.APPROVE, decision=DocumentLine.Decision.PENDING)
+            .order_by("order", "id")
+            .values_list("order", flat=True)
+            .first()
+        )
 
     if pending_consults > 0:
         return f"협의 진행 중 ({pending_consults}명 대기)"
 
-    current_approve = doc.lines.filter(
-        role=DocumentLine.Role.APPROVE,
-        decision=DocumentLine.Decision.PENDING,
-    ).order_by("order", "id").first()
-
-    if current_approve:
-        return f"{current_approve.order}번째 결재 진행 중"
+    if current_order:
+        return f"{current_order}번째 결재 진행 중"
 
     return "진행 상태 확인 필요"
 
@@ -156,13 +159,65 @@ def _list_progress_text(doc: Document) -> str:
 def _attach_progress_text(docs):
     """
     QuerySet/iterable의 각 문서 객체에 progress_text 속성을 붙여 템플릿에서 사용 가능하게 함
+    (작성자 표시 이름용 profile 은 join 으로 함께 로드)
+    QuerySet 이면 대기 협의 수 / 현재 결재 순번을 서브쿼리로 함께 읽어 문서별 추가 쿼리가 없다.
+    progress_text 는 호출 가능 객체로 붙여, 목록 행 조각 캐시가 없을 때만 템플릿이 계산한다.
     """
+    if hasattr(docs, "select_related") and not docs.query.is_sliced:
+        docs = _with_progress(docs)
     docs = list(docs)
     for doc in docs:
-        doc.progress_text = _list_progress_text(doc)
+        doc.progress_text = partial(_list_progress_text, doc)
     return docs
 
 
+def _with_progress(docs):
+    """
+    목록 진행 문구용 값(대기 협의 수, 현재 결재 순번)을 서브쿼리로 붙인다.
+    """
+    pending = DocumentLine.objects.filter(document_id=OuterRef("pk"), decision=DocumentLine.Decision.PENDING)
+    return docs.select_related("created_by__profile").annotate(
+        pending_consult_count=Subquery(
+            pending.filter(role=DocumentLine.Role.CONSULT)
+            .order_by()
+            .values("document_id")
+            .annotate(n=Count("id"))
+            .values("n")[:1]
+        ),
+        current_approve_order=Subquery(
+            pending.filter(role=DocumentLine.Role.APPROVE).order_by("order", "id").values("order")[:1]
+        ),
+    )
+
+
+def _paginate_docs(request, docs):
+    """
+    문서함 목록 페이지 (문서 수와 무관하게 한 페이지만 읽고 그린다)
+    """
+    page_obj = Paginator(_with_progress(docs), MAILBOX_PAGE_SIZE).get_page(request.GET.get("page"))
+    return page_obj, _attach_progress_text(page_obj.object_list)
+
+
+def _paginate_with_archived(request, docs, status: str):
+    """
+    완료함/반려함: 운영 문서와 보관 문서를 -id 순으로 한 목록처럼 페이지를 나눈다.
+    페이지 키(id, 보관 여부)를 읽은 뒤 해당 페이지 문서만 각 테이블에서 읽는다.
+    """
+    keys = with_archived(docs, archived_docs(request.user, status))
+    page_obj = Paginator(keys, MAILBOX_PAGE_SIZE).get_page(request.GET.get("page"))
+    page_keys = list(page_obj.object_list)
+
+    hot_ids = [doc_id for doc_id, archived in page_keys if not archived]
+    cold_ids = [doc_id for doc_id, archived in page_keys if archived]
+    loaded = {}
+    if hot_ids:
+        loaded.update((d.id, d) for d in _attach_progress_text(Document.objects.filter(id__in=hot_ids)))
+    if cold_ids:
+        cold = ArchivedDocument.objects.filter(id__in=cold_ids).select_related("created_by__profile")
+        loaded.update((d.id, d) for d in _attach_progress_text(list(cold)))
+    return page_obj, [loaded[doc_id] for doc_id, _ in page_keys if doc_id in loaded]
+
+
 def _line_user_ids_by_role(doc: Document, role: str) -> list[int]:
     return list(
         doc.lines.filter(role=role)
@@ -171,23 +226,112 @@ def _line_user_ids_by_role(doc: Document, role: str) -> list[int]:
     )
 
 
+# -----------------------------
+# 조건부 GET (ETag / Last-Modified)
+# -----------------------------
+# 브라우저가 매번 재검증하도록 하고(no-cache), 공유 캐시에는 저장하지 않는다(private).
+_revalidate_always = cache_control(private=True, no_cache=True)
+
+
+def _can_revalidate(request) -> bool:
+    # 화면에 보여줄 messages 가 남아 있으면 304 로 건너뛰지 않고 새로 렌더링
+    storage = getattr(request, "_messages", None)
+    return not (storage is not None and len(storage))
+
+
+def _page_etag(request, *parts) -> str:
+    """
+    사용자/CSRF 쿠키/멤버십·프로필 캐시 버전 + 화면별 변경 표식을 묶은 ETag
+    (페이지 폼에 CSRF 토큰이, 상단에 사용자 이름이 들어가므로 함께 반영)
+    """
+    raw = ":".join(
+        str(p)
+        for p in (
+            request.user.pk,
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+            chair_cache_key("page"),
+            *parts,
+        )
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def _doc_validators(request, doc_id: int):
+    memo = request.__dict__.setdefault("_doc_validators", {})
+    if doc_id not in memo:
+        memo[doc_id] = document_validators(doc_id, user=request.user)
+    return memo[doc_id]
+
+
+def _doc_etag(request, doc_id: int):
+    v = _doc_validators(request, doc_id)
+    if not v or not _can_revalidate(request):
+        return None
+    return _page_etag(request, "doc", doc_id, v["revision"], v["updated_at"], v["last_acted"])
+
+
+def _doc_last_modified(request, doc_id: int):
+    v = _doc_validators(request, doc_id)
+    if not v or not _can_revalidate(request):
+        return None
+    return max(dt for dt in (v["updated_at"], v["last_acted"]) if dt)
+
+
+def _mailbox_validators(request):
+    if not hasattr(request, "_mailbox_validators"):
+        request._mailbox_validators = mailbox_validators(request.user)
+    return request._mailbox_validators
+
+
+def _mailbox_etag(request, *args, **kwargs):
+    if not _can_revalidate(request):
+        return None
+    v = _mailbox_validators(request)
+    return _page_etag(
+        request,
+        "mailbox",
+        request.path,
+        request.GET.get("page", ""),
+        v["count"],
+        v["revisions"],
+        v["last_updated"],
+    )
+
+
+def _mailbox_last_modified(request, *args, **kwargs):
+    if not _can_revalidate(request):
+        return None
+    return _mailbox_validators(request)["last_updated"]
+
+
+_mailbox_condition = condition(etag_func=_mailbox_etag, last_modified_func=_mailbox_last_modified)
+
+
 @login_required
+@read_replica()
+@_revalidate_always
+@_mailbox_condition
 def home(request):
     ctx = {
         "my_count": my_documents(request.user).count(),
         "inbox_count": inbox_pending(request.user).count(),
         "recv_count": received_docs(request.user).count(),
+        "recv_unread_count": unread_received_count(request.user),
     }
     return render(request, "approvals/home.html", ctx)
 
 
 @login_required
+@read_replica()
+@_revalidate_always
+@_mailbox_condition
 def doc_list(request):
-    docs = _attach_progress_text(my_documents(request.user))
+    page_obj, docs = _paginate_docs(request, my_documents(request.user))
     return render(
         request,
         "approvals/doc_list.html",
         {
+            "page_obj": page_obj,
             "title": "내 문서함",
             "docs": docs,
             "csv_export_url": "approvals:export_docs_csv",
@@ -197,12 +341,17 @@ def doc_list(request):
 
 
 @login_required
+@read_replica()
+@_revalidate_always
+@_mailbox_condition
 def inbox(request):
-    docs = _attach_progress_text(inbox_pending(request.user))
+    with metrics.INBOX_QUERY_SECONDS.time():
+        page_obj, docs = _paginate_docs(request, inbox_pending(request.user))
     return render(
         request,
         "approvals/doc_list.html",
         {
+            "page_obj": page_obj,
             "title": "결재함(내 처리 대기)",
             "docs": docs,
             "csv_export_url": "approvals:export_docs_csv",
@@ -212,27 +361,49 @@ def inbox(request):
 
 
 @login_required
+@read_replica()
+@_revalidate_always
+@_mailbox_condition
 def received_list(request):
-    docs = _attach_progress_text(received_docs(request.user))
+    page_obj, docs = _paginate_docs(request, received_docs(request.user))
     return render(
         request,
         "approvals/doc_list.html",
         {
+            "page_obj": page_obj,
             "title": "수신/열람함",
             "docs": docs,
             "csv_export_url": "approvals:export_docs_csv",
             "csv_kind": "received",
+            "unread_count": unread_received_count(request.user),
         },
     )
 
 
 @login_required
+def received_mark_all_read(request):
+    if request.method != "POST":
+        return redirect("approvals:received")
+
+    count = mark_all_received_read(actor=request.user)
+    if count:
+        messages.success(request, f"수신 문서 {count}건을 열람 처리했습니다.")
+    else:
+        messages.info(request, "열람 처리할 수신 문서가 없습니다.")
+    return redirect("approvals:received")
+
+
+@login_required
+@read_replica()
+@_revalidate_always
+@_mailbox_condition
 def completed_list(request):
-    docs = _attach_progress_text(completed_docs(request.user))
+    page_obj, docs = _paginate_with_archived(request, completed_docs(request.user), Document.Status.COMPLETED)
     return render(
         request,
         "approvals/doc_list.html",
         {
+            "page_obj": page_obj,
             "title": "완료함",
             "docs": docs,
             "csv_export_url": "approvals:export_docs_csv",
@@ -242,12 +413,16 @@ def completed_list(request):
 
 
 @login_required
+@read_replica()
+@_revalidate_always
+@_mailbox_condition
 def rejected_list(request):
-    docs = _attach_progress_text(rejected_docs(request.user))
+    page_obj, docs = _paginate_with_archived(request, rejected_docs(request.user), Document.Status.REJECTED)
     return render(
         request,
         "approvals/doc_list.html",
         {
+            "page_obj": page_obj,
             "title": "반려함",
             "docs": docs,
             "csv_export_url": "approvals:export_docs_csv",
@@ -261,73 +436,111 @@ def export_docs_csv(request, kind: str):
     """
     각 문서함 화면에서 CSV로 저장
     kind: my | inbox | received | completed | rejected
+
+    요청 안에서 바로 만들지 않고 내보내기 작업으로 적재한 뒤 진행 화면으로 이동한다.
     """
     kind = (kind or "").strip().lower()
+    if kind not in MAILBOX_EXPORTS:
+        raise Http404
 
-    if kind == "my":
-        qs = my_documents(request.user)
-        title = "my_documents"
-    elif kind == "inbox":
-        qs = inbox_pending(request.user)
-        title = "inbox"
-    elif kind == "received":
-        qs = received_docs(request.user)
-        title = "received"
-    elif kind == "completed":
-        qs = completed_docs(request.user)
-        title = "completed"
-    elif kind == "rejected":
-        qs = rejected_docs(request.user)
-        title = "rejected"
-    else:
+    job = enqueue_export_job(user=request.user, kind=ExportJob.Kind.DOCS_CSV, params={"kind": kind})
+    return redirect("approvals:export_job", job_id=job.id)
+
+
+def _count_export_bytes(response, kind: str):
+    # FileResponse 가 채운 Content-Length 기준 (크기를 알 수 없으면 기록하지 않음)
+    size = response.get("Content-Length")
+    if size:
+        metrics.EXPORT_BYTES.inc(int(size), kind=kind)
+    return response
+
+
+def _get_export_job(request, job_id: int) -> ExportJob:
+    job = get_object_or_404(ExportJob, id=job_id)
+    if not can_access_job(request.user, job):
         raise Http404
+    return job
+
+
+@login_required
+def export_job(request, job_id: int):
+    """
+    내보내기 진행 화면: 상태 API를 폴링하다가 완료되면 다운로드 링크를 보여준다.
+    """
+    job = _get_export_job(request, job_id)
+    return render(request, "approvals/export_job.html", {"job": job})
+
 
-    buf = io.StringIO()
-    w = csv.writer(buf)
-    w.writerow(
-        ["id", "status", "title", "content", "created_by", "current_line_order", "created_at", "updated_at"]
+@login_required
+def export_job_status(request, job_id: int):
+    job = (
+        ExportJob.objects.filter(id=job_id)
+        .only("id", "status", "error", "requested_by_id", "expires_at")
+        .first()
     )
+    if not job or not can_access_job(request.user, job):
+        raise Http404
 
-    for d in qs:
-        created_at = getattr(d, "created_at", None)
-        updated_at = getattr(d, "updated_at", None)
-        w.writerow(
-            [
-                d.id,
-                d.get_status_display() if hasattr(d, "get_status_display") else getattr(d, "status", ""),
-                getattr(d, "title", ""),
-                getattr(d, "content", ""),
-                _display_name(getattr(d, "created_by", None)),
-                getattr(d, "current_line_order", ""),
-                timezone.localtime(created_at).strftime("%Y-%m-%d %H:%M") if created_at else "",
-                timezone.localtime(updated_at).strftime("%Y-%m-%d %H:%M") if updated_at else "",
-            ]
-        )
+    data = {
+        "id": job.id,
+        "status": job.status,
+        "status_label": job.get_status_display(),
+        "error": job.error,
+        "download_url": (
+            reverse("approvals:export_job_download", args=[job.id])
+            if job.status == ExportJob.Status.DONE
+            else ""
+        ),
+    }
+    return JsonResponse(data, headers={"Cache-Control": "no-store"})
 
-    content = buf.getvalue().encode("utf-8-sig")
-    resp = HttpResponse(content, content_type="text/csv; charset=utf-8")
-    ts = timezone.localtime(timezone.now()).strftime("%Y%m%d_%H%M")
-    resp["Content-Disposition"] = f'attachment; filename="{title}_{ts}.csv"'
-    return resp
+
+@login_required
+def export_job_download(request, job_id: int):
+    job = _get_export_job(request, job_id)
+    if job.status != ExportJob.Status.DONE or not job.file:
+        raise Http404
+
+    try:
+        file_handle = job.file.open("rb")
+    except FileNotFoundError:
+        raise Http404
+    response = FileResponse(file_handle, as_attachment=True, filename=smart_str(job_file_basename(job)))
+    return _count_export_bytes(response, "csv" if job.kind == ExportJob.Kind.DOCS_CSV else "zip")
+
+
+def _line_names_key(doc) -> str:
+    """
+    결재 라인 조각 캐시 키: 대상자 표시 이름 (revision 과 무관한 이름 변경도 반영, 스냅샷에서 추가 쿼리 없음)
+    """
+    names = "|".join(f"{line.user_id}:{display_name(line.user)}" for line in doc.lines.all())
+    return hashlib.sha1(names.encode()).hexdigest()[:16]
 
 
 @login_required
+@_revalidate_always
+@condition(etag_func=_doc_etag, last_modified_func=_doc_last_modified)
 def doc_detail(request, doc_id: int):
-    doc = get_object_or_404(Document, id=doc_id)
-    if not can_view_document(request.user, doc):
+    doc = document_detail(doc_id, user=request.user)
+    if doc is None or not can_view_document(request.user, doc):
         raise Http404
 
-    if doc.status == Document.Status.COMPLETED:
+    # 미열람 수신자일 때만 쓰기 (작성자/이미 읽은 사용자는 트랜잭션 없이 통과, 보관 문서는 항상 False)
+    if doc.status == Document.Status.COMPLETED and doc.unread_receipt:
         mark_read(doc=doc, actor=request.user)
 
+    # 보관 문서는 읽기 전용 (회수/재기안 없음)
+    archived = isinstance(doc, ArchivedDocument)
     stage_info = _get_current_stage_info(doc, request.user)
-    is_owner = doc.created_by_id == request.user.id or request.user.is_superuser
+    is_owner = not archived and (doc.created_by_id == request.user.id or request.user.is_superuser)
 
     return render(
         request,
         "approvals/doc_detail.html",
         {
             "doc": doc,
+            "archived": archived,
+            "line_names_key": _line_names_key(doc),
             "current_stage": stage_info["current_stage"],
             "current_stage_label": stage_info["current_stage_label"],
             "current_lines": stage_info["current_lines"],
@@ -338,6 +551,7 @@ def doc_detail(request, doc_id: int):
             in {Document.Status.SUBMITTED, Document.Status.IN_PROGRESS, Document.Status.REJECTED},
             "can_redraft": is_owner and doc.status == Document.Status.DRAFT,
             "can_edit_draft": is_owner and doc.status == Document.Status.DRAFT,
+            "submit_token": new_token(),
         },
     )
 
@@ -347,34 +561,29 @@ def doc_create(request):
     if request.method == "POST":
         form = DocumentForm(request.POST, request.FILES)
         if form.is_valid():
-            token = (form.cleaned_data.get("submit_token") or "").strip()
-            processed = request.session.get("processed_submit_tokens", {})
-
-            if token and token in processed:
-                return redirect("approvals:doc_detail", doc_id=processed[token])
-
             consultants = form.cleaned_data.get("consultants") or []
             receivers = form.cleaned_data.get("receivers") or []
 
-            doc = create_document_with_lines_and_files(
-                creator=request.user,
-                title=form.cleaned_data["title"],
-                content=form.cleaned_data["content"],
-                consultants=consultants,
-                approvers=list(form.cleaned_data["approvers"]),
-                receivers=receivers,
-                files=form.cleaned_data["files"],
-                request=request,
+            doc_id, replayed = run_once(
+                user=request.user,
+                token=(form.cleaned_data.get("submit_token") or "").strip()[:64],
+                action="create",
+                fn=lambda: create_document_with_lines_and_files(
+                    creator=request.user,
+                    title=form.cleaned_data["title"],
+                    content=form.cleaned_data["content"],
+                    consultants=consultants,
+                    approvers=list(form.cleaned_data["approvers"]),
+                    receivers=receivers,
+                    files=form.cleaned_data["files"],
+                    request=request,
+                ),
             )
 
-            if token:
-                processed[token] = doc.id
-                if len(processed) > 30:
-                    processed = dict(list(processed.items())[-30:])
-                request.session["processed_submit_tokens"] = processed
-
-            messages.success(request, "상신되었습니다.")
-            return redirect("approvals:doc_detail", doc_id=doc.id)
+            # 중복 제출이면 처음 만든 문서로 이동 (상신/메일 발송은 다시 하지 않음)
+            if not replayed:
+                messages.success(request, "상신되었습니다.")
+            return redirect("approvals:doc_detail", doc_id=doc_id)
     else:
         form = DocumentForm()
 
@@ -388,6 +597,18 @@ def doc_redraft(request, doc_id: int):
     if not is_owner:
         raise Http404
 
+    action = (
+        request.POST.get("action")
+        or request.POST.get("requested_action")
+        or request.GET.get("requested_action")
+        or "save"
+    ).strip().lower()
+    key_action = "redraft" if action == "redraft" else "edit"
+
+    # 재기안 후 같은 폼이 같은 동작으로 다시 제출된 경우: 상태 오류 대신 처음 결과(상세 화면)로
+    if request.method == "POST" and already_done(user=request.user, token=token_from(request), action=key_action):
+        return redirect("approvals:doc_detail", doc_id=doc.id)
+
     if doc.status != Document.Status.DRAFT:
         messages.error(request, "임시 저장 문서만 수정/재기안할 수 있습니다.")
         return redirect("approvals:doc_detail", doc_id=doc.id)
@@ -408,7 +629,7 @@ def doc_redraft(request, doc_id: int):
             consultants = form.cleaned_data.get("consultants") or []
             receivers = form.cleaned_data.get("receivers") or []
 
-            try:
+            def save_and_maybe_redraft():
                 update_draft_document(
                     doc=doc,
                     actor=request.user,
@@ -419,6 +640,17 @@ def doc_redraft(request, doc_id: int):
                     receivers=receivers,
                     files=form.cleaned_data["files"],
                 )
+                if action == "redraft":
+                    redraft_document(doc=doc, actor=request.user, request=request)
+                return doc
+
+            try:
+                _, replayed = run_once(
+                    user=request.user,
+                    token=(form.cleaned_data.get("submit_token") or "").strip()[:64],
+                    action=key_action,
+                    fn=save_and_maybe_redraft,
+                )
             except PermissionError:
                 messages.error(request, "문서 수정 권한이 없습니다.")
                 return redirect("approvals:doc_detail", doc_id=doc.id)
@@ -426,22 +658,11 @@ def doc_redraft(request, doc_id: int):
                 messages.error(request, "임시 저장 문서만 수정할 수 있습니다.")
                 return redirect("approvals:doc_detail", doc_id=doc.id)
 
-            action = (
-                request.POST.get("action")
-                or request.POST.get("requested_action")
-                or request.GET.get("requested_action")
-                or "save"
-            ).strip().lower()
-            if action == "redraft":
-                try:
-                    redraft_document(doc=doc, actor=request.user, request=request)
-                    messages.success(request, "문서를 수정 후 재기안(재상신)했습니다.")
-                except PermissionError:
-                    messages.error(request, "문서 재기안 권한이 없습니다.")
-                except ValueError:
-                    messages.error(request, "임시 저장 문서만 재기안할 수 있습니다.")
-            else:
-                messages.success(request, "임시 저장 문서를 수정했습니다.")
+            if not replayed:
+                messages.success(
+                    request,
+                    "문서를 수정 후 재기안(재상신)했습니다." if action == "redraft" else "임시 저장 문서를 수정했습니다.",
+                )
 
             return redirect("approvals:doc_detail", doc_id=doc.id)
     else:
@@ -479,6 +700,10 @@ def delete_redraft_attachment(request, doc_id: int, attachment_id: int):
     return redirect("approvals:doc_redraft", doc_id=doc.id)
 
 
+def _replayed(request) -> None:
+    messages.info(request, "이미 처리된 요청입니다.")
+
+
 @login_required
 def act_approve(request, doc_id: int):
     doc = get_object_or_404(Document, id=doc_id)
@@ -488,13 +713,21 @@ def act_approve(request, doc_id: int):
     comment = request.POST.get("comment", "")
 
     try:
-        approve_or_consult(
-            doc=doc,
-            actor=request.user,
-            comment=comment,
-            request=request,
+        _, replayed = run_once(
+            user=request.user,
+            token=token_from(request),
+            action="approve",
+            fn=lambda: approve_or_consult(
+                doc=doc,
+                actor=request.user,
+                comment=comment,
+                request=request,
+            ),
         )
-        messages.success(request, "승인(또는 협의 완료) 처리했습니다.")
+        if replayed:
+            _replayed(request)
+        else:
+            messages.success(request, "승인(또는 협의 완료) 처리했습니다.")
     except PermissionError:
         messages.error(request, "권한이 없습니다.")
 
@@ -513,13 +746,21 @@ def act_reject(request, doc_id: int):
         return redirect("approvals:doc_detail", doc_id=doc.id)
 
     try:
-        reject(
-            doc=doc,
-            actor=request.user,
-            comment=comment,
-            request=request,
+        _, replayed = run_once(
+            user=request.user,
+            token=token_from(request),
+            action="reject",
+            fn=lambda: reject(
+                doc=doc,
+                actor=request.user,
+                comment=comment,
+                request=request,
+            ),
         )
-        messages.success(request, "반려 처리했습니다.")
+        if replayed:
+            _replayed(request)
+        else:
+            messages.success(request, "반려 처리했습니다.")
     except PermissionError:
         messages.error(request, "권한이 없습니다.")
 
@@ -533,8 +774,16 @@ def act_withdraw(request, doc_id: int):
         return redirect("approvals:doc_detail", doc_id=doc.id)
 
     try:
-        withdraw_document(doc=doc, actor=request.user)
-        messages.success(request, "문서를 회수하여 임시 저장 상태로 전환했습니다.")
+        _, replayed = run_once(
+            user=request.user,
+            token=token_from(request),
+            action="withdraw",
+            fn=lambda: withdraw_document(doc=doc, actor=request.user),
+        )
+        if replayed:
+            _replayed(request)
+        else:
+            messages.success(request, "문서를 회수하여 임시 저장 상태로 전환했습니다.")
     except PermissionError:
         messages.error(request, "문서 회수 권한이 없습니다.")
     except ValueError:
@@ -550,8 +799,16 @@ def act_redraft(request, doc_id: int):
         return redirect("approvals:doc_detail", doc_id=doc.id)
 
     try:
-        redraft_document(doc=doc, actor=request.user, request=request)
-        messages.success(request, "문서를 재기안(재상신)했습니다.")
+        _, replayed = run_once(
+            user=request.user,
+            token=token_from(request),
+            action="redraft",
+            fn=lambda: redraft_document(doc=doc, actor=request.user, request=request),
+        )
+        if replayed:
+            _replayed(request)
+        else:
+            messages.success(request, "문서를 재기안(재상신)했습니다.")
     except PermissionError:
         messages.error(request, "문서 재기안 권한이 없습니다.")
     except ValueError:
@@ -560,6 +817,100 @@ def act_redraft(request, doc_id: int):
     return redirect("approvals:doc_detail", doc_id=doc.id)
 
 
+@login_required
+def user_autocomplete(request):
+    """
+    결재선(협의/결재/수신) 선택용 위원장 자동완성
+    GET q=<이름/아이디 앞부분>&page=<1..>
+    응답: {"results": [{"id", "label"}], "page", "has_more"}
+    """
+    q = (request.GET.get("q") or "").strip()[:50]
+    try:
+        page = max(int(request.GET.get("page") or 1), 1)
+    except ValueError:
+        page = 1
+
+    # 멤버십 캐시 버전이 키에 들어가므로 위원장/이름 변경 시 바로 새 결과가 나온다.
+    # 검색어는 사용자 입력이라 (공백/제어 문자, memcached 키 제한) 해시해서 키에 넣는다.
+    key = chair_cache_key(f"autocomplete:{page}:{hashlib.sha1(q.encode()).hexdigest()}")
+    data = cache.get(key)
+    if data is None:
+        start = (page - 1) * AUTOCOMPLETE_PAGE_SIZE
+        rows = list(
+            chair_users_by_prefix(q).values_list("id", "profile__display_name", "username")[
+                start : start + AUTOCOMPLETE_PAGE_SIZE + 1
+            ]
+        )
+        data = {
+            "results": [
+                {"id": uid, "label": (name or "").strip() or username}
+                for uid, name, username in rows[:AUTOCOMPLETE_PAGE_SIZE]
+            ],
+            "page": page,
+            "has_more": len(rows) > AUTOCOMPLETE_PAGE_SIZE,
+        }
+        cache.set(key, data, AUTOCOMPLETE_CACHE_TTL)
+
+    return JsonResponse(data, headers={"Cache-Control": f"private, max-age={AUTOCOMPLETE_CACHE_TTL}"})
+
+
+@staff_required
+def profiling_index(request):
+    """
+    요청 프로파일러: 켜기/끄기, 링크용 토큰, 저장된 보고서 목록
+    """
+    token = profiling.make_token(request.user)
+    return render(
+        request,
+        "approvals/profiling.html",
+        {
+            "enabled": bool(request.COOKIES.get(profiling.PROFILE_COOKIE)),
+            "param": profiling.PROFILE_PARAM,
+            "token": token,
+            "reports": profiling.list_reports(),
+        },
+    )
+
+
+@staff_required
+@require_POST
+def profiling_toggle(request):
+    next_url = request.POST.get("next") or ""
+    if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        next_url = reverse("approvals:profiling")
+    response = redirect(next_url)
+
+    if request.POST.get("action") == "on":
+        response.set_cookie(
+            profiling.PROFILE_COOKIE,
+            profiling.make_token(request.user),
+            max_age=getattr(settings, "PROFILER_TOKEN_MAX_AGE", 3600),
+            httponly=True,
+            samesite="Lax",
+        )
+        messages.success(request, "이 브라우저의 요청을 프로파일합니다.")
+    else:
+        response.delete_cookie(profiling.PROFILE_COOKIE)
+        messages.info(request, "프로파일을 껐습니다.")
+    return response
+
+
+@staff_required
+def profiling_download(request, name: str):
+    path = profiling.report_path(name)
+    if not path:
+        raise Http404
+    return FileResponse(path.open("rb"), as_attachment=True, filename=path.name)
+
+
+@staff_required
+def metrics_view(request):
+    """
+    Prometheus 수집용 지표 (텍스트 형식, 스태프 전용)
+    """
+    return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
 @login_required
 def admin_chair(request):
     if not is_chair(request.user):
@@ -568,43 +919,62 @@ def admin_chair(request):
     chair_group, _ = Group.objects.get_or_create(name=CHAIR_GROUP)
 
     if request.method == "POST":
-        user_id = request.POST.get("user_id")
+        # 단건 버튼(user_id 1개)과 체크박스 일괄 처리(user_id 여러 개)를 같은 경로로 처리
+        user_ids = [i for i in request.POST.getlist("user_id") if i.isdigit()]
         action = request.POST.get("action")
-        if not user_id or action not in {"add", "remove"}:
+        if not user_ids or action not in {"add", "remove"}:
             messages.error(request, "잘못된 요청입니다.")
             return redirect("approvals:admin_chair")
 
-        target = get_object_or_404(User, id=user_id)
+        if len(user_ids) == 1:
+            target = get_object_or_404(User, id=user_ids[0])
+            label = f"{display_name(target)} 님"
+        else:
+            label = f"{len(user_ids)}명"
 
         if action == "add":
-            target.groups.add(chair_group)
-            messages.success(request, f"{_display_name(target)} 님을 위원장으로 임명했습니다.")
+            appoint_chairs(user_ids)
+            messages.success(request, f"{label}을 위원장으로 임명했습니다.")
         else:
-            target.groups.remove(chair_group)
-            messages.success(request, f"{_display_name(target)} 님의 위원장 권한을 해제했습니다.")
+            demote_chairs(user_ids)
+            messages.success(request, f"{label}의 위원장 권한을 해제했습니다.")
 
-        sync_profile_role_from_groups(target)
+        return redirect(request.get_full_path())
 
-        return redirect("approvals:admin_chair")
+    q = (request.GET.get("q") or "").strip()
+    users = User.objects.select_related("profile").order_by("username")
+    if q:
+        users = users.filter(Q(profile__display_name__startswith=q) | Q(username__istartswith=q))
+    page_obj = Paginator(users, ADMIN_CHAIR_PAGE_SIZE).get_page(request.GET.get("page"))
 
-    users = User.objects.all().order_by("username")
-    chairs = chair_group.user_set.all().order_by("username")
+    chairs = chair_group.user_set.select_related("profile").order_by("username")
     return render(
         request,
         "approvals/admin_chair.html",
-        {"users": users, "chairs": chairs, "chair_group": chair_group},
+        {
+            "users": page_obj.object_list,
+            "page_obj": page_obj,
+            "q": q,
+            "chairs": chairs,
+            "chair_group": chair_group,
+        },
     )
 
 
 @login_required
 def attachment_download(request, attachment_id: int):
-    att = get_object_or_404(Attachment, id=attachment_id)
-    if not can_view_document(request.user, att.document):
+    # 운영 테이블에 없으면 보관 테이블 (id 는 보관 시 그대로 옮겨진다)
+    att = (
+        Attachment.objects.select_related("document").filter(id=attachment_id).first()
+        or ArchivedAttachment.objects.select_related("document").filter(id=attachment_id).first()
+    )
+    if att is None or not can_view_document(request.user, att.document):
         raise Http404
 
     file_handle = att.file.open("rb")
     filename = os.path.basename(att.file.name)
-    return FileResponse(file_handle, as_attachment=True, filename=smart_str(filename))
+    response = FileResponse(file_handle, as_attachment=True, filename=smart_str(filename))
+    return _count_export_bytes(response, "attachment")
 
 
 @login_required
@@ -612,11 +982,12 @@ def attachments_zip(request, doc_id: int):
     """
     Attachments를 zip으로 전체 저장
     """
-    doc = get_object_or_404(Document, id=doc_id)
-    if not can_view_document(request.user, doc):
-        raise Http404
+    with read_replica():
+        doc = Document.objects.filter(id=doc_id).first() or ArchivedDocument.objects.filter(id=doc_id).first()
+        if doc is None or not can_view_document(request.user, doc):
+            raise Http404
+        atts = list(doc.attachments.all())
 
-    atts = list(doc.attachments.all())
     if not atts:
         messages.error(request, "첨부파일이 없습니다.")
         return redirect("approvals:doc_detail", doc_id=doc.id)
@@ -646,7 +1017,8 @@ def attachments_zip(request, doc_id: int):
     mem.seek(0)
     ts = timezone.localtime(timezone.now()).strftime("%Y%m%d_%H%M")
     filename = f"attachments_doc{doc.id}_{ts}.zip"
-    return FileResponse(mem, as_attachment=True, filename=smart_str(filename))
+    response = FileResponse(mem, as_attachment=True, filename=smart_str(filename))
+    return _count_export_bytes(response, "zip")
 
 
 @login_required
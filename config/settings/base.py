@@ -27,11 +27,18 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # 뷰별 쿼리 수/지연 측정 (가장 바깥에서 전체 시간을 잰다)
+    "approvals.perf.PerfMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # 쓰기 직후 읽기는 복제본 대신 default 로 (READ_REPLICA 설정 시)
+    "approvals.replica.ReplicaStickinessMiddleware",
+    # 스태프가 서명 토큰으로 요청한 경우에만 cProfile/SQL 수집
+    "approvals.profiling.ProfilerMiddleware",
+    "accounts.request_cache.RequestCacheMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -56,6 +63,25 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "config.wsgi.application"
 
+# SQLite 운영 설정 (gunicorn 워커 여러 개에서 "database is locked" 방지)
+# - WAL: 읽기가 쓰기를 기다리지 않는다 / synchronous=NORMAL: WAL 에서 안전한 수준으로 fsync 축소
+# - mmap/cache_size: 읽기 I/O 를 메모리 매핑과 페이지 캐시로
+# - timeout: busy_timeout (잠금을 바로 실패시키지 않고 기다림, 초)
+# - transaction_mode=IMMEDIATE: atomic 블록(services 의 쓰기 트랜잭션)이 시작할 때 쓰기 잠금을 잡는다.
+#   DEFERRED 에서는 읽다가 쓰기로 올라가는 순간 대기 없이 SQLITE_BUSY 가 난다.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;"
+    "PRAGMA synchronous=NORMAL;"
+    f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))};"
+    f"PRAGMA cache_size=-{int(os.getenv('SQLITE_CACHE_KB', '20000'))};"
+    "PRAGMA temp_store=MEMORY;"
+)
+SQLITE_OPTIONS = {
+    "init_command": SQLITE_PRAGMAS,
+    "transaction_mode": "IMMEDIATE",
+    "timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "20")),
+}
+
 db_engine = os.getenv("DB_ENGINE", "sqlite3")
 
 if db_engine == "postgresql":
@@ -74,9 +100,46 @@ else:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            "OPTIONS": SQLITE_OPTIONS,
         }
     }
 
+# 읽기 전용 복제본 (선택). 설정하면 문서함 목록 / CSV·ZIP 내보내기의 읽기가 replica 로 간다.
+# - SQLite(로컬 확인용): DB_REPLICA_NAME=replica.sqlite3, sync_sqlite_replica 명령으로 default 를 복사
+# - PostgreSQL: DB_REPLICA_HOST (나머지 DB_REPLICA_* 는 없으면 default 값)
+if db_engine == "postgresql" and os.getenv("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.getenv("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "USER": os.getenv("DB_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": os.getenv("DB_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "HOST": os.getenv("DB_REPLICA_HOST"),
+        "PORT": os.getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+    }
+elif db_engine != "postgresql" and os.getenv("DB_REPLICA_NAME"):
+    DATABASES["replica"] = {**DATABASES["default"], "NAME": BASE_DIR / os.getenv("DB_REPLICA_NAME")}
+
+if "replica" in DATABASES:
+    # 테스트에서는 별도 DB 를 만들지 않고 default 를 그대로 본다.
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+
+READ_REPLICA = "replica" if "replica" in DATABASES else ""
+DATABASE_ROUTERS = ["approvals.replica.ReplicaRouter"]
+# 쓰기 후 이 시간(초) 동안 같은 브라우저의 읽기는 default 로 (복제 지연 대비)
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+
+# 프로세스 캐시(기본 LocMem). 워커가 여러 개면 CACHE_BACKEND/CACHE_LOCATION 으로 공유 캐시 지정
+# 예) django.core.cache.backends.filebased.FileBasedCache + /var/tmp/eapproval_cache
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "eapproval"),
+    }
+}
+# 위원장 멤버십 캐시 유지 시간(초, approvals.permissions). 0 이면 요청 단위 메모만 쓴다.
+# is_chair() 권한 판단에 쓰이므로 워커 간 공유 캐시가 아니면 prod.py 에서 끈다.
+CHAIR_CACHE_TTL = int(os.getenv("CHAIR_CACHE_TTL", "300"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -166,6 +229,7 @@ LOGGING = {
             'filename': BASE_DIR / 'logs/mysite.log',
             'maxBytes': 1024*1024*5,  # 5 MB
             'backupCount': 5,
+            'delay': True,  # 첫 기록 때 파일을 연다.
             'formatter': 'standard',
         },
     },
@@ -179,5 +243,66 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        # 뷰별 쿼리 수/DB 시간/전체 시간 (approvals.perf.PerfMiddleware)
+        'approvals.perf': {
+            'handlers': ['file', 'console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     }
-}
\ No newline at end of file
+}
+# 내보내기(CSV/ZIP) 백그라운드 작업 결과물 보관 시간
+EXPORT_JOB_TTL_HOURS = int(os.getenv("EXPORT_JOB_TTL_HOURS", "24"))
+# RUNNING 상태로 이 시간(분) 이상 멈춘 작업은 실패 처리
+EXPORT_JOB_STALE_MINUTES = int(os.getenv("EXPORT_JOB_STALE_MINUTES", "30"))
+# 중복 제출 방지 키 보관 시간 (cleanup_idempotency_keys 가 정리)
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+# 뷰별 쿼리 수/지연 측정 미들웨어 (Server-Timing 헤더(DEBUG/스태프만) + approvals.perf 로그)
+PERF_INSTRUMENTATION = os.getenv("PERF_INSTRUMENTATION", "1") == "1"
+# 테스트 중에는 approvals.perf 로그를 logs/mysite.log 에 남기지 않는다.
+TEST_RUNNER = "approvals.testing.PerfQuietTestRunner"
+# URL name 별 허용 쿼리 수. 넘으면 approvals.perf 에 WARNING 을 남긴다.
+# 목록/상세는 문서 수와 무관하게 고정 쿼리로 끝나야 한다 (approvals.tests.QueryBudgetTests).
+VIEW_QUERY_BUDGETS = {
+    "approvals:home": 12,
+    "approvals:doc_list": 14,
+    "approvals:inbox": 14,
+    "approvals:received": 10,
+    "approvals:received_mark_all_read": 10,
+    "approvals:completed": 10,
+    "approvals:rejected": 10,
+    "approvals:doc_detail": 12,
+    "approvals:doc_detail_legacy": 12,
+    "approvals:doc_create": 8,
+    "approvals:doc_redraft": 14,
+    "approvals:export_docs_csv": 8,
+    "approvals:documents_export_csv": 8,
+    "approvals:export_job": 6,
+    "approvals:export_job_status": 6,
+    "approvals:user_autocomplete": 6,
+    "approvals:admin_chair": 10,
+    "approvals:act_approve": 20,
+    "approvals:act_reject": 20,
+    "approvals:act_withdraw": 20,
+    "approvals:act_redraft": 20,
+}
+# 지표 파일 디렉터리 (gunicorn 워커 간 합산용, 서버 시작 시 비울 것). 비우면 프로세스 단위로만 집계
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+# 백그라운드 스레드가 프로세스 지표를 METRICS_DIR 로 내려쓰는 주기(초)
+METRICS_FLUSH_SECONDS = int(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+# 스태프 요청 프로파일러 (approvals.profiling): 기본 꺼짐. 개발 설정(local.py)에서 켜고, 운영은 PROFILER_ENABLED=1 로 명시할 때만
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "0") == "1"
+PROFILER_DIR = os.getenv("PROFILER_DIR", str(BASE_DIR / "logs" / "profiles"))
+# 토큰/쿠키 유효 시간(초), 대상 요청 중 실제로 프로파일할 비율, 프로세스당 분당 최대 건수
+PROFILER_TOKEN_MAX_AGE = int(os.getenv("PROFILER_TOKEN_MAX_AGE", "3600"))
+PROFILER_SAMPLE_RATE = float(os.getenv("PROFILER_SAMPLE_RATE", "1.0"))
+PROFILER_MAX_PER_MINUTE = int(os.getenv("PROFILER_MAX_PER_MINUTE", "10"))
+# 보고서당 SQL 기록 수 / 보관할 보고서 수
+PROFILER_MAX_SQL = int(os.getenv("PROFILER_MAX_SQL", "500"))
+PROFILER_MAX_REPORTS = int(os.getenv("PROFILER_MAX_REPORTS", "50"))
+# 마지막 변경 후 이 개월 수가 지난 완료/반려 문서를 archive_documents 명령이 보관 테이블로 옮긴다.
+ARCHIVE_AFTER_MONTHS = int(os.getenv("ARCHIVE_AFTER_MONTHS", "12"))
+# 관리자 목록(문서/결재 라인/첨부) 건수: 조건별 COUNT(*) 캐시 시간(초),
+# 필터 없는 목록에서 PostgreSQL 행 수 추정치를 쓰기 시작하는 행 수 (approvals.admin.ApproximateCountPaginator)
+ADMIN_COUNT_CACHE_SECONDS = int(os.getenv("ADMIN_COUNT_CACHE_SECONDS", "60"))
+ADMIN_ESTIMATE_MIN_ROWS = int(os.getenv("ADMIN_ESTIMATE_MIN_ROWS", "10000"))
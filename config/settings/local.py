@@ -1,5 +1,10 @@
 # config/local.py
+import os
+
 from .base import *
 
 DEBUG = True
-ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
\ No newline at end of file
+ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
+
+# 개발 환경에서는 스태프 요청 프로파일러를 기본으로 켠다 (PROFILER_ENABLED=0 으로 끔)
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", "1") == "1"
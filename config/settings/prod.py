@@ -9,3 +9,51 @@ ALLOWED_HOSTS = [
 ]
 
 DEBUG = False
+
+# 위원장 멤버십 캐시는 권한 판단(is_chair -> admin_chair, 결재선 검증)에 쓰인다.
+# 프로세스별 캐시(LocMem 등)에서는 한 워커의 무효화가 다른 워커에 닿지 않아 강등된 위원장이
+# CHAIR_CACHE_TTL 동안 권한을 유지하므로, 공유 캐시(CACHE_BACKEND)를 지정했을 때만 켠다.
+if CACHES["default"]["BACKEND"].rsplit(".", 1)[-1] in ("LocMemCache", "DummyCache"):
+    CHAIR_CACHE_TTL = 0
+
+# PostgreSQL 연결 (psycopg 3)
+# - DB_POOL=1(기본): 워커 프로세스마다 psycopg_pool 연결 풀. 요청마다 TCP/인증 핸드셰이크를 하지 않는다.
+#   풀 크기는 "gunicorn 워커 수 x DB_POOL_MAX_SIZE <= PostgreSQL max_connections" 가 되도록 잡는다.
+#   CONN_HEALTH_CHECKS 가 켜져 있으면 Django 가 풀에 check 를 달아 빌려줄 때마다 연결 상태를 확인한다
+#   (DB 재시작/네트워크 단절 후 자동 복구).
+# - DB_POOL=0: 풀 없이 DB_CONN_MAX_AGE 초 동안 연결 유지 (0 이면 요청마다 새 연결), CONN_HEALTH_CHECKS 로 재사용 전 확인
+# - server_side_binding + prepare_threshold (기본 꺼짐): DB_PREPARE_THRESHOLD=5 처럼 지정하면 같은 쿼리를
+#   그 횟수만큼 실행한 뒤 서버에 prepare 해서 계획을 재사용한다 (selectors 의 문서함 쿼리처럼 모양이 같고 값만 다른 쿼리).
+#   Django 는 prepared statement 를 기본으로 끈다. 클라이언트 바인딩(기본)은 값이 SQL 문자열에 들어가
+#   매번 다른 쿼리가 되므로 prepare 효과가 없어 서버 바인딩을 함께 켠다.
+#   서버 바인딩은 SELECT/GROUP BY 안의 파라미터(selectors.with_archived 의 Value, services.document_status_drift 의
+#   Case/Value + Min(filter=...) 등)와 맞지 않는 경우가 있어, PostgreSQL 에서 테스트를 통과시킨 뒤에만 켠다.
+#   PgBouncer(transaction 모드) 뒤에서는 켜지 않는다.
+if db_engine == "postgresql":
+    _prepare_threshold = os.getenv("DB_PREPARE_THRESHOLD", "")
+    _pg_options = {
+        "server_side_binding": bool(_prepare_threshold),
+        "prepare_threshold": int(_prepare_threshold) if _prepare_threshold else None,
+    }
+    if os.getenv("DB_POOL", "1") == "1":
+        _pg_options["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "8")),
+            # 풀이 가득 찼을 때 연결을 기다리는 최대 시간(초)
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+        }
+        _conn_max_age = 0  # 풀과 CONN_MAX_AGE 는 같이 쓸 수 없다.
+    else:
+        _conn_max_age = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+
+    for _alias in ("default", "replica"):
+        if _alias in DATABASES:
+            DATABASES[_alias].update(
+                {
+                    "CONN_MAX_AGE": _conn_max_age,
+                    "CONN_HEALTH_CHECKS": True,
+                    "OPTIONS": {**DATABASES[_alias].get("OPTIONS", {}), **_pg_options},
+                }
+            )
@@ -79,19 +79,6 @@ document.addEventListener("DOMContentLoaded", function () {
     const ul = normalizeToUlLi(box);
     if (!ul) return;
 
-    // li 맨 앞에 handle 삽입
-    qsa(ul, "li").forEach((li) => {
-      if (li.querySelector(".drag-handle")) return;
-
-      const handle = document.createElement("div");
-      handle.className = "drag-handle";
-      handle.textContent = "↕️";
-      handle.setAttribute("aria-label", "드래그로 순서 변경");
-      handle.setAttribute("role", "button");
-      handle.setAttribute("tabindex", "0");
-
-      li.insertBefore(handle, li.firstChild);
-    });
 
     syncCheckedClass(box);
     if (!hidden.value) {
@@ -264,30 +251,47 @@ document.addEventListener("DOMContentLoaded", function () {
       }
     }
 
-    function bindDragStarters() {
-      // 핸들에서만 드래그 시작
-      qsa(ul, ".drag-handle").forEach((handle) => {
-        handle.addEventListener("pointerdown", function (e) {
-          startDragFromEvent(e, e.currentTarget.closest("li"), handle);
-        });
+    // li 맨 앞에 handle 삽입 (핸들에서만 드래그 시작)
+    function addHandle(li) {
+      if (li.classList.contains("placeholder") || li.querySelector(".drag-handle")) return;
 
-        handle.addEventListener("mousedown", function (e) {
+      const handle = document.createElement("div");
+      handle.className = "drag-handle";
+      handle.textContent = "↕️";
+      handle.setAttribute("aria-label", "드래그로 순서 변경");
+      handle.setAttribute("role", "button");
+      handle.setAttribute("tabindex", "0");
+
+      handle.addEventListener("pointerdown", function (e) {
+        startDragFromEvent(e, e.currentTarget.closest("li"), handle);
+      });
+
+      handle.addEventListener("mousedown", function (e) {
+        if (window.PointerEvent) return;
+        startDragFromEvent(e, e.currentTarget.closest("li"), handle);
+      });
+
+      handle.addEventListener(
+        "touchstart",
+        function (e) {
           if (window.PointerEvent) return;
           startDragFromEvent(e, e.currentTarget.closest("li"), handle);
-        });
+        },
+        { passive: false }
+      );
 
-        handle.addEventListener(
-          "touchstart",
-          function (e) {
-            if (window.PointerEvent) return;
-            startDragFromEvent(e, e.currentTarget.closest("li"), handle);
-          },
-          { passive: false }
-        );
-      });
+      li.insertBefore(handle, li.firstChild);
     }
 
-    bindDragStarters();
+    qsa(ul, "li").forEach(addHandle);
+    syncCheckedClass(box);
+
+    // 검색으로 추가된 결재자에도 핸들을 붙인다.
+    box.addEventListener("picker:added", function (e) {
+      if (e.detail && e.detail.li) addHandle(e.detail.li);
+      syncCheckedClass(box);
+      hidden.value = getCheckedIdsInDomOrder(box).join(",");
+    });
 
     const form = box.closest("form");
     if (form) {
@@ -301,6 +305,130 @@ document.addEventListener("DOMContentLoaded", function () {
     }
   }
 
+  // 사용자 검색: 선택한 사용자를 대상 pickbox 에 체크된 상태로 추가
+  function setupPicker(picker) {
+    const url = picker.getAttribute("data-autocomplete-url");
+    const box = document.getElementById(picker.getAttribute("data-target"));
+    const field = picker.getAttribute("data-field");
+    const input = picker.querySelector(".picker-search");
+    const results = picker.querySelector(".picker-results");
+    if (!url || !box || !field || !input || !results) return;
+
+    let timer = null;
+    let seq = 0;
+
+    function findCheckbox(id) {
+      return qsa(box, 'input[type="checkbox"]').find((cb) => String(cb.value) === String(id));
+    }
+
+    function ensureUl() {
+      let ul = box.querySelector("ul");
+      if (!ul) {
+        ul = document.createElement("ul");
+        box.appendChild(ul);
+      }
+      return ul;
+    }
+
+    function addUser(id, label) {
+      const existing = findCheckbox(id);
+      if (existing) {
+        existing.checked = true;
+        existing.dispatchEvent(new Event("change", { bubbles: true }));
+        return;
+      }
+
+      const li = document.createElement("li");
+      const lab = document.createElement("label");
+      const cb = document.createElement("input");
+      cb.type = "checkbox";
+      cb.name = field;
+      cb.value = String(id);
+      cb.id = "id_" + field + "_u" + id;
+      cb.checked = true;
+      lab.setAttribute("for", cb.id);
+      lab.appendChild(cb);
+      lab.appendChild(document.createTextNode(" " + label));
+      li.appendChild(lab);
+      ensureUl().appendChild(li);
+
+      box.dispatchEvent(new CustomEvent("picker:added", { detail: { li: li } }));
+      cb.dispatchEvent(new Event("change", { bubbles: true }));
+    }
+
+    function render(data, append) {
+      if (!append) results.innerHTML = "";
+      const more = results.querySelector(".picker-more");
+      if (more) more.remove();
+
+      (data.results || []).forEach((u) => {
+        const li = document.createElement("li");
+        li.textContent = u.label;
+        const cb = findCheckbox(u.id);
+        if (cb && cb.checked) li.classList.add("is-selected");
+        li.addEventListener("click", function () {
+          addUser(u.id, u.label);
+          li.classList.add("is-selected");
+        });
+        results.appendChild(li);
+      });
+
+      if (!append && !(data.results || []).length) {
+        const li = document.createElement("li");
+        li.className = "picker-empty";
+        li.textContent = "검색 결과가 없습니다.";
+        results.appendChild(li);
+      }
+
+      if (data.has_more) {
+        const li = document.createElement("li");
+        li.className = "picker-more";
+        li.textContent = "더 보기";
+        li.addEventListener("click", function () {
+          load(input.value, data.page + 1, true);
+        });
+        results.appendChild(li);
+      }
+
+      results.hidden = false;
+    }
+
+    function load(q, page, append) {
+      const mySeq = ++seq;
+      const params = new URLSearchParams({ q: q.trim(), page: String(page) });
+      fetch(url + "?" + params.toString(), { credentials: "same-origin" })
+        .then((res) => (res.ok ? res.json() : Promise.reject(res.status)))
+        .then((data) => {
+          // 늦게 도착한 이전 검색 결과는 버린다.
+          if (mySeq === seq) render(data, append);
+        })
+        .catch(() => {});
+    }
+
+    input.addEventListener("input", function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        load(input.value, 1, false);
+      }, 250);
+    });
+
+    input.addEventListener("focus", function () {
+      if (!results.children.length) load(input.value, 1, false);
+      else results.hidden = false;
+    });
+
+    input.addEventListener("keydown", function (e) {
+      if (e.key === "Enter") e.preventDefault();
+      if (e.key === "Escape") results.hidden = true;
+    });
+
+    document.addEventListener("click", function (e) {
+      if (!picker.contains(e.target)) results.hidden = true;
+    });
+  }
+
+  qsa(document, ".picker").forEach(setupPicker);
+
   setupSimpleBox("consultantsBox");
   setupSimpleBox("receiversBox");
   setupApproversPointerSort("approversBox", "id_approvers_order");
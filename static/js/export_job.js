@@ -0,0 +1,58 @@
+document.addEventListener("DOMContentLoaded", function () {
+  const box = document.getElementById("exportJob");
+  if (!box) return;
+
+  const statusUrl = box.getAttribute("data-status-url");
+  const statusEl = document.getElementById("exportJobStatus");
+  const waitingEl = document.getElementById("exportJobWaiting");
+  const errorEl = document.getElementById("exportJobError");
+  const downloadEl = document.getElementById("exportJobDownload");
+
+  let delay = 1000;
+  const maxDelay = 10000;
+
+  function isFinished(status) {
+    return status === "DONE" || status === "FAILED";
+  }
+
+  function render(data) {
+    if (statusEl) statusEl.textContent = data.status_label || data.status;
+
+    if (data.status === "DONE") {
+      if (waitingEl) waitingEl.style.display = "none";
+      if (downloadEl) {
+        if (data.download_url) downloadEl.href = data.download_url;
+        downloadEl.style.display = "";
+      }
+    } else if (data.status === "FAILED") {
+      if (waitingEl) waitingEl.style.display = "none";
+      if (errorEl) {
+        if (data.error) errorEl.textContent = data.error;
+        errorEl.style.display = "";
+      }
+    }
+  }
+
+  function poll() {
+    fetch(statusUrl, { credentials: "same-origin", headers: { Accept: "application/json" } })
+      .then(function (res) {
+        if (!res.ok) throw new Error("status " + res.status);
+        return res.json();
+      })
+      .then(function (data) {
+        render(data);
+        if (!isFinished(data.status)) {
+          delay = Math.min(delay * 1.5, maxDelay);
+          setTimeout(poll, delay);
+        }
+      })
+      .catch(function () {
+        delay = Math.min(delay * 2, maxDelay);
+        setTimeout(poll, delay);
+      });
+  }
+
+  if (!isFinished(box.getAttribute("data-status"))) {
+    setTimeout(poll, delay);
+  }
+});